@@ -1,29 +1,76 @@
 import streamlit as st
-import json
 import os
-import google.generativeai as genai
 from dotenv import load_dotenv
-import pandas as pd
 import time
 import re
-import requests
-import base64
-import xml.etree.ElementTree as ET
-from io import StringIO
-import zipfile
-from github import Github
-from github import Auth
-
-# Load environment variables
+
+# Load environment variables before the translate_tool modules read their configuration
 load_dotenv()
 
+from translate_tool.project_store import ProjectStore, DEFAULT_DB_PATH, PROJECT_SCOPE, content_hash
+from translate_tool.shared_cache import SharedCaches
+from translate_tool.review import (
+    DEFAULT_PAGE_SIZE, PAGE_SIZES, SORT_OPTIONS,
+    sort_review_keys, paginate, build_review_rows
+)
+from translate_tool.search_index import SearchIndex
+from translate_tool.export import (
+    DEFAULT_COMPRESSION_LEVEL, EXPORT_FORMATS, ExportJob, export_path_for, render_export_files, write_export_zip
+)
+from translate_tool import formats
+from translate_tool import strings_xml
+from translate_tool.strings_xml import dict_to_strings_xml
+from translate_tool.json_stream import PreviewSampler
+from translate_tool.metrics import RunMetrics
+from translate_tool.budget import BudgetExceeded, TokenBudget
+from translate_tool.backends import FALLBACK_MODEL, configure_gemini, create_backend
+from translate_tool.breaker import CircuitBreaker
+from translate_tool.glossary import Glossary
+from translate_tool.core import (
+    CALL_TIMEOUT, LANGUAGE_CODES, SUPPORTED_LANGUAGES, Reporter, Translator, index_repository_contexts, parse_repo_url, scan_repository
+)
+from translate_tool.repo_writer import DEFAULT_COMMIT_MESSAGE, GitHubTarget, commit_locale_files, plan_locale_files
+
+@st.cache_resource
+def get_project_store():
+    """Open the project store once per server process."""
+    return ProjectStore(os.getenv("TRANSLATOR_DB_PATH", DEFAULT_DB_PATH))
+
+@st.cache_resource
+def get_shared_caches():
+    """Scan, parse and translation caches shared by every session in this process."""
+    return SharedCaches()
+
+# Heavy SDKs are imported on first use and cached once per process, so pages
+# that don't translate, scan or show tables never pay for them; the Gemini SDK
+# is loaded the same way by translate_tool.backends
+@st.cache_resource
+def load_github():
+    """Import PyGithub."""
+    import github
+    return github
+
+@st.cache_resource
+def load_pandas():
+    """Import pandas."""
+    import pandas as pd
+    return pd
+
+@st.cache_resource
+def load_css():
+    """Read the app stylesheet once per process, without comments and indentation."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css"), encoding="utf-8") as css_file:
+        css = css_file.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    return re.sub(r"\s*\n\s*", "", css)
+
 # Initialize session state variables early
 if 'page' not in st.session_state:
     st.session_state.page = "📚 Home"
 if 'sidebar_expanded' not in st.session_state:
     st.session_state.sidebar_expanded = False
 if 'projects' not in st.session_state:
-    st.session_state.projects = {}
+    st.session_state.projects = get_project_store().load_projects()
 if 'original_content' not in st.session_state:
     st.session_state.original_content = {}
 if 'flattened_content' not in st.session_state:
@@ -48,6 +95,10 @@ if 'review_file_path' not in st.session_state:
     st.session_state.review_file_path = None
 if 'show_project_files' not in st.session_state:
     st.session_state.show_project_files = False
+if 'run_metrics' not in st.session_state:
+    st.session_state.run_metrics = RunMetrics()
+if 'run_budget' not in st.session_state:
+    st.session_state.run_budget = TokenBudget()
 
 # Set page configuration
 st.set_page_config(
@@ -58,210 +109,7 @@ st.set_page_config(
 )
 
 # Add custom CSS for modern UI
-st.markdown("""
-<style>
-    /* Main container styling */
-    .main {
-        background-color: #f8f9fa;
-    }
-    
-    /* Card-like containers */
-    .stApp div[data-testid="stVerticalBlock"] div[data-testid="stVerticalBlock"] {
-        background-color: white;
-        border-radius: 10px;
-        padding: 20px;
-        margin-bottom: 20px;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.05);
-    }
-    
-    /* Headings */
-    h1 {
-        color: #1E3A8A;
-        font-weight: 700 !important;
-        margin-bottom: 24px !important;
-    }
-    
-    h2 {
-        color: #2563EB;
-        font-weight: 600 !important;
-        margin: 20px 0 !important;
-    }
-    
-    h3 {
-        color: #3B82F6;
-        font-weight: 500 !important;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        border-radius: 6px;
-        font-weight: 500;
-        transition: all 0.3s ease;
-    }
-    
-    /* Primary button */
-    .stButton > button[data-baseweb="button"] {
-        background-color: #2563EB;
-        border: none;
-    }
-    
-    .stButton > button[data-baseweb="button"]:hover {
-        background-color: #1E40AF;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-    }
-    
-    /* Progress bar */
-    div[data-testid="stProgressBar"] {
-        background-color: #E5E7EB;
-    }
-    
-    div[data-testid="stProgressBar"] > div {
-        background-color: #3B82F6 !important;
-    }
-    
-    /* Sidebar */
-    section[data-testid="stSidebar"] {
-        background-color: #1E293B;
-        color: white;
-    }
-    
-    section[data-testid="stSidebar"] button {
-        background-color: #3B82F6;
-        color: white;
-        border: none;
-    }
-    
-    section[data-testid="stSidebar"] h1, section[data-testid="stSidebar"] h2, 
-    section[data-testid="stSidebar"] h3, section[data-testid="stSidebar"] h4 {
-        color: white;
-    }
-    
-    /* Expanders */
-    .streamlit-expanderHeader {
-        font-weight: 500;
-        color: #4B5563;
-    }
-    
-    /* Success messages */
-    div[data-baseweb="notification"] {
-        border-radius: 6px;
-    }
-    
-    /* Dataframes */
-    div[data-testid="stDataFrame"] {
-        border-radius: 10px;
-        overflow: hidden;
-        margin: 10px 0;
-    }
-    
-    /* File uploader */
-    .stFileUploader > div {
-        border-radius: 6px;
-    }
-    
-    /* Status text */
-    .status-info {
-        background-color: #EFF6FF;
-        padding: 10px 15px;
-        border-radius: 6px;
-        border-left: 4px solid #3B82F6;
-        margin: 10px 0;
-    }
-    
-    .status-success {
-        background-color: #ECFDF5;
-        padding: 10px 15px;
-        border-radius: 6px;
-        border-left: 4px solid #10B981;
-        margin: 10px 0;
-    }
-    
-    .status-warning {
-        background-color: #FFFBEB;
-        padding: 10px 15px;
-        border-radius: 6px;
-        border-left: 4px solid #F59E0B;
-        margin: 10px 0;
-    }
-    
-    .status-error {
-        background-color: #FEF2F2;
-        padding: 10px 15px;
-        border-radius: 6px;
-        border-left: 4px solid #EF4444;
-        margin: 10px 0;
-    }
-    
-    /* Icons */
-    .icon-text {
-        display: flex;
-        align-items: center;
-        gap: 8px;
-    }
-    
-    /* Hero section */
-    .hero-section {
-        padding: 40px 0;
-        text-align: center;
-        background: linear-gradient(135deg, #1E3A8A 0%, #3B82F6 100%);
-        color: white;
-        border-radius: 10px;
-        margin-bottom: 30px;
-    }
-    
-    .hero-section h1 {
-        color: white;
-        font-size: 3rem;
-        font-weight: 800 !important;
-        margin-bottom: 16px !important;
-    }
-    
-    .hero-section p {
-        font-size: 1.2rem;
-        opacity: 0.9;
-        max-width: 800px;
-        margin: 0 auto 30px auto;
-    }
-    
-    /* Cards for features */
-    .feature-card {
-        background-color: white;
-        border-radius: 10px;
-        padding: 20px;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.05);
-        height: 100%;
-    }
-    
-    .feature-card h3 {
-        color: #1E3A8A;
-        margin-bottom: 15px;
-    }
-    
-    /* Nav section */
-    .nav-section {
-        display: flex;
-        justify-content: center;
-        gap: 20px;
-        margin: 30px 0;
-    }
-    
-    .nav-button {
-        background-color: white;
-        color: #2563EB;
-        padding: 8px 16px;
-        border-radius: 6px;
-        text-decoration: none;
-        font-weight: 500;
-        border: 1px solid #E5E7EB;
-        transition: all 0.3s ease;
-    }
-    
-    .nav-button:hover {
-        background-color: #2563EB;
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
 
 # Configure the Gemini API
 def configure_genai():
@@ -281,7 +129,7 @@ def configure_genai():
     
     if api_key:
         try:
-            genai.configure(api_key=api_key)
+            configure_gemini(api_key)
             return True
         except Exception as e:
             st.error(f"Failed to configure Gemini API: {str(e)}")
@@ -306,8 +154,9 @@ def configure_github():
     
     if github_token:
         try:
-            auth = Auth.Token(github_token)
-            g = Github(auth=auth)
+            github = load_github()
+            auth = github.Auth.Token(github_token)
+            g = github.Github(auth=auth)
             # Test the connection
             g.get_user().login
             return g
@@ -316,236 +165,235 @@ def configure_github():
             return None
     return None
 
-def scan_github_repository(repo_url, pattern_search=True):
+class StreamlitReporter(Reporter):
+    """Render pipeline status as status boxes, captions, spinners and progress bars."""
+
+    def __init__(self):
+        self.progress_bar = None
+        self.status_text = None
+
+    def _status(self, level, message):
+        st.markdown(f"<div class='status-{level}'>{message}</div>", unsafe_allow_html=True)
+
+    def info(self, message):
+        self._status("info", message)
+
+    def success(self, message):
+        self._status("success", message)
+
+    def warning(self, message):
+        self._status("warning", message)
+
+    def error(self, message):
+        self._status("error", message)
+
+    def detail(self, message):
+        st.caption(message)
+
+    def progress(self, done, total, message=None):
+        # Each step starts at 0 and gets its own progress bar
+        if done == 0 or self.progress_bar is None:
+            self.progress_bar = st.progress(0)
+            self.status_text = st.empty()
+        self.progress_bar.progress(min(1.0, done / max(1, total)))
+        if message:
+            self.status_text.markdown(f"<div class='status-info'>{message}</div>", unsafe_allow_html=True)
+
+    def stage(self, message):
+        return st.spinner(message)
+
+@st.cache_resource
+def get_backend():
+    """The model backend, chosen by TRANSLATOR_BACKEND (Gemini unless set to "mock")."""
+    # Requests end with the translator's call deadline, so abandoned calls don't hold budget
+    return create_backend(timeout=CALL_TIMEOUT)
+
+@st.cache_resource
+def get_fallback_backend():
+    """The backend of the fallback model tier set by TRANSLATOR_FALLBACK_MODEL, or None."""
+    if not FALLBACK_MODEL:
+        return None
+    return create_backend(batch_model=FALLBACK_MODEL, single_model=FALLBACK_MODEL, timeout=CALL_TIMEOUT)
+
+@st.cache_resource
+def get_circuit_breakers():
+    """Circuit breakers of the primary and fallback tiers, shared by every session so an outage is noticed once."""
+    backend, fallback_backend = get_backend(), get_fallback_backend()
+    breaker = CircuitBreaker(backend.batch_model)
+    fallback_breaker = CircuitBreaker(fallback_backend.batch_model) if fallback_backend else None
+    return breaker, fallback_breaker
+
+def start_run(project_name=None):
+    """Start collecting timings, counters and token usage for a new scan or translation run."""
+    st.session_state.run_metrics = RunMetrics()
+    st.session_state.run_budget = TokenBudget(
+        st.session_state.get("budget_max_tokens") or None,
+        st.session_state.get("budget_max_cost") or None,
+        project=project_name,
+        warn=StreamlitReporter().warning
+    )
+    return st.session_state.run_metrics
+
+def get_translator(glossary=None):
+    """Create a translator that reports to the page and shares the process-wide translation memory."""
+    breaker, fallback_breaker = get_circuit_breakers()
+    return Translator(
+        StreamlitReporter(), get_backend(), get_shared_caches().translation_memory,
+        metrics=st.session_state.run_metrics, budget=st.session_state.run_budget,
+        fallback_backend=get_fallback_backend(), breaker=breaker, fallback_breaker=fallback_breaker,
+        glossary=glossary
+    )
+
+def project_glossary(project_name):
+    """Return a project's glossary, or None if it has no terms."""
+    rows = st.session_state.projects[project_name].get("glossary") or []
+    return Glossary(rows) if rows else None
+
+def check_run_budget(source_strings, languages, skip_keys=(), contexts=None, glossary=None):
     """
-    Scan a GitHub repository for strings.xml files.
-    Uses pattern-based search for faster scanning when pattern_search=True
-    Supports specifying a branch in the URL
+    Show the estimated tokens and cost of translating strings, before any model call.
     
     Args:
-        repo_url (str): The GitHub repository URL (can include /tree/branch-name)
-        pattern_search (bool): Whether to use pattern-based search
+        source_strings (dict): The source strings
+        languages (list): Target language names
+        skip_keys (set): Keys marked translatable="false"
+        contexts (dict): Usage context of each key, included in the prompts
+        glossary (Glossary): The project's glossary, whose matching entries are included in the prompts
+        
+    Raises:
+        BudgetExceeded: If the estimate exceeds the run budget
+    """
+    translator = get_translator(glossary)
+    estimate = {"strings": 0, "calls": 0, "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+    for language in languages:
+        if LANGUAGE_CODES.get(language) in (None, "en"):
+            continue
+        for name, value in translator.estimate_usage(source_strings, language, contexts or {}, skip_keys=skip_keys).items():
+            estimate[name] += value
+    
+    st.markdown(
+        f"<div class='status-info'>Estimated usage: {estimate['calls']} model calls, "
+        f"{estimate['prompt_tokens'] + estimate['output_tokens']:,} tokens (${estimate['cost_usd']:.4f}), before retries.</div>",
+        unsafe_allow_html=True
+    )
+    st.session_state.run_budget.check_estimate(estimate)
+
+def record_run_usage(project_name):
+    """Add the token usage of the current run to the project's totals."""
+    rows = st.session_state.run_budget.ledger.totals(by=("language", "model"))
+    if rows:
+        get_project_store().record_usage(project_name, rows)
+
+def translate_all_strings(texts_dict, target_language, contexts_dict={}, skip_keys=(), glossary=None):
+    """
+    Translate a dictionary of strings, reusing the shared translation memory.
+    
+    Args:
+        texts_dict (dict): A dictionary of string keys and source texts
+        target_language (str): The target language name
+        contexts_dict (dict): Optional contexts for each key
+        skip_keys (set): Keys marked translatable="false"
+        glossary (Glossary): Terms whose translations are enforced
         
     Returns:
-        dict: A dictionary of strings.xml files found in the repository
+        dict: A dictionary of string keys and translations
     """
-    try:
-        # Extract branch if specified in the URL
-        branch = None
-        if "/tree/" in repo_url:
-            # Split the URL at /tree/ to separate branch name
-            base_url, branch_part = repo_url.split("/tree/", 1)
-            # Get the branch name (it might have additional path components)
-            branch = branch_part.split("/")[0]
-            # Reconstruct the base repo URL without the branch part
-            repo_url = base_url
-        
-        # Extract owner and repo name from URL
-        url_parts = repo_url.strip('/').split('/')
-        owner = url_parts[-2]
-        repo_name = url_parts[-1]
-        
-        g = configure_github()
-        if not g:
-            st.error("GitHub API not configured. Please enter a valid token in the sidebar.")
-            return {}
-        
-        repo = g.get_repo(f"{owner}/{repo_name}")
-        
-        # If branch was specified in the URL, use it
-        if branch:
-            st.markdown(f"<div class='status-info'>Scanning branch: {branch}</div>", unsafe_allow_html=True)
-            # Verify the branch exists
-            try:
-                repo.get_branch(branch)
-            except Exception as e:
-                st.markdown(f"<div class='status-error'>Branch '{branch}' not found. Error: {str(e)}</div>", unsafe_allow_html=True)
-                return {}
-        else:
-            # Otherwise use the default branch
-            branch = repo.default_branch
-            st.markdown(f"<div class='status-info'>Using default branch: {branch}</div>", unsafe_allow_html=True)
-        
-        # Common patterns where strings.xml files are typically located
-        common_patterns = [
-            # Mifos KMP specific patterns - prioritize these
-            "feature/*/src/commonMain/composeResources/values/strings.xml",
-            "feature/*/src/*/composeResources/values/strings.xml",
-            "feature/*/src/*/resources/values/strings.xml",
-            
-            # KMM/Compose Multiplatform patterns
-            "*/src/commonMain/composeResources/values/strings.xml",
-            "*/*/src/commonMain/composeResources/values/strings.xml",
-            "*/src/commonMain/resources/MR/base/strings.xml",
-            "*/*/src/commonMain/resources/MR/base/strings.xml",
-            
-            # Android module patterns
-            "*/src/main/res/values/strings.xml",
-            "*/*/src/main/res/values/strings.xml",
-            "feature/*/src/main/res/values/strings.xml",
-            
-            # General fallbacks
-            "**/values/strings.xml",
-            "**/values-*/strings.xml"
-        ]
-        
-        found_files = {}
-        
-        # If pattern search is enabled, search for common patterns first
-        if pattern_search:
-            with st.spinner(f"Searching for strings.xml files using common patterns in branch '{branch}'..."):
-                progress_bar = st.progress(0)
-                
-                for i, pattern in enumerate(common_patterns):
-                    try:
-                        # Update progress
-                        progress_bar.progress((i + 1) / len(common_patterns))
-                        st.caption(f"Trying pattern: {pattern}")
-                        
-                        # Search for files matching the pattern
-                        contents = repo.get_contents("", ref=branch)
-                        path_parts = pattern.split("/")
-                        
-                        # Try to match the pattern
-                        files = search_by_pattern(repo, contents, path_parts, 0, branch)
-                        
-                        if files:
-                            st.caption(f"Found {len(files)} files with pattern: {pattern}")
-                            
-                        for file_path, content in files.items():
-                            found_files[file_path] = content
-                            
-                    except Exception as e:
-                        st.caption(f"Error with pattern {pattern}: {str(e)}")
-                        # Continue with next pattern if an error occurs
-                        continue
-                
-                # If we found files, return them without doing a full repository scan
-                if found_files:
-                    return found_files
-        
-        # If no files were found with pattern search or pattern search is disabled,
-        # fall back to full repository scan (slower but thorough)
-        st.markdown("<div class='status-info'>Pattern search didn't find strings.xml files. Performing a full repository scan (this may take longer)...</div>", unsafe_allow_html=True)
-        return search_files_in_repo(repo, "strings.xml", branch)
-            
-    except Exception as e:
-        st.markdown(f"<div class='status-error'>Error scanning repository: {str(e)}</div>", unsafe_allow_html=True)
-        return {}
+    return get_translator(glossary).translate_all_strings(texts_dict, target_language, contexts_dict, skip_keys)
 
-def search_by_pattern(repo, contents, pattern_parts, current_depth, branch):
+def scan_github_repository(repo_url, pattern_search=True, use_cache=True):
     """
-    Recursively search for files that match a pattern.
+    Scan a GitHub repository for strings.xml files.
+    Results are shared between sessions and keyed by the scanned commit
     
     Args:
-        repo: GitHub repository object
-        contents: Current contents to search through
-        pattern_parts: List of parts in the pattern path
-        current_depth: Current depth in the pattern
-        branch: Branch to search in
+        repo_url (str): The GitHub repository URL (can include /tree/branch-name)
+        pattern_search (bool): Whether to use pattern-based search
+        use_cache (bool): Whether to reuse a previous scan of the same commit
         
     Returns:
-        dict: A dictionary mapping file paths to their content
+        dict: A dictionary of strings.xml files found in the repository
     """
-    found_files = {}
+    g = configure_github()
+    if not g:
+        st.error("GitHub API not configured. Please enter a valid token in the sidebar.")
+        return {}
     
-    if current_depth >= len(pattern_parts):
-        return found_files
-        
-    current_pattern = pattern_parts[current_depth]
+    return scan_repository(
+        g, repo_url, pattern_search, cache=get_shared_caches().scan_results, use_cache=use_cache,
+        reporter=StreamlitReporter(), metrics=start_run()
+    )
+
+def index_project_contexts(project_name, string_files, use_cache=True):
+    """
+    Find where a GitHub project's strings are used in its Kotlin and Java sources.
     
-    for content_item in contents:
-        # Skip non-matching items unless it's a wildcard
-        if current_pattern != "*" and current_pattern != "**" and content_item.name != current_pattern:
-            continue
-            
-        if content_item.type == "dir":
-            # If it's a directory and matches the pattern (or pattern is a wildcard)
-            try:
-                next_contents = repo.get_contents(content_item.path, ref=branch)
-                
-                # If the pattern is "**", we need to search at this level AND deeper
-                if current_pattern == "**":
-                    # Search at this level with the next pattern part
-                    deeper_files = search_by_pattern(repo, next_contents, pattern_parts, current_depth + 1, branch)
-                    found_files.update(deeper_files)
-                    
-                    # Also search at this same level for more directories
-                    same_level_files = search_by_pattern(repo, next_contents, pattern_parts, current_depth, branch)
-                    found_files.update(same_level_files)
-                else:
-                    # Regular directory match, go one level deeper in the pattern
-                    deeper_files = search_by_pattern(repo, next_contents, pattern_parts, current_depth + 1, branch)
-                    found_files.update(deeper_files)
-            except Exception as e:
-                st.caption(f"Error accessing directory {content_item.path}: {str(e)}")
-                # Skip if we can't access the directory content
-                continue
-                
-        elif content_item.type == "file" and current_depth == len(pattern_parts) - 1:
-            # If it's a file and the last pattern part matches the filename
-            if content_item.name == pattern_parts[-1] or pattern_parts[-1] == "*":
-                try:
-                    # Get the file content
-                    raw_content = base64.b64decode(content_item.content).decode('utf-8')
-                    found_files[content_item.path] = raw_content
-                    st.caption(f"Found matching file: {content_item.path}")
-                except Exception as e:
-                    st.caption(f"Error decoding content of {content_item.path}: {str(e)}")
-                    # Skip if we can't decode the content
-                    continue
+    The usages are stored as the project's "contexts" and sent with every
+    translation prompt, so the model knows e.g. that a string is a button label.
     
-    return found_files
+    Args:
+        project_name (str): The project name
+        string_files (dict): The scanned string resource files
+        use_cache (bool): Whether to reuse the index of a previously scanned commit
+    """
+    g = configure_github()
+    project = st.session_state.projects[project_name]
+    if not g or project.get("type") != "GitHub Repository":
+        return
+    
+    keys = set()
+    for file_path, content in string_files.items():
+        keys.update(read_file_strings(file_path, content))
+    contexts = index_repository_contexts(
+        g, project["repo_url"], keys, cache=get_shared_caches().scan_results, use_cache=use_cache,
+        reporter=StreamlitReporter(), metrics=st.session_state.run_metrics
+    )
+    get_project_store().save_contexts(project_name, contexts)
+    project["contexts"] = contexts
 
-def search_files_in_repo(repo, filename, branch):
+def write_translations_to_repository(project, branch, message, pull_request_branch=None):
     """
-    Search for files in a repository with a specific filename.
+    Commit changed values-<lang>/strings.xml files back to a project's repository.
+    
+    Translations are written next to the scanned source files, and only
+    files whose content differs from the branch are included in the commit.
     
     Args:
-        repo: GitHub repository object
-        filename (str): The filename to search for
-        branch (str): Branch to search in
+        project (dict): A GitHub project
+        branch (str): The branch to compare against
+        message (str): The commit message
+        pull_request_branch (str): If set, commit to this new branch and open a pull request
         
     Returns:
-        dict: A dictionary mapping file paths to their content
+        dict: The changed paths, the new commit SHA and the pull request URL, or None on failure
     """
-    found_files = {}
-    
-    # Get all files in the repository
-    contents = repo.get_contents("", ref=branch)
+    g = configure_github()
+    if not g:
+        st.markdown("<div class='status-error'>GitHub API not configured. Please enter a valid token in the sidebar.</div>", unsafe_allow_html=True)
+        return None
     
-    with st.spinner(f"Scanning repository for {filename} files in branch '{branch}'..."):
-        progress_bar = st.progress(0)
-        total_files = len(contents)
-        processed = 0
-        
-        while contents:
-            file_content = contents.pop(0)
-            processed += 1
-            progress_bar.progress(min(1.0, processed / max(1, total_files)))
-            
-            if file_content.type == "dir":
-                try:
-                    # Add directory contents to the queue
-                    dir_contents = repo.get_contents(file_content.path, ref=branch)
-                    contents.extend(dir_contents)
-                    total_files += len(dir_contents) - 1  # Adjust total count
-                except Exception as e:
-                    # Skip if we can't access the directory
-                    st.caption(f"Error accessing directory {file_content.path}: {str(e)}")
-                    continue
-            elif file_content.name == filename:
-                # Found a strings.xml file
-                try:
-                    raw_content = base64.b64decode(file_content.content).decode('utf-8')
-                    found_files[file_content.path] = raw_content
-                    st.caption(f"Found file: {file_content.path}")
-                except Exception as e:
-                    # Skip if we can't decode the content
-                    st.caption(f"Error decoding content of {file_content.path}: {str(e)}")
-                    continue
+    owner, repo_name, _ = parse_repo_url(project["repo_url"])
+    repo = g.get_repo(f"{owner}/{repo_name}")
+    
+    translations_by_file = dict(project.get("file_translations") or {})
+    if project.get("translations") and project.get("files"):
+        # Project-wide translations are generated from the first scanned file
+        first_file = next(iter(project["files"]))
+        translations_by_file.setdefault(first_file, project["translations"])
+    
+    untranslatable = {path: source_untranslatable_keys(project, path) for path in translations_by_file}
+    attributes = {path: source_resource_attributes(project, path) for path in translations_by_file}
+    files = plan_locale_files(
+        translations_by_file,
+        lambda source_path, lang_code, translations: dict_to_strings_xml(
+            translations, lang_code, untranslatable[source_path], attributes[source_path]
+        )
+    )
+    if not files:
+        st.markdown("<div class='status-warning'>No translations map to values/strings.xml files in this repository.</div>", unsafe_allow_html=True)
+        return None
     
-    return found_files
+    target = GitHubTarget(repo, branch, pull_request_branch=pull_request_branch)
+    return commit_locale_files(target, files, message)
 
 def parse_strings_xml(xml_content):
     """
@@ -558,380 +406,80 @@ def parse_strings_xml(xml_content):
         dict: A dictionary of string keys and values
     """
     try:
-        root = ET.fromstring(xml_content)
-        result = {}
-        
-        for string_elem in root.findall('.//string'):
-            key = string_elem.get('name')
-            if key:
-                # Remove any formatting tags but keep the text
-                value = ''.join(string_elem.itertext())
-                result[key] = value
-                
-        return result
+        return strings_xml.parse_strings_xml(xml_content)
     except Exception as e:
         st.markdown(f"<div class='status-error'>Error parsing XML: {str(e)}</div>", unsafe_allow_html=True)
         return {}
 
-def parse_translation_response(response_text):
+def xml_to_strings_dict(xml_content):
+    """Convert XML content to a dictionary of strings"""
+    # Parsed files are shared between sessions, keyed by content hash
+    parsed_files = get_shared_caches().parsed_files
+    cache_key = ("strings.xml", content_hash(xml_content))
+    cached = parsed_files.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
+    with st.session_state.run_metrics.span("parse"):
+        strings_dict = parse_strings_xml(xml_content)
+    if strings_dict:
+        parsed_files.set(cache_key, dict(strings_dict))
+    return strings_dict
+
+def read_file_strings(file_path, content):
     """
-    Parse the translation response with improved error handling for common issues.
+    Parse any supported resource file into a dictionary of strings.
+    
+    The codec is picked from the format registry by file extension, and
+    parsed files are shared between sessions, keyed by content hash.
     
-    Args:
-        response_text (str): The raw text response from the API
-        
     Returns:
-        dict: A dictionary of key-value pairs with translations, or empty dict if parsing fails
+        dict: A dictionary of string keys and values; empty if the file can't be parsed
     """
+    if not content:
+        return {}
+    if file_path.endswith(".xml"):
+        return xml_to_strings_dict(content)
+    
+    spec = formats.format_for_path(file_path)
+    if spec is None:
+        return {}
+    
+    parsed_files = get_shared_caches().parsed_files
+    cache_key = (spec.name, content_hash(content))
+    cached = parsed_files.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+    
     try:
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].strip()
-
-        response_text = re.sub(r'\s*//.*', '', response_text)
-        response_text = re.sub(r'/\*.*?\*/', '', response_text, flags=re.DOTALL)
-        
-        response_text = re.sub(r',\s*}', '}', response_text)
-        response_text = re.sub(r',\s*\]', ']', response_text)
-        
-        response_text = re.sub(r'([{,]\s*)([a-zA-Z0-9_]+)(\s*:)', r'\1"\2"\3', response_text)
-        
-        response_text = re.sub(r'}\s*{', '},{', response_text)
-        
-        translations_data = json.loads(response_text)
-        
-        # Process translations
-        all_results = {}
-        
-        # Handle both array and object formats
-        if isinstance(translations_data, list):
-            for item in translations_data:
-                key = item.get("key")
-                translation = item.get("translation")
-                if key and translation:
-                    all_results[key] = translation
-        elif isinstance(translations_data, dict):
-            for key, item in translations_data.items():
-                if isinstance(item, dict) and "translation" in item:
-                    all_results[key] = item["translation"]
-                else:
-                    all_results[key] = item
-        
-        return all_results
-        
-    except json.JSONDecodeError as json_err:
-        st.warning(f"JSON error: {str(json_err)}")
-        st.code(response_text[:200] + "..." if len(response_text) > 200 else response_text)
-        
-        # Try extracting individual JSON objects
-        pattern = r'{[^{}]*"key"\s*:\s*"([^"]+)"[^{}]*"translation"\s*:\s*"([^"]+)"[^{}]*}'
-        matches = re.finditer(pattern, response_text)
-        
-        translations = {}
-        for match in matches:
-            try:
-                obj_text = match.group(0)
-                # Fix potential issues within the object
-                obj_text = re.sub(r',\s*}', '}', obj_text)
-                obj = json.loads(obj_text)
-                if "key" in obj and "translation" in obj:
-                    translations[obj["key"]] = obj["translation"]
-            except:
-                key_match = re.search(r'"key"\s*:\s*"([^"]+)"', match.group(0))
-                translation_match = re.search(r'"translation"\s*:\s*"([^"]+)"', match.group(0))
-                if key_match and translation_match:
-                    translations[key_match.group(1)] = translation_match.group(1)
-        
-        if translations:
-            return translations
-            
-        pattern = r'"key"\s*:\s*"([^"]+)"[^}]+"translation"\s*:\s*"([^"]+)"'
-        matches = re.finditer(pattern, response_text)
-        
-        translations = {}
-        for match in matches:
-            key = match.group(1)
-            translation = match.group(2)
-            translations[key] = translation
-            
-        return translations
+        with st.session_state.run_metrics.span("parse"):
+            strings_dict = dict(formats.read_strings(file_path, content))
+    except Exception:
+        return {}
+    if strings_dict:
+        parsed_files.set(cache_key, dict(strings_dict))
+    return strings_dict
 
-def translate_all_strings(texts_dict, target_language, contexts_dict={}):
+def source_untranslatable_keys(project, file_path):
+    """Return the keys a project's source file marks as untranslatable"""
+    content = project.get("files", {}).get(file_path)
+    if not content:
+        return frozenset()
     try:
-        # Filter only string values
-        string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
-        
-        # Prepare translation items
-        translation_items = []
-        for key, text in string_contents.items():
-            context = contexts_dict.get(key, "")
-            translation_items.append({
-                "id": key,  # Use actual key as ID
-                "key": key,
-                "text": text,
-                "context": context
-            })
-        
-        input_text = json.dumps(translation_items, ensure_ascii=False)
-        estimated_tokens = len(input_text) / 4  # Rough estimate: 4 chars per token
-        
+        return formats.untranslatable_keys(file_path, content)
+    except Exception:
+        return frozenset()
 
-        if estimated_tokens > 10000000:
-            st.markdown("<div class='status-info'>Input is too large for a single API call. Switching to batch mode...</div>", unsafe_allow_html=True)
-            return batch_translate_texts(string_contents, target_language, contexts_dict)
-        
-        # Craft a translation prompt for all strings at once
-        prompt = f"""
-        Translate the following UI strings to {target_language}. 
-        
-        Each item includes:
-        - id: A unique identifier
-        - key: The string identifier
-        - text: The text to translate
-        - context: (Optional) Where/how this string is used in the UI
-        
-        Guidelines:
-        - Keep translations concise and natural
-        - Use everyday language, not formal or complex terms
-        - Maintain the same meaning and intent as the original
-        - Don't add extra words or explanations
-        - Ensure translations would fit well on buttons or UI elements
-        - Preserve any placeholders like {{variable}} or %s
-        - Preserve formatting and special characters
-        - DO NOT include any comments in the JSON output
-        - DO NOT use comment lines with // or /* */ in your response
-        
-        Input:
-        {json.dumps(translation_items, ensure_ascii=False, indent=2)}
-        
-        Return ONLY a valid JSON array with the same structure as input, but add a "translation" field to each item.
-        Don't include any explanations, comments, or additional text outside or inside the JSON array.
-        """
-        
-        # Configure model with larger output tokens
-        model = genai.GenerativeModel('gemini-2.0-flash', generation_config={"max_output_tokens": 8192})
-        response = model.generate_content(prompt)
-        
-        # Parse the response using improved parsing
-        response_text = response.text.strip()
-        translations = parse_translation_response(response_text)
-        
-        if translations:
-            return translations
-            
-        # If parsing completely fails, fall back to batch translation
-        st.markdown("<div class='status-warning'>Failed to parse response. Switching to batch mode...</div>", unsafe_allow_html=True)
-        return batch_translate_texts(string_contents, target_language, contexts_dict)
-            
-    except Exception as e:
-        st.markdown(f"<div class='status-error'>Translation error: {str(e)}</div>", unsafe_allow_html=True)
-        # Fall back to batch translation
-        st.markdown("<div class='status-warning'>Error in single API call. Switching to batch mode...</div>", unsafe_allow_html=True)
-        return batch_translate_texts(string_contents, target_language, contexts_dict)
-
-def batch_translate_texts(texts_dict, target_language, contexts_dict={}):
-    try:
-        string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
-        
-        texts_list = list(string_contents.items())
-        
-        batch_size = 50 
-        all_results = {}
-        
-        # Process each batch
-        total_batches = (len(texts_list) + batch_size - 1) // batch_size
-        
-        # Create progress bar
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i in range(0, len(texts_list), batch_size):
-            batch = texts_list[i:i+batch_size]
-            current_batch = (i//batch_size) + 1
-            
-            status_text.markdown(f"<div class='status-info'>Translating batch {current_batch} of {total_batches} ({len(batch)} strings)</div>", unsafe_allow_html=True)
-            
-            # Create structured format for translation with JSON
-            translation_items = []
-            for j, (key, text) in enumerate(batch):
-                context = contexts_dict.get(key, "")
-                translation_items.append({
-                    "id": key,
-                    "key": key,
-                    "text": text,
-                    "context": context
-                })
-            
-            # Craft a batch translation prompt with explicit instruction not to use comments
-            prompt = f"""
-            Translate the following UI strings to {target_language}. 
-            
-            Each item includes:
-            - id: A unique identifier
-            - key: The string identifier
-            - text: The text to translate
-            - context: (Optional) Where/how this string is used in the UI
-            
-            Guidelines:
-            - Keep translations concise and natural
-            - Use everyday language, not formal or complex terms
-            - Maintain the same meaning and intent as the original
-            - Don't add extra words or explanations
-            - Ensure translations would fit well on buttons or UI elements
-            - Preserve any placeholders like {{variable}} or %s
-            - Preserve formatting and special characters
-            - DO NOT include any comments in the JSON output
-            - DO NOT use comment lines with // or /* */ in your response
-            
-            Input:
-            {json.dumps(translation_items, ensure_ascii=False, indent=2)}
-            
-            Return ONLY a valid JSON array with the same structure as input, but add a "translation" field to each item.
-            Don't include any explanations, comments, or additional text outside or inside the JSON array.
-            """
-            
-            # Configure model with appropriate tokens
-            model = genai.GenerativeModel('gemini-2.0-flash', generation_config={"max_output_tokens": 8192})
-            
-            max_retries = 3
-            for retry in range(max_retries):
-                try:
-                    response = model.generate_content(prompt)
-                    
-                    # Parse the response using the improved parser
-                    response_text = response.text.strip()
-                    translations = parse_translation_response(response_text)
-                    
-                    if translations:
-                        all_results.update(translations)
-                        break  # Success! Exit retry loop
-                    elif retry < max_retries - 1:
-                        st.markdown(f"<div class='status-warning'>Failed to parse batch {current_batch}. Retrying ({retry + 1}/{max_retries})...</div>", unsafe_allow_html=True)
-                        time.sleep(2)  # Wait a bit before retrying
-                    else:
-                        st.markdown(f"<div class='status-error'>Failed to translate batch {current_batch} after {max_retries} attempts. Skipping batch.</div>", unsafe_allow_html=True)
-                        # Add batch keys with original values to show something rather than nothing
-                        for key, text in batch:
-                            if key not in all_results:
-                                all_results[key] = text  # Use original as fallback
-                
-                except Exception as batch_error:
-                    if retry < max_retries - 1:
-                        st.markdown(f"<div class='status-warning'>Error in batch {current_batch}: {str(batch_error)}. Retrying ({retry + 1}/{max_retries})...</div>", unsafe_allow_html=True)
-                        time.sleep(2)  # Wait a bit before retrying
-                    else:
-                        st.markdown(f"<div class='status-error'>Failed to process batch {current_batch} after {max_retries} attempts. Skipping batch.</div>", unsafe_allow_html=True)
-                        # Add batch keys with original values to show something rather than nothing
-                        for key, text in batch:
-                            if key not in all_results:
-                                all_results[key] = text  # Use original as fallback
-            
-            # Update progress
-            progress_bar.progress(min(1.0, (i + batch_size) / len(texts_list)))
-            
-            # Small delay between batches to avoid rate limiting
-            time.sleep(1)
-        
-        # Check if any strings were not translated and add them with original text
-        for key, text in string_contents.items():
-            if key not in all_results:
-                all_results[key] = text
-                
-        return all_results
-        
-    except Exception as e:
-        st.markdown(f"<div class='status-error'>Batch translation error: {str(e)}</div>", unsafe_allow_html=True)
-        # Create a dictionary with original strings as fallback
-        return {k: v for k, v in texts_dict.items() if isinstance(v, str)}
-        
-def translate_text(text, target_language, context=""):
-    try:
-        # Craft a careful prompt for translation
-        prompt = f"""
-        Translate the following UI string to {target_language}:
-        
-        Original text: "{text}"
-        
-        Context: {context}
-        
-        Guidelines:
-        - Keep the translation concise and natural
-        - Use everyday language, not formal or complex terms
-        - Maintain the same meaning and intent as the original
-        - Don't add extra words or explanations
-        - Ensure the translation would fit well on a button or UI element
-        - Preserve any placeholders like {{variable}} or %s
-        
-        Return ONLY the translated text without any explanations or additional comments.
-        """
-        
-        model = genai.GenerativeModel('gemini-1.5-pro')
-        response = model.generate_content(prompt)
-        
-        translation = response.text.strip()
-        if ":" in translation:
-            translation = translation.split(":", 1)[1].strip()
-        
-        translation = translation.strip('"\'')
-        
-        return translation
-    except Exception as e:
-        st.markdown(f"<div class='status-error'>Single translation error: {str(e)}</div>", unsafe_allow_html=True)
-        return None
-
-def flatten_json(nested_json, prefix=""):
-    flattened = {}
-    for key, value in nested_json.items():
-        if isinstance(value, dict):
-            flattened.update(flatten_json(value, prefix + key + "."))
-        else:
-            flattened[prefix + key] = value
-    return flattened
-
-def unflatten_json(flattened_json):
-    result = {}
-    for key, value in flattened_json.items():
-        parts = key.split(".")
-        d = result
-        for part in parts[:-1]:
-            if part not in d:
-                d[part] = {}
-            d = d[part]
-        d[parts[-1]] = value
-    return result
-
-def xml_to_strings_dict(xml_content):
-    """Convert XML content to a dictionary of strings"""
+def source_resource_attributes(project, file_path):
+    """Return the resource attributes, such as tools:ignore, of a project's source file"""
+    content = project.get("files", {}).get(file_path)
+    if not content:
+        return {}
     try:
-        root = ET.fromstring(xml_content)
-        strings_dict = {}
-        
-        for string_elem in root.findall(".//string"):
-            name = string_elem.get("name")
-            if name:
-                # Extract the text content, preserving any nested tags
-                value = "".join(string_elem.itertext())
-                strings_dict[name] = value
-                
-        return strings_dict
-    except Exception as e:
-        st.markdown(f"<div class='status-error'>Error parsing XML: {str(e)}</div>", unsafe_allow_html=True)
+        return formats.resource_attributes(file_path, content)
+    except Exception:
         return {}
 
-def dict_to_strings_xml(strings_dict, language_code=None):
-    """Convert a dictionary of strings to XML content"""
-    root = ET.Element("resources")
-    
-    for key, value in strings_dict.items():
-        string_elem = ET.SubElement(root, "string")
-        string_elem.set("name", key)
-        string_elem.text = value
-    
-    # Convert to string
-    xml_str = ET.tostring(root, encoding="unicode")
-    return '<?xml version="1.0" encoding="utf-8"?>\n' + xml_str
-
 def create_kotlin_multiplatform_structure(translations_dict, languages):
     """Create a Kotlin Multiplatform file structure for translations"""
     files = {}
@@ -946,40 +494,308 @@ def create_kotlin_multiplatform_structure(translations_dict, languages):
     
     return files
 
-# Create list of available languages
-SUPPORTED_LANGUAGES = [
-    "Arabic", "Bengali", "Chinese (Simplified)", "Chinese (Traditional)", 
-    "Dutch", "English", "French", "German", "Hindi", "Indonesian", 
-    "Italian", "Japanese", "Korean", "Portuguese", "Russian", 
-    "Spanish", "Swedish", "Thai", "Turkish", "Vietnamese"
-]
-
-LANGUAGE_CODES = {
-    "Arabic": "ar",
-    "Bengali": "bn",
-    "Chinese (Simplified)": "zh-CN",
-    "Chinese (Traditional)": "zh-TW",
-    "Dutch": "nl",
-    "English": "en",
-    "French": "fr",
-    "German": "de",
-    "Hindi": "hi",
-    "Indonesian": "id",
-    "Italian": "it",
-    "Japanese": "ja",
-    "Korean": "ko",
-    "Portuguese": "pt",
-    "Russian": "ru",
-    "Spanish": "es",
-    "Swedish": "sv",
-    "Thai": "th",
-    "Turkish": "tr",
-    "Vietnamese": "vi"
-}
+def render_translation_editor(project_name, file_path, lang_translations, selected_language, editor_key):
+    """
+    Render a paginated editor for one language of a file or project.
+    
+    Filtering, sorting and pagination happen on the server, so only the
+    visible page of rows is sent to the browser.
+    
+    Args:
+        project_name (str): The project being reviewed
+        file_path (str): The reviewed file, or PROJECT_SCOPE for project-wide translations
+        lang_translations (dict): A dictionary mapping language codes to {key: value} dictionaries
+        selected_language (str): The language code to review
+        editor_key (str): Unique widget key for this editor
+    """
+    translations = lang_translations[selected_language]
+    source = None if selected_language == "en" else lang_translations.get("en", {})
+    
+    # Search and sort controls
+    col1, col2, col3, col4 = st.columns([3, 1, 2, 1])
+    with col1:
+        search_query = st.text_input("🔍 Search keys or translations", "", key=f"{editor_key}_search")
+    with col2:
+        fuzzy_search = st.checkbox("Fuzzy", value=False, key=f"{editor_key}_fuzzy")
+    with col3:
+        sort_by = st.selectbox("Sort by", SORT_OPTIONS, key=f"{editor_key}_sort")
+    with col4:
+        descending = st.checkbox("Descending", value=False, key=f"{editor_key}_descending")
+    
+    search_index = get_search_index(project_name, file_path, selected_language, translations, source)
+    keys = search_index.search(search_query, fuzzy=fuzzy_search)
+    if not (search_query and fuzzy_search):
+        # Fuzzy results keep their relevance order
+        keys = sort_review_keys(keys, source or {}, translations, sort_by, descending)
+    
+    # Pagination controls
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key=f"{editor_key}_page_size")
+    total_pages = max(1, (len(keys) + page_size - 1) // page_size)
+    with col2:
+        requested_page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, step=1, key=f"{editor_key}_page")
+    page_keys, page, total_pages = paginate(keys, requested_page, page_size)
+    
+    st.caption(f"Showing {len(page_keys)} of {len(keys)} matching strings ({len(translations)} total), page {page} of {total_pages}")
+    
+    # Only the visible page is turned into a table
+    df = load_pandas().DataFrame(build_review_rows(page_keys, translations, source))
+    
+    # Display as editable dataframe
+    st.markdown("### Edit Translations")
+    st.markdown("<div class='status-info'>Make changes directly in the table below and click Save when done.</div>", unsafe_allow_html=True)
+    
+    # The widget key follows the visible rows, so an edit delta always refers to this page
+    widget_key = f"{editor_key}_{content_hash(chr(10).join(page_keys))[:12]}"
+    st.data_editor(df, use_container_width=True, disabled=["Key", "Original"], key=widget_key)
+    
+    # Save edited translations
+    if st.button("💾 Save Edited Translations", key=f"{editor_key}_save"):
+        changes = edited_cells_to_changes(st.session_state.get(widget_key, {}), page_keys, "Value" if source is None else "Translation")
+        
+        if changes:
+            translations.update(changes)
+            for key, value in changes.items():
+                search_index.update(key, search_fields(key, value, source))
+            # Record the edits as human-made so later translation runs keep them
+            get_project_store().save_strings(project_name, file_path, selected_language, changes,
+                                             replace=False, human_edited=True)
+            st.markdown(f"<div class='status-success'>Saved {len(changes)} edited translations!</div>", unsafe_allow_html=True)
+        else:
+            st.markdown("<div class='status-info'>No changes to save.</div>", unsafe_allow_html=True)
+
+def search_fields(key, value, source=None):
+    """Return the searchable fields of one review row."""
+    if source is None:
+        return [key, value]
+    return [key, source.get(key, ""), value]
+
+def get_search_index(project_name, file_path, lang_code, translations, source=None):
+    """
+    Get the search index for one language of a file, building it on first use.
+    
+    Indexes are kept per session and rebuilt only when the translations were
+    replaced, e.g. by a new translation run.
+    """
+    if "search_indexes" not in st.session_state:
+        st.session_state.search_indexes = {}
+    
+    index_key = (project_name, file_path, lang_code)
+    version = (id(translations), id(source), len(translations))
+    cached = st.session_state.search_indexes.get(index_key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    
+    search_index = SearchIndex({key: search_fields(key, value, source) for key, value in translations.items()})
+    st.session_state.search_indexes[index_key] = (version, search_index)
+    return search_index
+
+def edited_cells_to_changes(editor_state, page_keys, value_column):
+    """
+    Turn a data editor's edit delta into the changed key/value pairs.
+    
+    Args:
+        editor_state (dict): The editor's session state ({"edited_rows": {row: {column: value}}})
+        page_keys (list): The keys of the rows shown in the editor, by position
+        value_column (str): The editable column holding the string value
+        
+    Returns:
+        dict: A dictionary of changed keys and their new values
+    """
+    changes = {}
+    for row_position, edited_columns in editor_state.get("edited_rows", {}).items():
+        row_position = int(row_position)
+        if value_column in edited_columns and row_position < len(page_keys):
+            value = edited_columns[value_column]
+            changes[page_keys[row_position]] = "" if value is None else str(value)
+    return changes
+
+def usage_dataframe(rows):
+    """Tabulate token usage rows from a UsageLedger or the project store."""
+    return load_pandas().DataFrame([
+        {
+            "Language": row["language"] or "-",
+            "Model": row["model"],
+            "Calls": row["calls"],
+            "Prompt tokens": row["prompt_tokens"],
+            "Output tokens": row["output_tokens"],
+            "Cost (USD)": round(row["cost_usd"], 4)
+        }
+        for row in rows
+    ])
+
+def render_project_usage(project_name):
+    """Show a project's token usage and cost over all its runs."""
+    rows = get_project_store().load_usage(project_name)
+    if not rows:
+        return
+    
+    total_tokens = sum(row["prompt_tokens"] + row["output_tokens"] for row in rows)
+    total_cost = sum(row["cost_usd"] for row in rows)
+    with st.expander(f"💰 Token usage: {total_tokens:,} tokens (${total_cost:.4f})", expanded=False):
+        st.dataframe(usage_dataframe(rows), use_container_width=True)
+
+def render_project_glossary(project_name):
+    """Show and edit a project's glossary of terms whose translations are enforced."""
+    project = st.session_state.projects[project_name]
+    rows = project.get("glossary") or []
+    with st.expander(f"📘 Glossary ({len({row['term'] for row in rows})} terms)", expanded=False):
+        st.markdown(
+            "<div class='status-info'>Leave Translation empty to keep a term unchanged (e.g. brand names like Mifos X), "
+            "and Language empty for an entry that applies to every language.</div>",
+            unsafe_allow_html=True
+        )
+        df = load_pandas().DataFrame(
+            [{"Term": row["term"], "Language": row["language"], "Translation": row["translation"]} for row in rows],
+            columns=["Term", "Language", "Translation"]
+        )
+        edited = st.data_editor(df, use_container_width=True, num_rows="dynamic", key=f"glossary_editor_{project_name}")
+        
+        if st.button("💾 Save Glossary", key=f"save_glossary_{project_name}"):
+            glossary = Glossary()
+            for row in edited.to_dict("records"):
+                # New rows have empty cells as None
+                cells = {name: value.strip() if isinstance(value, str) else "" for name, value in row.items()}
+                # Language names are accepted as well as codes
+                glossary.add(cells["Term"], cells["Translation"], LANGUAGE_CODES.get(cells["Language"], cells["Language"]))
+            get_project_store().save_glossary(project_name, glossary.rows())
+            project["glossary"] = glossary.rows()
+            st.markdown(f"<div class='status-success'>Saved {len(glossary)} glossary terms!</div>", unsafe_allow_html=True)
+
+def render_run_summary():
+    """Show where the last scan or translation run spent its time, and its counters."""
+    metrics = st.session_state.run_metrics
+    summary = metrics.summary()
+    if not summary["stages"]:
+        return
+    
+    counters = summary["counters"]
+    with st.expander("📊 Last Run Summary", expanded=False):
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Run time", f"{summary['elapsed_s']:.1f} s")
+        col2.metric("Model calls", counters.get("model_calls", 0))
+        col3.metric("Retries", counters.get("retries", 0))
+        col4.metric("Fallbacks to source", counters.get("fallbacks_to_source", 0))
+        col5.metric(
+            "Tokens in / out", f"{counters.get('prompt_tokens', 0):,} / {counters.get('output_tokens', 0):,}",
+            help=f"${st.session_state.run_budget.used_cost:.4f} against a budget of {st.session_state.run_budget.describe()}"
+        )
+        
+        stage_df = load_pandas().DataFrame([
+            {
+                "Stage": row["stage"],
+                "Labels": ", ".join(f"{name}={value}" for name, value in row["labels"].items()),
+                "Count": row["count"],
+                "Total (s)": round(row["total_s"], 3),
+                "p50 (ms)": round(row["p50_ms"], 1),
+                "p95 (ms)": round(row["p95_ms"], 1),
+                "Max (ms)": round(row["max_ms"], 1)
+            }
+            for row in summary["stages"]
+        ])
+        st.dataframe(stage_df, use_container_width=True)
+        
+        usage_rows = st.session_state.run_budget.ledger.totals(by=("language", "model"))
+        if usage_rows:
+            st.markdown("**Token usage**")
+            st.dataframe(usage_dataframe(usage_rows), use_container_width=True)
+        
+        st.download_button(
+            label="📥 Download Metrics (OpenMetrics)",
+            data=metrics.to_openmetrics(),
+            file_name="translation_metrics.txt",
+            mime="text/plain",
+            key="download_run_metrics"
+        )
+
+def translate_preserving_edits(project_name, file_path, source_strings, language, lang_code, existing=None, skip_keys=()):
+    """
+    Translate strings for a project without overwriting human-edited translations.
+    
+    Keys a reviewer already edited are not sent to the model; their stored
+    values are carried over into the result. The project's indexed usage
+    contexts are sent along with the strings, and its glossary is enforced.
+    
+    Args:
+        project_name (str): The project name
+        file_path (str): The file path, or PROJECT_SCOPE for project-wide translations
+        source_strings (dict): The source strings
+        language (str): The target language name
+        lang_code (str): The target language code
+        existing (dict): The current translations for this language, if any
+        skip_keys (set): Keys marked translatable="false" in the source file
+        
+    Returns:
+        dict: A dictionary of string keys and translations, in source order
+    """
+    existing = existing or {}
+    human_keys = {key for key in get_project_store().load_human_edited(project_name, file_path, lang_code) if key in existing}
+    if human_keys:
+        st.markdown(f"<div class='status-info'>Keeping {len(human_keys)} human-edited translations.</div>", unsafe_allow_html=True)
+    
+    to_translate = {k: v for k, v in source_strings.items() if k not in human_keys}
+    contexts = st.session_state.projects[project_name].get("contexts") or {}
+    glossary = project_glossary(project_name)
+    translations = translate_all_strings(to_translate, language, contexts, skip_keys, glossary) if to_translate else {}
+    
+    results = {}
+    for key in source_strings:
+        if key in human_keys:
+            results[key] = existing[key]
+        elif key in translations:
+            results[key] = translations[key]
+    return results
+
+def iter_export_files(project, export_format, selected_files=None):
+    """
+    Generate the export files of a project one at a time.
+    
+    Files are rendered in parallel, and rendered files are reused from the
+    shared cache as long as their translations haven't changed.
+    
+    Args:
+        project (dict): The project to export
+        export_format (str): The export format selected on the Export page
+        selected_files (list): File paths to export for file-specific translations
+        
+    Yields:
+        tuple: (export path, file content)
+    """
+    jobs = []
+    # XLIFF and PO files carry the source text next to each translation
+    needs_source = formats.get_format(export_format).needs_source
+    if project.get("file_translations"):
+        # Export file-specific translations
+        for file_path in selected_files or list(project["file_translations"].keys()):
+            # Get filename without path
+            file_base = file_path.split("/")[-1].split(".")[0]
+            
+            untranslatable = source_untranslatable_keys(project, file_path)
+            attributes = source_resource_attributes(project, file_path)
+            languages = project["file_translations"][file_path]
+            source_strings = None
+            if needs_source:
+                source_strings = languages.get("en") or read_file_strings(file_path, project["files"].get(file_path))
+            
+            # Export each language
+            for lang_code, translations in languages.items():
+                jobs.append(ExportJob(
+                    export_path_for(export_format, lang_code, file_base), file_path, lang_code, translations,
+                    untranslatable, source_strings, attributes
+                ))
+    
+    elif project.get("translations"):
+        # Export project-wide translations
+        source_strings = project["translations"].get("en") if needs_source else None
+        for lang_code, translations in project["translations"].items():
+            jobs.append(ExportJob(export_path_for(export_format, lang_code), PROJECT_SCOPE, lang_code, translations, frozenset(), source_strings))
+    
+    yield from render_export_files(jobs, export_format, cache=get_shared_caches().rendered_exports)
 
 # Initialize session states for projects
 if 'projects' not in st.session_state:
-    st.session_state.projects = {}
+    st.session_state.projects = get_project_store().load_projects()
 
 # Configuration sidebar
 with st.sidebar:
@@ -1009,6 +825,18 @@ with st.sidebar:
                     st.markdown("<div class='status-error'>Failed to configure GitHub API. Check your token.</div>", unsafe_allow_html=True)
             else:
                 st.markdown("<div class='status-error'>Please provide a GitHub token</div>", unsafe_allow_html=True)
+    
+    with st.expander("💰 Token Budget", expanded=False):
+        st.number_input("Max tokens per run (0 = no limit)", min_value=0, value=0, step=10000, key="budget_max_tokens")
+        st.number_input("Max cost per run in USD (0 = no limit)", min_value=0.0, value=0.0, step=0.10, format="%.2f", key="budget_max_cost")
+        st.caption("A run that would go over its budget is stopped before the next model call.")
+    
+    breaker, fallback_breaker = get_circuit_breakers()
+    if not breaker.allow():
+        if fallback_breaker is not None and fallback_breaker.allow():
+            st.markdown(f"<div class='status-warning'>{breaker.name} is failing. Using {fallback_breaker.name} until it recovers.</div>", unsafe_allow_html=True)
+        else:
+            st.markdown(f"<div class='status-error'>{breaker.name} is failing. Translations will keep the source text until it recovers.</div>", unsafe_allow_html=True)
 
     # Navigation
     st.markdown("<h3 style='color:white;'>Navigation</h3>", unsafe_allow_html=True)
@@ -1161,6 +989,7 @@ if st.session_state.page == "📚 Home":
 # Projects Dashboard
 elif st.session_state.page == "📋 Projects":
     st.markdown("<h1>Projects Dashboard</h1>", unsafe_allow_html=True)
+    render_run_summary()
     
     # Create new project section
     with st.expander("➕ Create New Project", expanded=True):
@@ -1195,12 +1024,9 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                     if project_name and repo_url:
                         with st.spinner("Creating project and scanning repository..."):
                             # Create project entry
-                            st.session_state.projects[project_name] = {
-                                "type": project_type,
-                                "repo_url": repo_url,
-                                "files": {},
-                                "translations": {}
-                            }
+                            st.session_state.projects[project_name] = get_project_store().create_project(
+                                project_name, project_type, repo_url=repo_url
+                            )
                             
                             # Extract branch name if present
                             branch_display = "default branch"
@@ -1212,31 +1038,21 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                             
                             if string_files:
                                 st.session_state.projects[project_name]["files"] = string_files
+                                get_project_store().save_files(project_name, string_files)
+                                index_project_contexts(project_name, string_files)
                                 st.markdown(f"<div class='status-success'>Project created! Found {len(string_files)} strings.xml files in {branch_display}.</div>", unsafe_allow_html=True)
                                 
                                 # Immediately show the found files
                                 st.markdown("### Found Resource Files")
-                                file_data = []
-                                for file_path, content in string_files.items():
-                                    # Parse file content to get string count
-                                    if file_path.endswith(".xml"):
-                                        strings_dict = xml_to_strings_dict(content)
-                                        string_count = len(strings_dict)
-                                    else:
-                                        # Assume JSON
-                                        try:
-                                            strings_dict = json.loads(content)
-                                            string_count = len(flatten_json(strings_dict))
-                                        except:
-                                            string_count = 0
-                                    
-                                    file_data.append({
-                                        "File Path": file_path,
-                                        "String Count": string_count
-                                    })
+                                # Counts were stored with the files, so nothing is parsed again here
+                                string_counts = get_project_store().load_string_counts(project_name)
+                                file_data = [
+                                    {"File Path": file_path, "String Count": string_counts.get(file_path, 0)}
+                                    for file_path in string_files
+                                ]
                                 
                                 # Display as dataframe
-                                file_df = pd.DataFrame(file_data)
+                                file_df = load_pandas().DataFrame(file_data)
                                 st.dataframe(file_df, use_container_width=True)
                                 
                                 # Add a summary of the feature modules found
@@ -1263,7 +1079,7 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                                             # Parse XML and show as table
                                             strings_dict = xml_to_strings_dict(file_content)
                                             
-                                            preview_df = pd.DataFrame({
+                                            preview_df = load_pandas().DataFrame({
                                                 "Key": list(strings_dict.keys()),
                                                 "Value": list(strings_dict.values())
                                             })
@@ -1284,22 +1100,18 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                                                     st.session_state.show_language_dialog_for_file = True
                                                     st.rerun()
                                         else:
-                                            # Show JSON
-                                            try:
-                                                json_content = json.loads(file_content)
-                                                flattened = flatten_json(json_content)
-                                                
-                                                preview_df = pd.DataFrame({
-                                                    "Key": list(flattened.keys()),
-                                                    "Value": list(flattened.values())
-                                                })
-                                                
-                                                st.dataframe(preview_df, use_container_width=True)
-                                                
-                                                # Show raw JSON with a toggle
-                                                if st.checkbox("Show Raw JSON", key=f"show_raw_json_{selected_file.replace('/', '_').replace('.', '_')}", value=False):
-                                                    st.json(json_content)
-                                            except:
+                                            # Show any other supported format as a table
+                                            flattened = read_file_strings(selected_file, file_content)
+                                            
+                                            preview_df = load_pandas().DataFrame({
+                                                "Key": list(flattened.keys()),
+                                                "Value": list(flattened.values())
+                                            })
+                                            
+                                            st.dataframe(preview_df, use_container_width=True)
+                                            
+                                            # Show the raw file with a toggle
+                                            if st.checkbox("Show Raw File", key=f"show_raw_file_{selected_file.replace('/', '_').replace('.', '_')}", value=False):
                                                 st.code(file_content)
                             else:
                                 st.markdown("""
@@ -1315,59 +1127,44 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                         st.markdown("<div class='status-error'>Please provide both project name and repository URL.</div>", unsafe_allow_html=True)
         else:
             # File upload option
-            uploaded_file = st.file_uploader("Choose a strings file", type=["json", "xml"])
+            uploaded_file = st.file_uploader("Choose a strings file", type=formats.upload_extensions())
             
             if uploaded_file is not None:
                 try:
-                    # Load and parse the file
-                    file_content = uploaded_file.read().decode()
+                    # Stream the file once per upload; reruns reuse the count and sampled preview
+                    preview_key = (uploaded_file.name, uploaded_file.size, getattr(uploaded_file, "file_id", None))
+                    preview = st.session_state.get("upload_preview")
+                    if not preview or preview["key"] != preview_key:
+                        sampler = PreviewSampler()
+                        uploaded_file.seek(0)
+                        for _ in sampler.observe(formats.read_strings(uploaded_file.name, uploaded_file)):
+                            pass
+                        preview = {"key": preview_key, "count": sampler.count, "sample": sampler.sample()}
+                        st.session_state.upload_preview = preview
                     
-                    # Preview the file
-                    if uploaded_file.name.endswith(".json"):
-                        # Parse JSON file
-                        content = json.loads(file_content)
-                        flattened_content = flatten_json(content)
-                        
-                        # Display preview
-                        st.markdown("<div class='status-success'>File loaded successfully!</div>", unsafe_allow_html=True)
-                        st.markdown(f"Found {len(flattened_content)} strings.")
-                        
-                        preview_df = pd.DataFrame(
-                            {"Key": list(flattened_content.keys())[:5], 
-                            "Value": list(flattened_content.values())[:5]}
-                        )
-                        st.dataframe(preview_df, use_container_width=True)
-                        
-                    elif uploaded_file.name.endswith(".xml"):
-                        # Parse XML file
-                        strings_dict = xml_to_strings_dict(file_content)
-                        
-                        # Display preview
-                        st.markdown("<div class='status-success'>File loaded successfully!</div>", unsafe_allow_html=True)
-                        st.markdown(f"Found {len(strings_dict)} strings.")
-                        
-                        preview_df = pd.DataFrame(
-                            {"Key": list(strings_dict.keys())[:5],
-                            "Value": list(strings_dict.values())[:5]}
-                        )
-                        st.dataframe(preview_df, use_container_width=True)
+                    # Display preview
+                    st.markdown("<div class='status-success'>File loaded successfully!</div>", unsafe_allow_html=True)
+                    st.markdown(f"Found {preview['count']} strings. Showing a sample of {len(preview['sample'])}.")
+                    
+                    preview_df = load_pandas().DataFrame(
+                        {"Key": [key for key, _ in preview["sample"]],
+                        "Value": [value for _, value in preview["sample"]]}
+                    )
+                    st.dataframe(preview_df, use_container_width=True)
                         
                     # Create project button
                     if st.button("Create Upload Project", key="create_upload_project_button"):
                         if project_name:
-                            st.session_state.projects[project_name] = {
-                                "type": "Manual Upload",
-                                "files": {uploaded_file.name: file_content},
-                                "translations": {}
-                            }
+                            store = get_project_store()
+                            project = store.create_project(project_name, "Manual Upload")
+                            st.session_state.projects[project_name] = project
                             
-                            # Store the file content in the appropriate format
-                            if uploaded_file.name.endswith(".json"):
-                                # Add to project translations
-                                st.session_state.projects[project_name]["translations"]["en"] = flattened_content
-                            elif uploaded_file.name.endswith(".xml"):
-                                # Add to project translations
-                                st.session_state.projects[project_name]["translations"]["en"] = strings_dict
+                            store.save_files(project_name, {uploaded_file.name: formats.read_text(uploaded_file.getvalue())})
+                            project.invalidate("files")
+                            # Stream the strings straight into the store; they are loaded lazily on first use
+                            uploaded_file.seek(0)
+                            store.append_strings(project_name, PROJECT_SCOPE, "en", formats.read_strings(uploaded_file.name, uploaded_file))
+                            project.invalidate("translations")
                                 
                             st.markdown(f"<div class='status-success'>Project '{project_name}' created successfully!</div>", unsafe_allow_html=True)
                         else:
@@ -1377,11 +1174,7 @@ feature/*/src/commonMain/composeResources/values/strings.xml
             else:
                 if st.button("Create Upload Project", key="create_empty_project_button"):
                     if project_name:
-                        st.session_state.projects[project_name] = {
-                            "type": "Manual Upload",
-                            "files": {},
-                            "translations": {}
-                        }
+                        st.session_state.projects[project_name] = get_project_store().create_project(project_name, "Manual Upload")
                         st.markdown(f"<div class='status-success'>Project '{project_name}' created! Please upload files to translate.</div>", unsafe_allow_html=True)
                     else:
                         st.markdown("<div class='status-error'>Please provide a project name.</div>", unsafe_allow_html=True)
@@ -1404,13 +1197,15 @@ feature/*/src/commonMain/composeResources/values/strings.xml
             for j in range(2):
                 if i + j < len(projects_list):
                     project_name, project_data = projects_list[i + j]
+                    # Summarize from the store so listing projects doesn't load their content
+                    summary = get_project_store().project_summary(project_name)
                     with cols[j]:
                         st.markdown(f"""
                         <div class="feature-card">
                             <h3>{project_name}</h3>
                             <p>Type: {project_data["type"]}</p>
-                            <p>Files: {len(project_data.get("files", {}))}</p>
-                            <p>Languages: {', '.join(project_data.get("translations", {}).keys()) or "None yet"}</p>
+                            <p>Files: {summary["file_count"]}</p>
+                            <p>Languages: {', '.join(summary["languages"]) or "None yet"}</p>
                         </div>
                         """, unsafe_allow_html=True)
                         
@@ -1432,6 +1227,8 @@ feature/*/src/commonMain/composeResources/values/strings.xml
         project = st.session_state.projects[st.session_state.selected_project]
         
         st.markdown(f"## Files in {st.session_state.selected_project}")
+        render_project_usage(st.session_state.selected_project)
+        render_project_glossary(st.session_state.selected_project)
         
         # Add horizontal line for visual separation
         st.markdown("<hr>", unsafe_allow_html=True)
@@ -1442,37 +1239,27 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                 if st.button("🔄 Rescan Repository", key="rescan_repository"):
                     with st.spinner("Rescanning repository..."):
                         repo_url = project["repo_url"]
-                        string_files = scan_github_repository(repo_url, pattern_search=True)
+                        string_files = scan_github_repository(repo_url, pattern_search=True, use_cache=False)
                         
                         if string_files:
                             project["files"] = string_files
+                            get_project_store().save_files(st.session_state.selected_project, string_files)
+                            index_project_contexts(st.session_state.selected_project, string_files, use_cache=False)
                             st.markdown(f"<div class='status-success'>Found {len(string_files)} strings.xml files!</div>", unsafe_allow_html=True)
                             st.rerun()
                         else:
                             st.markdown("<div class='status-warning'>No strings.xml files found in repository.</div>", unsafe_allow_html=True)
             
             # Create a table of files
-            file_data = []
-            for file_path, content in project["files"].items():
-                # Parse file content to get string count
-                if file_path.endswith(".xml"):
-                    strings_dict = xml_to_strings_dict(content)
-                    string_count = len(strings_dict)
-                else:
-                    # Assume JSON
-                    try:
-                        strings_dict = json.loads(content)
-                        string_count = len(flatten_json(strings_dict))
-                    except:
-                        string_count = 0
-                
-                file_data.append({
-                    "File Path": file_path,
-                    "String Count": string_count
-                })
+            # Counts come from the store, so reruns neither load nor parse the files
+            string_counts = get_project_store().load_string_counts(st.session_state.selected_project)
+            file_data = [
+                {"File Path": file_path, "String Count": count}
+                for file_path, count in string_counts.items()
+            ]
             
             # Display as dataframe
-            file_df = pd.DataFrame(file_data)
+            file_df = load_pandas().DataFrame(file_data)
             st.dataframe(file_df, use_container_width=True)
             
             # File preview section
@@ -1522,14 +1309,7 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                         # Get strings from the file
                         file_content = project["files"][selected_file]
                         
-                        if selected_file.endswith(".xml"):
-                            strings_dict = xml_to_strings_dict(file_content)
-                        else:
-                            try:
-                                json_content = json.loads(file_content)
-                                strings_dict = flatten_json(json_content)
-                            except:
-                                strings_dict = {}
+                        strings_dict = read_file_strings(selected_file, file_content)
                                 
                         # Store the selected file and strings in session state
                         st.session_state.selected_file_for_translation = selected_file
@@ -1544,7 +1324,7 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                         # Parse XML and show as table
                         strings_dict = xml_to_strings_dict(file_content)
                         
-                        preview_df = pd.DataFrame({
+                        preview_df = load_pandas().DataFrame({
                             "Key": list(strings_dict.keys()),
                             "Value": list(strings_dict.values())
                         })
@@ -1556,22 +1336,18 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                             st.code(file_content, language="xml")
                         
                     else:
-                        # Show JSON
-                        try:
-                            json_content = json.loads(file_content)
-                            flattened = flatten_json(json_content)
-                            
-                            preview_df = pd.DataFrame({
-                                "Key": list(flattened.keys()),
-                                "Value": list(flattened.values())
-                            })
-                            
-                            st.dataframe(preview_df, use_container_width=True)
-                            
-                            # Show raw JSON with a toggle
-                            with st.expander("View Raw JSON", expanded=False):
-                                st.json(json_content)
-                        except:
+                        # Show any other supported format as a table
+                        flattened = read_file_strings(selected_file, file_content)
+                        
+                        preview_df = load_pandas().DataFrame({
+                            "Key": list(flattened.keys()),
+                            "Value": list(flattened.values())
+                        })
+                        
+                        st.dataframe(preview_df, use_container_width=True)
+                        
+                        # Show the raw file with a toggle
+                        with st.expander("View Raw File", expanded=False):
                             st.code(file_content)
             
             # Hide files button
@@ -1590,6 +1366,8 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                         
                         if string_files:
                             project["files"] = string_files
+                            get_project_store().save_files(st.session_state.selected_project, string_files)
+                            index_project_contexts(st.session_state.selected_project, string_files)
                             st.markdown(f"<div class='status-success'>Found {len(string_files)} strings.xml files!</div>", unsafe_allow_html=True)
                             st.rerun()
                         else:
@@ -1603,6 +1381,8 @@ feature/*/src/commonMain/composeResources/values/strings.xml
                                     
                                     if string_files:
                                         project["files"] = string_files
+                                        get_project_store().save_files(st.session_state.selected_project, string_files)
+                                        index_project_contexts(st.session_state.selected_project, string_files)
                                         st.markdown(f"<div class='status-success'>Found {len(string_files)} strings.xml files!</div>", unsafe_allow_html=True)
                                         st.rerun()
                                     else:
@@ -1629,70 +1409,98 @@ feature/*/src/commonMain/composeResources/values/strings.xml
             
             if submitted:
                 if selected_languages and configure_genai():
+                    start_run(st.session_state.selected_project)
                     # Start translation process for the project
                     project = st.session_state.projects[st.session_state.selected_project]
                     
-                    with st.spinner("Generating translations..."):
-                        # If project has translations, use them
-                        if "translations" in project and "en" in project["translations"]:
-                            source_strings = project["translations"]["en"]
-                            
-                            # Translate to each selected language
-                            for language in selected_languages:
-                                lang_code = LANGUAGE_CODES.get(language)
-                                if lang_code and lang_code != "en":
-                                    st.markdown(f"<div class='status-info'>Translating to {language}...</div>", unsafe_allow_html=True)
-                                    
-                                    translations = translate_all_strings(
-                                        source_strings, 
-                                        language
-                                    )
-                                    
-                                    # Store translations
-                                    project["translations"][lang_code] = translations
-                        # Otherwise, use the first file
-                        elif project["files"]:
-                            # Get the first file
-                            file_path = next(iter(project["files"]))
-                            file_content = project["files"][file_path]
-                            
-                            # Parse the file
-                            if file_path.endswith(".xml"):
-                                source_strings = xml_to_strings_dict(file_content)
-                            else:
-                                try:
-                                    json_content = json.loads(file_content)
-                                    source_strings = flatten_json(json_content)
-                                except:
-                                    source_strings = {}
-                            
-                            # Initialize translations dictionary if needed
-                            if "translations" not in project:
-                                project["translations"] = {}
-                            
-                            # Store original strings as English
-                            project["translations"]["en"] = source_strings
-                            
-                            # Translate to each selected language
-                            for language in selected_languages:
-                                lang_code = LANGUAGE_CODES.get(language)
-                                if lang_code and lang_code != "en":
-                                    st.markdown(f"<div class='status-info'>Translating to {language}...</div>", unsafe_allow_html=True)
-                                    
-                                    translations = translate_all_strings(
-                                        source_strings, 
-                                        language
-                                    )
-                                    
-                                    # Store translations
-                                    project["translations"][lang_code] = translations
-                    
-                    st.markdown(f"<div class='status-success'>Generated translations in {len(selected_languages)} languages!</div>", unsafe_allow_html=True)
-                    st.session_state.show_language_dialog = False
-                    
-                    # Automatically switch to review page
-                    st.session_state.page_selection = "🔄 Translation Review"
-                    st.rerun()
+                    try:
+                        with st.spinner("Generating translations..."):
+                            # If project has translations, use them
+                            if "translations" in project and "en" in project["translations"]:
+                                source_strings = project["translations"]["en"]
+                                
+                                check_run_budget(
+                                    source_strings, selected_languages, source_untranslatable_keys(project, next(iter(project["files"]), "")),
+                                    project.get("contexts"), project_glossary(st.session_state.selected_project)
+                                )
+                                
+                                # Translate to each selected language
+                                for language in selected_languages:
+                                    lang_code = LANGUAGE_CODES.get(language)
+                                    if lang_code and lang_code != "en":
+                                        st.markdown(f"<div class='status-info'>Translating to {language}...</div>", unsafe_allow_html=True)
+                                        
+                                        translations = translate_preserving_edits(
+                                            st.session_state.selected_project,
+                                            PROJECT_SCOPE,
+                                            source_strings,
+                                            language,
+                                            lang_code,
+                                            project["translations"].get(lang_code),
+                                            skip_keys=source_untranslatable_keys(project, next(iter(project["files"]), ""))
+                                        )
+                                        
+                                        # Store translations
+                                        project["translations"][lang_code] = translations
+                                        get_project_store().save_strings(
+                                            st.session_state.selected_project, PROJECT_SCOPE, lang_code, translations
+                                        )
+                            # Otherwise, use the first file
+                            elif project["files"]:
+                                # Get the first file
+                                file_path = next(iter(project["files"]))
+                                file_content = project["files"][file_path]
+                                
+                                # Parse the file
+                                source_strings = read_file_strings(file_path, file_content)
+                                
+                                # Initialize translations dictionary if needed
+                                if "translations" not in project:
+                                    project["translations"] = {}
+                                
+                                # Store original strings as English
+                                project["translations"]["en"] = source_strings
+                                get_project_store().save_strings(
+                                    st.session_state.selected_project, PROJECT_SCOPE, "en", source_strings
+                                )
+                                
+                                check_run_budget(
+                                    source_strings, selected_languages, source_untranslatable_keys(project, next(iter(project["files"]), "")),
+                                    project.get("contexts"), project_glossary(st.session_state.selected_project)
+                                )
+                                
+                                # Translate to each selected language
+                                for language in selected_languages:
+                                    lang_code = LANGUAGE_CODES.get(language)
+                                    if lang_code and lang_code != "en":
+                                        st.markdown(f"<div class='status-info'>Translating to {language}...</div>", unsafe_allow_html=True)
+                                        
+                                        translations = translate_preserving_edits(
+                                            st.session_state.selected_project,
+                                            PROJECT_SCOPE,
+                                            source_strings,
+                                            language,
+                                            lang_code,
+                                            project["translations"].get(lang_code),
+                                            skip_keys=source_untranslatable_keys(project, next(iter(project["files"]), ""))
+                                        )
+                                        
+                                        # Store translations
+                                        project["translations"][lang_code] = translations
+                                        get_project_store().save_strings(
+                                            st.session_state.selected_project, PROJECT_SCOPE, lang_code, translations
+                                        )
+                    except BudgetExceeded as e:
+                        st.markdown(f"<div class='status-error'>Translation stopped: {str(e)}</div>", unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"<div class='status-success'>Generated translations in {len(selected_languages)} languages!</div>", unsafe_allow_html=True)
+                        st.session_state.show_language_dialog = False
+                        
+                        # Automatically switch to review page
+                        st.session_state.page_selection = "🔄 Translation Review"
+                        st.rerun()
+                    finally:
+                        record_run_usage(st.session_state.selected_project)
                 else:
                     st.markdown("<div class='status-error'>Please select at least one language and configure Gemini API.</div>", unsafe_allow_html=True)
     
@@ -1717,55 +1525,74 @@ feature/*/src/commonMain/composeResources/values/strings.xml
             
             if submitted:
                 if selected_languages and configure_genai():
+                    start_run(st.session_state.selected_project)
                     # Start translation process for the specific file
                     project = st.session_state.projects[st.session_state.selected_project]
                     
-                    with st.spinner("Generating translations..."):
-                        # Get the strings to translate
-                        strings_dict = st.session_state.selected_file_strings
-                        file_path = st.session_state.selected_file_for_translation
-                        
-                        # Initialize translations dictionary if needed
-                        if "file_translations" not in project:
-                            project["file_translations"] = {}
-                        
-                        if file_path not in project["file_translations"]:
-                            project["file_translations"][file_path] = {}
-                        
-                        # Store original strings as English
-                        project["file_translations"][file_path]["en"] = strings_dict
+                    try:
+                        with st.spinner("Generating translations..."):
+                            # Get the strings to translate
+                            strings_dict = st.session_state.selected_file_strings
+                            file_path = st.session_state.selected_file_for_translation
+                            
+                            # Initialize translations dictionary if needed
+                            if "file_translations" not in project:
+                                project["file_translations"] = {}
+                            
+                            if file_path not in project["file_translations"]:
+                                project["file_translations"][file_path] = {}
+                            
+                            # Store original strings as English
+                            project["file_translations"][file_path]["en"] = strings_dict
+                            get_project_store().save_strings(st.session_state.selected_project, file_path, "en", strings_dict)
+                            
+                            check_run_budget(strings_dict, selected_languages, source_untranslatable_keys(project, file_path),
+                                             project.get("contexts"), project_glossary(st.session_state.selected_project))
+                            
+                            # Translate to each selected language
+                            for language in selected_languages:
+                                lang_code = LANGUAGE_CODES.get(language)
+                                if lang_code and lang_code != "en":
+                                    st.markdown(f"<div class='status-info'>Translating to {language}...</div>", unsafe_allow_html=True)
+                                    
+                                    translations = translate_preserving_edits(
+                                        st.session_state.selected_project,
+                                        file_path,
+                                        strings_dict,
+                                        language,
+                                        lang_code,
+                                        project["file_translations"][file_path].get(lang_code),
+                                        skip_keys=source_untranslatable_keys(project, file_path)
+                                    )
+                                    
+                                    # Store translations
+                                    project["file_translations"][file_path][lang_code] = translations
+                                    get_project_store().save_strings(
+                                        st.session_state.selected_project, file_path, lang_code, translations
+                                    )
+                    except BudgetExceeded as e:
+                        st.markdown(f"<div class='status-error'>Translation stopped: {str(e)}</div>", unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"<div class='status-success'>Generated translations for file in {len(selected_languages)} languages!</div>", unsafe_allow_html=True)
+                        st.session_state.show_language_dialog_for_file = False
                         
-                        # Translate to each selected language
-                        for language in selected_languages:
-                            lang_code = LANGUAGE_CODES.get(language)
-                            if lang_code and lang_code != "en":
-                                st.markdown(f"<div class='status-info'>Translating to {language}...</div>", unsafe_allow_html=True)
-                                
-                                translations = translate_all_strings(
-                                    strings_dict, 
-                                    language
-                                )
-                                
-                                # Store translations
-                                project["file_translations"][file_path][lang_code] = translations
-                    
-                    st.markdown(f"<div class='status-success'>Generated translations for file in {len(selected_languages)} languages!</div>", unsafe_allow_html=True)
-                    st.session_state.show_language_dialog_for_file = False
-                    
-                    # Navigate to review page
-                    st.session_state.page = "🔄 Translation Review"
-                    st.session_state.review_file_path = file_path
-                    st.rerun()
+                        # Navigate to review page
+                        st.session_state.page = "🔄 Translation Review"
+                        st.session_state.review_file_path = file_path
+                        st.rerun()
+                    finally:
+                        record_run_usage(st.session_state.selected_project)
                 else:
                     st.markdown("<div class='status-error'>Please select at least one language and configure Gemini API.</div>", unsafe_allow_html=True)
 
 # Translation Review page
 elif st.session_state.page == "🔄 Translation Review":
     st.markdown("<h1>Review and Edit Translations</h1>", unsafe_allow_html=True)
+    render_run_summary()
     
     # Select project
-    projects_with_translations = [p for p, data in st.session_state.projects.items() 
-                                if data.get("translations") or data.get("file_translations")]
+    projects_with_translations = [p for p in get_project_store().projects_with_translations()
+                                  if p in st.session_state.projects]
     
     if projects_with_translations:
         selected_review_project = st.selectbox(
@@ -1811,64 +1638,13 @@ elif st.session_state.page == "🔄 Translation Review":
                 )
                 
                 if selected_language:
-                    translations = file_translations[selected_language]
-                    
-                    # Add search functionality
-                    search_query = st.text_input("🔍 Search keys or translations", "", key=f"search_file_query_{selected_language}")
-                    
-                    # Create a dataframe for display and editing
-                    if selected_language == "en":
-                        # For English (source language), show only key and value
-                        data = {
-                            "Key": list(translations.keys()),
-                            "Value": list(translations.values())
-                        }
-                    else:
-                        # For other languages, show key, original (English) and translation
-                        data = {
-                            "Key": list(translations.keys()),
-                            "Original": [file_translations["en"].get(k, "") for k in translations.keys()],
-                            "Translation": list(translations.values())
-                        }
-                    
-                    df = pd.DataFrame(data)
-                    
-                    # Filter based on search query if provided
-                    if search_query:
-                        if "Original" in df.columns:
-                            df = df[
-                                df["Key"].str.contains(search_query, case=False) | 
-                                df["Original"].astype(str).str.contains(search_query, case=False) | 
-                                df["Translation"].astype(str).str.contains(search_query, case=False)
-                            ]
-                        else:
-                            df = df[
-                                df["Key"].str.contains(search_query, case=False) | 
-                                df["Value"].astype(str).str.contains(search_query, case=False)
-                            ]
-                    
-                    # Display as editable dataframe
-                    st.markdown("### Edit Translations")
-                    st.markdown("<div class='status-info'>Make changes directly in the table below and click Save when done.</div>", unsafe_allow_html=True)
-                    
-                    edited_df = st.data_editor(df, use_container_width=True, 
-                                              key=f"file_translation_editor_{selected_file}_{selected_language}")
-                    
-                    # Save edited translations
-                    if st.button("💾 Save Edited Translations", key=f"save_file_translations_{selected_file}"):
-                        # Update file translations
-                        if selected_language == "en":
-                            for i, row in edited_df.iterrows():
-                                key = row["Key"]
-                                value = row["Value"]
-                                file_translations[selected_language][key] = value
-                        else:
-                            for i, row in edited_df.iterrows():
-                                key = row["Key"]
-                                translation = row["Translation"]
-                                file_translations[selected_language][key] = translation
-                                
-                        st.markdown("<div class='status-success'>Translations updated successfully!</div>", unsafe_allow_html=True)
+                    render_translation_editor(
+                        selected_review_project,
+                        selected_file,
+                        file_translations,
+                        selected_language,
+                        editor_key=f"file_translation_editor_{selected_file}_{selected_language}"
+                    )
                 
             elif has_project_translations:
                 # Traditional project-wide translations
@@ -1883,64 +1659,13 @@ elif st.session_state.page == "🔄 Translation Review":
                 )
                 
                 if selected_language:
-                    translations = project["translations"][selected_language]
-                    
-                    # Add search functionality
-                    search_query = st.text_input("🔍 Search keys or translations", "", key=f"search_query_{selected_language}")
-                    
-                    # Create a dataframe for display and editing
-                    if selected_language == "en":
-                        # For English (source language), show only key and value
-                        data = {
-                            "Key": list(translations.keys()),
-                            "Value": list(translations.values())
-                        }
-                    else:
-                        # For other languages, show key, original (English) and translation
-                        data = {
-                            "Key": list(translations.keys()),
-                            "Original": [project["translations"]["en"].get(k, "") for k in translations.keys()],
-                            "Translation": list(translations.values())
-                        }
-                    
-                    df = pd.DataFrame(data)
-                    
-                    # Filter based on search query if provided
-                    if search_query:
-                        if "Original" in df.columns:
-                            df = df[
-                                df["Key"].str.contains(search_query, case=False) | 
-                                df["Original"].astype(str).str.contains(search_query, case=False) | 
-                                df["Translation"].astype(str).str.contains(search_query, case=False)
-                            ]
-                        else:
-                            df = df[
-                                df["Key"].str.contains(search_query, case=False) | 
-                                df["Value"].astype(str).str.contains(search_query, case=False)
-                            ]
-                    
-                    # Display as editable dataframe
-                    st.markdown("### Edit Translations")
-                    st.markdown("<div class='status-info'>Make changes directly in the table below and click Save when done.</div>", unsafe_allow_html=True)
-                    
-                    edited_df = st.data_editor(df, use_container_width=True, 
-                                              key=f"translation_editor_{selected_review_project}_{selected_language}")
-                    
-                    # Save edited translations
-                    if st.button("💾 Save Edited Translations", key="save_project_translations"):
-                        # Update project translations
-                        if selected_language == "en":
-                            for i, row in edited_df.iterrows():
-                                key = row["Key"]
-                                value = row["Value"]
-                                project["translations"][selected_language][key] = value
-                        else:
-                            for i, row in edited_df.iterrows():
-                                key = row["Key"]
-                                translation = row["Translation"]
-                                project["translations"][selected_language][key] = translation
-                                
-                        st.markdown("<div class='status-success'>Translations updated successfully!</div>", unsafe_allow_html=True)
+                    render_translation_editor(
+                        selected_review_project,
+                        PROJECT_SCOPE,
+                        project["translations"],
+                        selected_language,
+                        editor_key=f"translation_editor_{selected_review_project}_{selected_language}"
+                    )
             else:
                 st.markdown("<div class='status-info'>No translations available for this project yet.</div>", unsafe_allow_html=True)
                 
@@ -1969,8 +1694,8 @@ elif st.session_state.page == "📤 Export":
     st.markdown("<h1>Export Translations</h1>", unsafe_allow_html=True)
     
     # Select project to export
-    projects_with_translations = [p for p, data in st.session_state.projects.items() 
-                                if data.get("translations") or data.get("file_translations")]
+    projects_with_translations = [p for p in get_project_store().projects_with_translations()
+                                  if p in st.session_state.projects]
     
     if projects_with_translations:
         selected_export_project = st.selectbox(
@@ -1991,7 +1716,7 @@ elif st.session_state.page == "📤 Export":
             
             export_format = st.radio(
                 "Select export format",
-                ["Android XML", "iOS Strings", "JSON", "Kotlin Multiplatform"],
+                EXPORT_FORMATS,
                 key="export_format"
             )
             
@@ -2032,124 +1757,75 @@ elif st.session_state.page == "📤 Export":
                 if not selected_files:
                     selected_files = file_paths
             
+            # Compression settings for the archive
+            compression_level = st.slider("ZIP compression level", 0, 9, DEFAULT_COMPRESSION_LEVEL,
+                                          help="0 stores files uncompressed, 9 gives the smallest archive",
+                                          key="export_compression_level")
+            
             # Export button
             if st.button("Generate Export", key="generate_export_button"):
-                # Create a ZIP file with translations
-                with st.spinner("Generating export files..."):
-                    export_files = {}
-                    
-                    if has_file_translations:
-                        # Export file-specific translations
-                        for file_path in selected_files:
-                            file_translations = project["file_translations"][file_path]
-                            
-                            # Get filename without path
-                            filename = file_path.split("/")[-1]
-                            file_base = filename.split(".")[0]
-                            
-                            # Export each language
-                            for lang_code, translations in file_translations.items():
-                                if export_format == "Android XML":
-                                    # Create Android XML format
-                                    if lang_code == "en":
-                                        export_path = f"values/{file_base}.xml"
-                                    else:
-                                        export_path = f"values-{lang_code}/{file_base}.xml"
-                                        
-                                    export_files[export_path] = dict_to_strings_xml(translations)
-                                
-                                elif export_format == "iOS Strings":
-                                    # Create iOS Strings format
-                                    ios_content = ""
-                                    for key, value in translations.items():
-                                        ios_content += f'"{key}" = "{value}";\n'
-                                        
-                                    if lang_code == "en":
-                                        export_path = f"en.lproj/{file_base}.strings"
-                                    else:
-                                        export_path = f"{lang_code}.lproj/{file_base}.strings"
-                                        
-                                    export_files[export_path] = ios_content
-                                
-                                elif export_format == "JSON":
-                                    # Create JSON format
-                                    if lang_code == "en":
-                                        export_path = f"{file_base}.json"
-                                    else:
-                                        export_path = f"{file_base}_{lang_code}.json"
-                                        
-                                    export_files[export_path] = json.dumps(translations, ensure_ascii=False, indent=2)
-                                
-                                elif export_format == "Kotlin Multiplatform":
-                                    # Create KMP format
-                                    if lang_code == "en":
-                                        export_path = f"commonMain/resources/MR/base/{file_base}.xml"
-                                    else:
-                                        export_path = f"commonMain/resources/MR/{lang_code}/{file_base}.xml"
-                                        
-                                    export_files[export_path] = dict_to_strings_xml(translations)
-                    
-                    elif has_project_translations:
-                        # Export project-wide translations
-                        for lang_code, translations in project["translations"].items():
-                            if export_format == "Android XML":
-                                # Create Android XML format
-                                if lang_code == "en":
-                                    export_path = "values/strings.xml"
-                                else:
-                                    export_path = f"values-{lang_code}/strings.xml"
-                                    
-                                export_files[export_path] = dict_to_strings_xml(translations)
-                            
-                            elif export_format == "iOS Strings":
-                                # Create iOS Strings format
-                                ios_content = ""
-                                for key, value in translations.items():
-                                    ios_content += f'"{key}" = "{value}";\n'
-                                    
-                                if lang_code == "en":
-                                    export_path = "en.lproj/Localizable.strings"
-                                else:
-                                    export_path = f"{lang_code}.lproj/Localizable.strings"
-                                    
-                                export_files[export_path] = ios_content
-                            
-                            elif export_format == "JSON":
-                                # Create JSON format
-                                if lang_code == "en":
-                                    export_path = "strings.json"
-                                else:
-                                    export_path = f"strings_{lang_code}.json"
-                                    
-                                export_files[export_path] = json.dumps(translations, ensure_ascii=False, indent=2)
-                            
-                            elif export_format == "Kotlin Multiplatform":
-                                # Create KMP format
-                                if lang_code == "en":
-                                    export_path = "commonMain/resources/MR/base/strings.xml"
-                                else:
-                                    export_path = f"commonMain/resources/MR/{lang_code}/strings.xml"
-                                    
-                                export_files[export_path] = dict_to_strings_xml(translations)
-                    
-                    # Create a ZIP file
-                    zip_buffer = StringIO()
-                    with zipfile.ZipFile(zip_buffer, "w") as zf:
-                        for file_path, content in export_files.items():
-                            zf.writestr(file_path, content)
-                    
-                    # Display download button
-                    st.download_button(
-                        label="📥 Download Translations ZIP",
-                        data=zip_buffer.getvalue(),
-                        file_name=f"{selected_export_project}_translations.zip",
-                        mime="application/zip"
-                    )
+                # Stream each generated file straight into a spooled ZIP archive
+                with st.spinner("Generating export files..."), st.session_state.run_metrics.span("export"):
+                    with write_export_zip(
+                        iter_export_files(project, export_format, selected_files if has_file_translations else None),
+                        compression_level=compression_level
+                    ) as archive:
+                        # Display download button
+                        st.download_button(
+                            label="📥 Download Translations ZIP",
+                            data=archive.getvalue(),
+                            file_name=f"{selected_export_project}_translations.zip",
+                            mime="application/zip"
+                        )
+                        exported_paths = archive.paths
                     
                 # Show files included in export
                 st.markdown("## Files Included in Export")
-                for file_path in export_files.keys():
+                for file_path in exported_paths:
                     st.markdown(f"- {file_path}")
+            
+            # Write translations straight back to the scanned repository
+            if project["type"] == "GitHub Repository" and project.get("repo_url"):
+                st.markdown("## Commit to Repository")
+                st.markdown("<div class='status-info'>Writes values-&lt;lang&gt;/strings.xml next to each scanned file. Only files whose content changed are committed.</div>", unsafe_allow_html=True)
+                
+                default_branch = parse_repo_url(project["repo_url"])[2] or ""
+                col1, col2 = st.columns(2)
+                with col1:
+                    commit_branch = st.text_input("Branch", value=default_branch, key="commit_branch",
+                                                  help="Leave empty to use the repository's default branch")
+                    commit_message = st.text_input("Commit message", value=DEFAULT_COMMIT_MESSAGE, key="commit_message")
+                with col2:
+                    open_pull_request = st.checkbox("Open a pull request instead of committing to the branch", value=True, key="commit_open_pr")
+                    pr_branch = st.text_input("Pull request branch", value=f"translations-{int(time.time())}", key="commit_pr_branch",
+                                              disabled=not open_pull_request)
+                
+                if st.button("📤 Commit Changed Locale Files", key="commit_locale_files_button"):
+                    with st.spinner("Comparing locale files with the repository..."):
+                        try:
+                            if not commit_branch:
+                                g = configure_github()
+                                owner, repo_name, _ = parse_repo_url(project["repo_url"])
+                                commit_branch = g.get_repo(f"{owner}/{repo_name}").default_branch if g else ""
+                            result = write_translations_to_repository(
+                                project,
+                                commit_branch,
+                                commit_message or DEFAULT_COMMIT_MESSAGE,
+                                pull_request_branch=pr_branch if open_pull_request else None
+                            )
+                        except Exception as e:
+                            result = None
+                            st.markdown(f"<div class='status-error'>Failed to commit translations: {str(e)}</div>", unsafe_allow_html=True)
+                    
+                    if result is not None:
+                        if not result["changed"]:
+                            st.markdown("<div class='status-info'>All locale files are already up to date.</div>", unsafe_allow_html=True)
+                        elif result["url"]:
+                            st.markdown(f"<div class='status-success'>Opened pull request with {len(result['changed'])} changed files: <a href='{result['url']}'>{result['url']}</a></div>", unsafe_allow_html=True)
+                        else:
+                            st.markdown(f"<div class='status-success'>Committed {len(result['changed'])} changed files as {result['commit'][:7]}.</div>", unsafe_allow_html=True)
+                        for path in result["changed"]:
+                            st.markdown(f"- {path}")
         else:
             st.markdown("<div class='status-info'>Please select a project to export.</div>", unsafe_allow_html=True)
     else:
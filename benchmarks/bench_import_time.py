@@ -0,0 +1,136 @@
+"""
+Measure the import cost of app.py's startup imports against a time budget.
+
+Collects the module-level imports of app.py, imports them in a fresh
+interpreter with -X importtime, and reports the total and the slowest
+modules. It also checks that the heavy SDKs the app loads lazily (Gemini,
+PyGithub, pandas, requests) are not pulled in at startup.
+
+Exits with status 1 if the budget is exceeded or a heavy SDK is imported.
+
+Usage:
+    python benchmarks/bench_import_time.py [--budget-ms 1500] [--repeat 3] [--top 10]
+"""
+
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+APP_PATH = os.path.join(ROOT, "app.py")
+
+# Dependencies that must only be imported on first use
+HEAVY_MODULES = ["google.generativeai", "github", "pandas", "requests"]
+
+CHILD_SCRIPT = """
+import importlib, json, sys, time
+missing = []
+start = time.perf_counter()
+for name in {modules!r}:
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        missing.append(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "elapsed_ms": elapsed * 1000,
+    "missing": missing,
+    "heavy": [m for m in {heavy!r} if m in sys.modules]
+}}))
+"""
+
+
+def startup_imports(path=APP_PATH):
+    """Return the modules imported at the top level of a script, in order."""
+    with open(path, encoding="utf-8") as source_file:
+        tree = ast.parse(source_file.read())
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output.
+
+    Returns:
+        dict: Top-level module name to cumulative import time in microseconds
+    """
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented under the module that triggered them
+        if name.startswith("  "):
+            continue
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def measure(modules):
+    """
+    Import the modules in a fresh interpreter.
+
+    Returns:
+        tuple: (child report with elapsed_ms, missing and heavy, per-module cumulative microseconds)
+    """
+    script = CHILD_SCRIPT.format(modules=modules, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    modules = startup_imports()
+    # Modules the interpreter imports before the script starts aren't the app's cost
+    baseline = set(measure([])[1])
+    runs = [measure(modules) for _ in range(args.repeat)]
+    # The fastest run is the least disturbed by the rest of the machine
+    report, timings = min(runs, key=lambda run: run[0]["elapsed_ms"])
+    total_ms = report["elapsed_ms"]
+
+    print(f"app.py startup imports: {', '.join(modules)}")
+    if report["missing"]:
+        print(f"not installed (not measured): {', '.join(report['missing'])}")
+    print(f"\ntotal import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms, best of {args.repeat})")
+    slowest = sorted(
+        ((name, micros) for name, micros in timings.items() if name not in baseline),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    for name, micros in slowest[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if report["heavy"]:
+        print(f"\nFAIL: heavy SDKs imported at startup: {', '.join(report['heavy'])}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"\nFAIL: import time exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
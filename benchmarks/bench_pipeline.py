@@ -0,0 +1,372 @@
+"""
+Benchmark the translation pipeline end to end against synthetic repositories.
+
+Builds a fake GitHub repository of N feature modules with M strings each and
+runs every stage of the pipeline against it with local stand-ins for GitHub
+and Gemini (MockBackend), so results are reproducible and need no network:
+
+    scan       core.scan_repository (what scan_github_repository runs)
+    parse      strings_xml.parse_strings_xml (what xml_to_strings_dict runs on a cache miss)
+    response   core.parse_translation_response on well-formed and truncated responses
+    translate  Translator.batch_translate_texts
+    export     rendering every locale file and building the Export ZIP
+
+Each stage reports throughput, p50/p95 latency, API call counts and peak
+memory. The JSON report can be compared with an earlier one with --compare.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--modules 20] [--strings 200] [--languages 3]
+        [--model-latency 0.02] [--github-latency 0] [--concurrency 4]
+        [--repeat 5] [--output report.json] [--compare baseline.json]
+"""
+
+import argparse
+import base64
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from translate_tool import core, strings_xml
+from translate_tool.backends import MockBackend
+from translate_tool.export import render_export_files, write_export_zip
+
+MODULE_PATH = "feature/module{index}/src/commonMain/composeResources/values/strings.xml"
+BENCH_LANGUAGES = ["fr", "de", "ja", "es", "pt", "ko", "ar", "hi"]
+
+
+def generate_strings_xml(module, count):
+    """Build a module's strings.xml with plain, placeholder, styled and untranslatable strings."""
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', "<resources>"]
+    for i in range(count):
+        name = f"module{module}_string_{i}"
+        if i % 10 == 0:
+            lines.append(f'    <string name="{name}">Hello <b>user {i}</b>, you have %1$d messages</string>')
+        elif i % 10 == 1:
+            lines.append(f'    <string name="{name}">Don\\\'t lose item {i}</string>')
+        elif i % 10 == 2:
+            lines.append(f'    <string name="{name}" translatable="false">Brand {i}</string>')
+        else:
+            lines.append(f'    <string name="{name}">Plain UI string number {i} in module {module}</string>')
+    lines.append("</resources>")
+    return "\n".join(lines)
+
+
+class FakeContent:
+    """A PyGithub ContentFile stand-in."""
+
+    def __init__(self, path, content=None):
+        self.path = path
+        self.name = path.rsplit("/", 1)[-1]
+        self.type = "dir" if content is None else "file"
+        self.content = None if content is None else base64.b64encode(content.encode("utf-8")).decode("ascii")
+
+
+class FakeRepository:
+    """An in-memory repository answering the PyGithub calls the scan makes."""
+
+    full_name = "bench/synthetic"
+    default_branch = "main"
+
+    def __init__(self, files, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._tree = {"": []}
+        for path, content in files.items():
+            parts = path.split("/")
+            for depth in range(len(parts)):
+                parent = "/".join(parts[:depth])
+                child = "/".join(parts[:depth + 1])
+                children = self._tree.setdefault(parent, [])
+                if child not in [item.path for item in children]:
+                    is_file = depth == len(parts) - 1
+                    children.append(FakeContent(child, content if is_file else None))
+                    if not is_file:
+                        self._tree.setdefault(child, [])
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def get_branch(self, branch):
+        self._call()
+        return type("Branch", (), {"commit": type("Commit", (), {"sha": "0" * 40})()})()
+
+    def get_contents(self, path, ref=None):
+        self._call()
+        if path not in self._tree:
+            raise FileNotFoundError(path)
+        return list(self._tree[path])
+
+
+class FakeGitHub:
+    def __init__(self, repository):
+        self.repository = repository
+
+    def get_repo(self, full_name):
+        return self.repository
+
+
+class TimedBackend:
+    """Wraps a backend and records the latency of every call."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.batch_model = backend.batch_model
+        self.single_model = backend.single_model
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, model=None):
+        start = time.perf_counter()
+        try:
+            return self.backend.generate(prompt, model)
+        finally:
+            with self._lock:
+                self.latencies.append(time.perf_counter() - start)
+
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies, units, elapsed, api_calls=None, peak_bytes=None):
+    """Build a stage's report entry; latencies are in seconds, units are strings processed."""
+    result = {
+        "units": units,
+        "seconds": round(elapsed, 6),
+        "throughput_per_s": round(units / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3) if latencies else None,
+        "samples": len(latencies)
+    }
+    if api_calls is not None:
+        result["api_calls"] = api_calls
+    if peak_bytes is not None:
+        result["peak_memory_kib"] = round(peak_bytes / 1024, 1)
+    return result
+
+
+def peak_memory(function):
+    """Run a function under tracemalloc and return its peak allocation in bytes."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_scan(files, args):
+    repository = FakeRepository(files, args.github_latency)
+    client = FakeGitHub(repository)
+    url = f"https://github.com/{repository.full_name}"
+    latencies = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        found = core.scan_repository(client, url)
+        latencies.append(time.perf_counter() - start)
+    assert len(found) == len(files), f"scan found {len(found)} of {len(files)} files"
+    calls_per_scan = repository.calls // args.repeat
+    peak = peak_memory(lambda: core.scan_repository(client, url))
+    strings = sum(content.count("<string ") for content in found.values())
+    return summarize(latencies, strings * args.repeat, sum(latencies), {"github": calls_per_scan}, peak)
+
+
+def bench_parse(files, args):
+    latencies = []
+    strings = 0
+    for _ in range(args.repeat):
+        for content in files.values():
+            start = time.perf_counter()
+            strings += len(strings_xml.parse_strings_xml(content))
+            latencies.append(time.perf_counter() - start)
+    peak = peak_memory(lambda: [strings_xml.parse_strings_xml(content) for content in files.values()])
+    return summarize(latencies, strings, sum(latencies), peak_bytes=peak)
+
+
+def bench_response(args):
+    items = {f"key_{i}": f"String {i} ⟦0⟧" for i in range(core.BATCH_SIZE)}
+    prompt = core.build_translation_prompt(items, "French")
+    well_formed = "```json\n" + MockBackend().generate(prompt) + "\n```"
+    truncated = MockBackend(malformed_rate=1.0).generate(prompt)
+
+    results = {}
+    for label, response in [("well_formed", well_formed), ("truncated", truncated)]:
+        latencies = []
+        parsed = 0
+        for _ in range(args.repeat * 20):
+            start = time.perf_counter()
+            parsed += len(core.parse_translation_response(response))
+            latencies.append(time.perf_counter() - start)
+        results[label] = summarize(latencies, parsed, sum(latencies), peak_bytes=peak_memory(lambda: core.parse_translation_response(response)))
+    return results
+
+
+def bench_translate(parsed_files, args):
+    backend = TimedBackend(MockBackend(
+        latency=args.model_latency,
+        jitter=args.model_jitter,
+        failure_rate=args.failure_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency
+    ))
+    translator = core.Translator(
+        backend=backend, concurrency=args.concurrency, batch_delay=0, retry_delay=0,
+        call_timeout=args.call_timeout, hedge=args.hedge
+    )
+    texts = {}
+    skip_keys = set()
+    for strings, untranslatable in parsed_files.values():
+        texts.update(strings)
+        skip_keys.update(untranslatable)
+
+    # Model latency dominates this stage, so it is traced in the timed run itself
+    tracemalloc.start()
+    start = time.perf_counter()
+    translations = {}
+    for lang_code in BENCH_LANGUAGES[:args.languages]:
+        translations[lang_code] = translator.batch_translate_texts(texts, core.language_name(lang_code), skip_keys=skip_keys)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    fallbacks = sum(
+        1 for results in translations.values() for key, value in results.items()
+        if key not in skip_keys and value == texts[key]
+    )
+    result = summarize(backend.latencies, len(texts) * args.languages, elapsed, {"model": len(backend.latencies)}, peak)
+    result["fallbacks_to_source"] = fallbacks
+    return result, translations
+
+
+def bench_export(parsed_files, translations, args):
+    translations_by_file = {}
+    for file_path, (strings, _) in parsed_files.items():
+        languages = {"en": strings}
+        for lang_code, results in translations.items():
+            languages[lang_code] = {key: results[key] for key in strings if key in results}
+        translations_by_file[file_path] = languages
+
+    def build():
+        jobs = core.export_jobs(translations_by_file, "Android XML", parsed_files)
+        with write_export_zip(render_export_files(jobs, "Android XML")) as archive:
+            return len(archive.paths), archive.size
+
+    latencies = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        file_count, size = build()
+        latencies.append(time.perf_counter() - start)
+    strings = sum(len(values) for languages in translations_by_file.values() for values in languages.values())
+    result = summarize(latencies, strings * args.repeat, sum(latencies), peak_bytes=peak_memory(build))
+    result["files"] = file_count
+    result["zip_kib"] = round(size / 1024, 1)
+    return result
+
+
+def compare(report, baseline):
+    """Print how each stage's throughput and p95 moved against a baseline report."""
+    print(f"\ncompared with {baseline['meta'].get('timestamp', 'baseline')}:")
+    for stage, result in flatten_stages(report["results"]).items():
+        previous = flatten_stages(baseline["results"]).get(stage)
+        if not previous:
+            continue
+        changes = []
+        for metric in ("throughput_per_s", "p95_ms", "peak_memory_kib"):
+            if result.get(metric) and previous.get(metric):
+                changes.append(f"{metric} {(result[metric] / previous[metric] - 1) * 100:+.1f}%")
+        print(f"  {stage:<22} {', '.join(changes)}")
+
+
+def flatten_stages(results):
+    stages = {}
+    for stage, result in results.items():
+        if "units" in result:
+            stages[stage] = result
+        else:
+            stages.update({f"{stage}.{name}": nested for name, nested in result.items()})
+    return stages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", type=int, default=20)
+    parser.add_argument("--strings", type=int, default=200, help="Strings per module")
+    parser.add_argument("--languages", type=int, default=3, choices=range(1, len(BENCH_LANGUAGES) + 1))
+    parser.add_argument("--model-latency", type=float, default=0.02, help="Seconds per mock model call")
+    parser.add_argument("--model-jitter", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Share of mock model calls that stall")
+    parser.add_argument("--slow-latency", type=float, default=5.0, help="Seconds a stalled mock model call takes")
+    parser.add_argument("--call-timeout", type=float, default=core.CALL_TIMEOUT, help="Seconds before a model call is retried")
+    parser.add_argument("--hedge", action="store_true", help="Hedge model calls slower than the recent p95")
+    parser.add_argument("--github-latency", type=float, default=0.0, help="Seconds per mock GitHub API call")
+    parser.add_argument("--concurrency", type=int, default=4, help="Batches sent to the model at once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="A previous JSON report to compare against")
+    args = parser.parse_args()
+
+    files = {MODULE_PATH.format(index=index): generate_strings_xml(index, args.strings) for index in range(args.modules)}
+    parsed_files = core.parse_source_files(files)
+
+    results = {
+        "scan": bench_scan(files, args),
+        "parse": bench_parse(files, args),
+        "response": bench_response(args)
+    }
+    results["translate"], translations = bench_translate(parsed_files, args)
+    results["export"] = bench_export(parsed_files, translations, args)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": vars(args)
+        },
+        "results": results
+    }
+
+    print(f"{args.modules} modules x {args.strings} strings, {args.languages} languages")
+    for stage, result in flatten_stages(results).items():
+        calls = ", ".join(f"{name} {count}" for name, count in result.get("api_calls", {}).items())
+        print(
+            f"  {stage:<22} {result['throughput_per_s'] or 0:>12,.0f} strings/s"
+            f"  p50 {result['p50_ms'] or 0:8.2f} ms  p95 {result['p95_ms'] or 0:8.2f} ms"
+            + (f"  peak {result['peak_memory_kib']:8.0f} KiB" if "peak_memory_kib" in result else "")
+            + (f"  calls: {calls}" if calls else "")
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+        print(f"\nreport written to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            compare(report, json.load(baseline_file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark the streaming strings.xml parser against the old ET.fromstring path.
+
+Usage:
+    python benchmarks/bench_strings_xml.py [--strings 10000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from translate_tool import strings_xml
+
+
+def generate_strings_xml(count):
+    """Build a strings.xml with plain, escaped and styled strings plus plurals."""
+    lines = ['<?xml version="1.0" encoding="utf-8"?>', "<resources>"]
+    for i in range(count):
+        if i % 10 == 0:
+            lines.append(f'    <string name="styled_{i}">Hello <b>user {i}</b>, you have %1$d messages</string>')
+        elif i % 10 == 1:
+            lines.append(f'    <string name="escaped_{i}">Don\\\'t lose item {i} \\@home</string>')
+        elif i % 10 == 2:
+            lines.append(f'    <plurals name="plural_{i}"><item quantity="one">%d file</item><item quantity="other">%d files</item></plurals>')
+        else:
+            lines.append(f'    <string name="string_{i}">Plain UI string number {i}</string>')
+    lines.append("</resources>")
+    return "\n".join(lines)
+
+
+def legacy_parse(xml_content):
+    """The original ET.fromstring/itertext parser, kept for comparison."""
+    root = ET.fromstring(xml_content)
+    strings_dict = {}
+    for string_elem in root.findall(".//string"):
+        name = string_elem.get("name")
+        if name:
+            strings_dict[name] = "".join(string_elem.itertext())
+    return strings_dict
+
+
+def measure(function, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(content)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strings", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = generate_strings_xml(args.strings)
+    print(f"strings.xml with {args.strings} resources, {len(content) / 1024:.0f} KiB")
+
+    for label, function in [
+        ("ET.fromstring (legacy)", legacy_parse),
+        ("iterparse codec", strings_xml.parse_strings_xml),
+        ("iterparse codec + write", lambda c: strings_xml.dict_to_strings_xml(strings_xml.parse_strings_xml(c)))
+    ]:
+        result, best, peak = measure(function, content, args.repeat)
+        print(f"{label:<26} {best * 1000:8.1f} ms  peak {peak / 1024:8.0f} KiB  {len(result) if isinstance(result, dict) else len(result.splitlines())} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import pytest
+
+from translate_tool.backends import MockBackend
+from translate_tool.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+from translate_tool.core import Translator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def open_breaker(clock, threshold=2):
+    breaker = CircuitBreaker("primary", failure_threshold=threshold, reset_timeout=10, max_reset_timeout=25, clock=clock)
+    for _ in range(threshold):
+        breaker.record_failure(breaker.acquire())
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("primary", failure_threshold=3, clock=FakeClock())
+    permit = breaker.acquire()
+    breaker.record_failure(permit)
+    breaker.record_failure(permit)
+    breaker.record_success(permit)
+    breaker.record_failure(permit)
+    assert breaker.state == CLOSED
+    breaker.record_failure(permit)
+    breaker.record_failure(permit)
+    assert breaker.state == OPEN
+    assert breaker.acquire() is None
+
+
+def test_half_open_lets_one_trial_through_and_closes_on_success():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now = 9.9
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.allow()
+    trial = breaker.acquire()
+    assert trial.trial
+    assert breaker.state == HALF_OPEN
+    assert breaker.acquire() is None
+    breaker.record_success(trial)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_failed_trial_reopens_with_backoff():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now = 10
+    breaker.record_failure(breaker.acquire())
+    assert breaker.state == OPEN
+    clock.now = 29.9
+    assert breaker.acquire() is None
+    clock.now = 30
+    breaker.record_failure(breaker.acquire())
+    # The wait doubles up to max_reset_timeout
+    clock.now = 54.9
+    assert breaker.acquire() is None
+    clock.now = 55
+    assert breaker.acquire().trial
+
+
+def test_outcomes_of_calls_from_before_a_state_change_are_ignored():
+    clock = FakeClock()
+    breaker = CircuitBreaker("primary", failure_threshold=2, reset_timeout=10, clock=clock)
+    slow_call = breaker.acquire()
+    breaker.record_failure(breaker.acquire())
+    breaker.record_failure(breaker.acquire())
+    assert breaker.state == OPEN
+    # A call that started before the outage succeeds late
+    breaker.record_success(slow_call)
+    assert breaker.state == OPEN
+
+    clock.now = 10
+    trial = breaker.acquire()
+    breaker.record_failure(slow_call)
+    breaker.record_success(trial)
+    breaker.record_failure(trial)
+    assert breaker.state == CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_released_trial_lets_the_next_call_try():
+    clock = FakeClock()
+    breaker = open_breaker(clock)
+    clock.now = 10
+    breaker.release(breaker.acquire())
+    assert breaker.state == OPEN
+    assert breaker.acquire().trial
+
+
+def test_translator_falls_back_and_recovers_through_a_trial():
+    clock = FakeClock()
+    primary = MockBackend(failure_rate=1.0, batch_model="primary", single_model="primary")
+    fallback = MockBackend(batch_model="fallback", single_model="fallback")
+    breaker = CircuitBreaker("primary", failure_threshold=2, reset_timeout=10, clock=clock)
+    translator = Translator(backend=primary, fallback_backend=fallback, breaker=breaker, call_timeout=None)
+
+    for _ in range(2):
+        with pytest.raises(Exception):
+            translator.generate('Original text: "Save"')
+    assert translator.generate('Original text: "Save"').startswith("[")
+    assert fallback.calls == 1
+
+    clock.now = 10
+    primary.failure_rate = 0.0
+    translator.generate('Original text: "Save"')
+    assert primary.calls == 3
+    assert breaker.state == CLOSED
+
+
+def test_translator_fails_fast_without_a_tier():
+    clock = FakeClock()
+    translator = Translator(backend=MockBackend(), breaker=open_breaker(clock), call_timeout=None)
+    with pytest.raises(CircuitOpen):
+        translator.generate("prompt")
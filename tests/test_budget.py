@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+
+from translate_tool.budget import BudgetExceeded, ReservationGroup, TokenBudget, UsageLedger
+from translate_tool.core import Translator
+from translate_tool.hedging import ModelTimeout
+
+
+class BlockingBackend:
+    """Answers once release is set, like a request stuck on the server."""
+
+    batch_model = single_model = "blocking"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.finished = threading.Event()
+
+    def generate(self, prompt, model=None):
+        self.release.wait(5)
+        self.finished.set()
+        return "late answer"
+
+
+def test_reserve_raises_when_a_call_alone_exceeds_the_budget():
+    budget = TokenBudget(max_tokens=100)
+    with pytest.raises(BudgetExceeded):
+        budget.reserve(80, 40, "gemini-2.0-flash")
+
+
+def test_settle_records_actual_usage_and_frees_the_reservation():
+    ledger = UsageLedger()
+    budget = TokenBudget(max_tokens=1000, ledger=ledger)
+    reservation = budget.reserve(100, 100, "gemini-2.0-flash")
+    budget.settle(reservation, "gemini-2.0-flash", 90, 30, language="French")
+    assert budget.used_tokens == 120
+    assert budget.remaining()[0] == 880
+    assert ledger.total()["calls"] == 1
+    # The full budget is available again
+    budget.settle(budget.reserve(400, 400, "gemini-2.0-flash"), "gemini-2.0-flash", 0, 0)
+
+
+def test_release_then_settle_gives_the_reservation_back_once():
+    budget = TokenBudget(max_tokens=1000)
+    reservation = budget.reserve(300, 300, "gemini-2.0-flash")
+    budget.release(reservation)
+    budget.release(reservation)
+    budget.settle(reservation, "gemini-2.0-flash", 300, 100)
+    assert budget.used_tokens == 400
+    # Only the settled usage counts against the limit, not the released reservation
+    budget.settle(budget.reserve(300, 300, "gemini-2.0-flash"), "gemini-2.0-flash", 0, 0)
+
+
+def test_reservation_group_releases_late_reservations():
+    budget = TokenBudget(max_tokens=1000)
+    group = ReservationGroup(budget)
+    assert group.add(budget.reserve(400, 400, "gemini-2.0-flash"))
+    group.release()
+    assert not group.add(budget.reserve(400, 400, "gemini-2.0-flash"))
+    budget.settle(budget.reserve(450, 450, "gemini-2.0-flash"), "gemini-2.0-flash", 0, 0)
+
+
+def test_timed_out_call_releases_budget_and_counts_one_failure():
+    backend = BlockingBackend()
+    budget = TokenBudget(max_tokens=100000)
+    translator = Translator(backend=backend, budget=budget, call_timeout=0.05)
+
+    started = time.monotonic()
+    with pytest.raises(ModelTimeout):
+        translator.generate("Translate this", expected_output_tokens=10)
+    assert time.monotonic() - started < 2
+    assert budget.remaining()[0] == 100000
+    assert translator.breaker.stats()["consecutive_failures"] == 1
+
+    # The abandoned attempt's answer neither resets nor adds to the failure count
+    backend.release.set()
+    assert backend.finished.wait(5)
+    deadline = time.monotonic() + 5
+    while budget.used_tokens == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert budget.used_tokens > 0
+    assert translator.breaker.stats()["consecutive_failures"] == 1
@@ -0,0 +1,65 @@
+import io
+import zipfile
+
+from translate_tool.context_index import MAX_USAGES, ContextIndex, enclosing_elements
+
+SOURCE = '''package app
+
+val APP_TITLE = Res.string.app_name
+
+@Composable
+fun EditProfileScreen(onSave: () -> Unit) {
+    Column {
+        TopAppBar(title = { Text(stringResource(Res.string.edit_profile)) })
+        Button(onClick = onSave) {
+            Text(text = stringResource(Res.string.save))
+        }
+        Text(text = "Unbalanced ({ in a literal")
+    }
+}
+
+fun settingsTitle() = getString(R.string.settings)
+'''
+
+
+def test_usages_are_described_by_function_and_enclosing_calls():
+    index = ContextIndex()
+    index.add_source("shared/App.kt", SOURCE)
+    assert index.contexts() == {
+        "app_name": "App.kt: val APP_TITLE = Res.string.app_name",
+        "edit_profile": "EditProfileScreen > TopAppBar(title) > Text: "
+                        "TopAppBar(title = { Text(stringResource(Res.string.edit_profile)) })",
+        "save": "EditProfileScreen > Button > Text(text): Text(text = stringResource(Res.string.save))",
+        "settings": "settingsTitle: fun settingsTitle() = getString(R.string.settings)",
+    }
+
+
+def test_enclosing_elements_skip_resource_calls_and_attach_trailing_lambdas():
+    assert enclosing_elements("Column { Button(onClick = {}) { Text(stringResource(") == ["Column", "Button", "Text"]
+
+
+def test_only_requested_keys_are_indexed():
+    index = ContextIndex(keys={"save"})
+    index.add_source("App.kt", SOURCE)
+    assert list(index.contexts()) == ["save"]
+
+
+def test_usages_in_different_functions_are_preferred():
+    index = ContextIndex()
+    for screen in ("Login", "Login", "Signup"):
+        index.add_source(f"{screen}.kt", f"fun {screen}Screen() {{\n    Button {{ Text(stringResource(Res.string.ok)) }}\n    Text(stringResource(Res.string.ok))\n}}\n")
+    usages = index.contexts()["ok"].split(" | ")
+    assert len(usages) == MAX_USAGES
+    assert [usage.split(" > ")[0] for usage in usages] == ["LoginScreen", "SignupScreen"]
+
+
+def test_archives_are_indexed_without_their_top_folder():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("owner-repo-abc123/app/Main.kt", "val title = R.string.title\n")
+        archive.writestr("owner-repo-abc123/app/strings.xml", "<resources>R.string.ignored</resources>")
+    buffer.seek(0)
+    index = ContextIndex()
+    index.add_archive(buffer)
+    assert index.files_indexed == 1
+    assert index.contexts() == {"title": "Main.kt: val title = R.string.title"}
@@ -0,0 +1,65 @@
+import pytest
+
+from translate_tool import formats
+from translate_tool.export import ExportJob, render_export_files
+
+STRINGS = {
+    "title": 'Say "hi"\nnow',
+    "files#one": "%d file",
+    "files#other": "%d files",
+    "days[0]": "Monday",
+}
+
+
+@pytest.mark.parametrize("name, extension", [
+    ("Android XML", ".xml"),
+    ("iOS Strings", ".strings"),
+    ("XLIFF", ".xlf"),
+    ("Gettext PO", ".po"),
+    ("Flutter ARB", ".arb"),
+    ("JSON", ".json"),
+])
+def test_render_then_read_round_trips(name, extension):
+    # .strings files can't hold plurals, and ARB merges them into one ICU message
+    strings = {key: value for key, value in STRINGS.items() if name not in ("iOS Strings", "Flutter ARB") or "#" not in key}
+    rendered = formats.render(name, strings, "fr", source_strings=strings)
+    assert dict(formats.read_strings(f"strings{extension}", rendered)) == strings
+
+
+def test_arb_merges_plurals_into_an_icu_message():
+    rendered = formats.render("Flutter ARB", STRINGS, "fr")
+    assert dict(formats.read_strings("app_fr.arb", rendered))["files"] == "{count, plural, one{%d file} other{%d files}}"
+
+
+def test_stringsdict_round_trips_plurals():
+    rendered = formats.render("iOS Stringsdict", STRINGS, "fr")
+    assert dict(formats.read_strings("Localizable.stringsdict", rendered)) == {
+        "files#one": "%d file", "files#other": "%d files"
+    }
+
+
+def test_untranslatable_keys_are_left_out_of_translations():
+    rendered = formats.render("iOS Strings", STRINGS, "fr", untranslatable={"title"})
+    assert "title" not in rendered
+    assert "title" in formats.render("iOS Strings", STRINGS, "en", untranslatable={"title"})
+
+
+def test_ios_strings_export_writes_plurals_to_a_stringsdict():
+    jobs = [ExportJob("app/fr.lproj/Localizable.strings", "strings.xml", "fr", STRINGS)]
+    files = dict(render_export_files(jobs, "iOS Strings"))
+    assert list(files) == ["app/fr.lproj/Localizable.strings", "app/fr.lproj/Localizable.stringsdict"]
+    assert "files" not in files["app/fr.lproj/Localizable.strings"]
+    plurals = dict(formats.read_strings("Localizable.stringsdict", files["app/fr.lproj/Localizable.stringsdict"]))
+    assert plurals == {"files#one": "%d file", "files#other": "%d files"}
+
+
+def test_exports_without_plurals_have_no_companion():
+    jobs = [ExportJob("fr.lproj/Localizable.strings", "strings.xml", "fr", {"title": "Titre"})]
+    assert list(dict(render_export_files(jobs, "iOS Strings"))) == ["fr.lproj/Localizable.strings"]
+    assert formats.render_companion("Android XML", STRINGS) is None
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(ValueError):
+        list(formats.read_strings("strings.txt", ""))
+    assert formats.format_for_path("values/strings.XML").name == "Android XML"
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from translate_tool.glossary import Glossary, TermMatcher, format_glossary
+
+
+@pytest.mark.parametrize("text, terms", [
+    ("Loan amount", ["Loan"]),
+    ("Loaner", []),
+    ("Repay the LOAN now", ["Loan"]),
+    ("Welcome to Mifos X", ["Mifos X"]),
+    ("Mifos is open", ["Mifos"]),
+    ("Loan, loan and savings account", ["Loan", "Savings account"]),
+    ("account", []),
+])
+def test_terms_are_found_on_word_boundaries_and_the_longest_wins(text, terms):
+    matcher = TermMatcher(["Loan", "Mifos", "Mifos X", "Savings account"])
+    assert matcher.terms_in(text) == terms
+
+
+def test_matches_found_through_failure_links_have_their_offsets():
+    matcher = TermMatcher(["he", "she", "hers", "s h"])
+    assert matcher.find("she ushers s h") == [(0, 3, "she"), (11, 14, "s h")]
+    assert TermMatcher([]).find("anything") == []
+
+
+def test_language_entries_take_precedence_over_all_languages():
+    glossary = Glossary([
+        {"term": "Loan", "translation": "Prêt", "language": "fr"},
+        {"term": "Loan", "translation": "Loan", "language": ""},
+        {"term": "Mifos X"},
+    ])
+    assert glossary.entries_for("Loan from Mifos X", "fr") == {"Loan": "Prêt", "Mifos X": "Mifos X"}
+    assert glossary.entries_for("Loan", "de") == {"Loan": "Loan"}
+    assert glossary.required("Unknown", "fr") is None
+    assert format_glossary({"Loan": "Prêt", "Mifos X": "Mifos X"}) == '- "Loan" → "Prêt"\n- "Mifos X" (keep unchanged)'
+
+
+def test_violations_list_terms_the_translation_ignored():
+    glossary = Glossary([{"term": "Loan", "translation": "Prêt", "language": "fr"}, {"term": "Mifos X"}])
+    assert glossary.violations("Loan from Mifos X", "PRÊTS de Mifos X", "fr") == []
+    assert glossary.violations("Loan from Mifos X", "Emprunt de Mifos", "fr") == [("Loan", "Prêt"), ("Mifos X", "Mifos X")]
+    # Adding a term after matching rebuilds the matcher
+    glossary.add("savings", "épargne", "fr")
+    assert glossary.violations("Savings", "Économies", "fr") == [("savings", "épargne")]
+
+
+def test_load_json_and_csv(tmp_path):
+    json_path = tmp_path / "glossary.json"
+    json_path.write_text(json.dumps({"Mifos X": None, "Loan": {"fr": "Prêt", "de": "Darlehen"}}), encoding="utf-8")
+    glossary = Glossary.load(str(json_path))
+    assert len(glossary) == 2
+    assert glossary.entries_for("Loan", "de") == {"Loan": "Darlehen"}
+
+    csv_path = tmp_path / "glossary.csv"
+    csv_path.write_text("term,language,translation\nLoan,fr,Prêt\n", encoding="utf-8")
+    assert Glossary.load(str(csv_path)).rows() == [{"term": "Loan", "language": "fr", "translation": "Prêt"}]
+
+    bad_path = tmp_path / "bad.csv"
+    bad_path.write_text("word,translation\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        Glossary.load(str(bad_path))
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from translate_tool.hedging import LatencyTracker, ModelTimeout, TranslationCancelled, call_with_deadline
+
+
+class SlowFirstAttempt:
+    """The first call hangs until released; later calls answer at once."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.release.wait(5)
+            return "slow"
+        return "fast"
+
+
+def test_hedge_answers_when_the_first_attempt_stalls():
+    attempt = SlowFirstAttempt()
+    hedges = []
+    result = call_with_deadline(attempt, timeout=5, hedge_delay=0.02, on_hedge=lambda: hedges.append(1))
+    attempt.release.set()
+    assert result == ("fast", 1)
+    assert hedges == [1]
+
+
+def test_fast_calls_are_not_hedged():
+    attempt = SlowFirstAttempt()
+    attempt.calls = 1
+    assert call_with_deadline(attempt, timeout=5, hedge_delay=1) == ("fast", 0)
+    assert attempt.calls == 2
+
+
+def test_deadline_raises_model_timeout():
+    attempt = SlowFirstAttempt()
+    started = time.monotonic()
+    with pytest.raises(ModelTimeout):
+        call_with_deadline(attempt, timeout=0.05)
+    attempt.release.set()
+    assert time.monotonic() - started < 1
+
+
+def test_cancellation_stops_waiting():
+    attempt = SlowFirstAttempt()
+    cancelled = threading.Event()
+    threading.Timer(0.05, cancelled.set).start()
+    with pytest.raises(TranslationCancelled):
+        call_with_deadline(attempt, cancelled=cancelled)
+    attempt.release.set()
+
+
+def test_error_is_raised_once_every_attempt_failed():
+    def attempt():
+        raise ValueError("bad response")
+
+    with pytest.raises(ValueError):
+        call_with_deadline(attempt, timeout=5, hedge_delay=0)
+
+
+def test_hedge_delay_needs_enough_history():
+    tracker = LatencyTracker(quantile=0.95, min_samples=3)
+    tracker.observe("model", 1.0)
+    tracker.observe("model", 2.0)
+    assert tracker.hedge_delay("model") is None
+    tracker.observe("model", 3.0)
+    assert 2.0 <= tracker.hedge_delay("model") <= 3.0
+    assert tracker.hedge_delay("other") is None
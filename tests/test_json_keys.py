@@ -0,0 +1,22 @@
+import pytest
+
+from translate_tool.formats import i18next_json
+from translate_tool.json_keys import unflatten_json
+
+
+@pytest.mark.parametrize("flattened", [
+    {"a": 2, "a.b": 1},
+    {"a.b": 1, "a": 2},
+    {"a.0": "x", "a": "y"},
+    {"a": "y", "a.0": "x"},
+])
+def test_unflatten_rejects_value_and_parent_in_any_order(flattened):
+    with pytest.raises(ValueError):
+        unflatten_json(flattened)
+
+
+@pytest.mark.parametrize("flattened", [{"a": 2, "a.b": 1}, {"a.b": 1, "a": 2}])
+def test_i18next_export_keeps_conflicting_keys_flat(flattened):
+    rendered = "".join(i18next_json.iter_render(flattened))
+    assert '"a.b": 1' in rendered
+    assert '"a": 2' in rendered
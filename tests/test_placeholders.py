@@ -0,0 +1,35 @@
+import pytest
+
+from translate_tool.placeholders import mask_strings, mask_text, restore_translations, unmask_text, validate_translation
+
+
+def test_mask_then_unmask_restores_every_fragment():
+    text = '<b>%1$s</b> has {count} files &amp; <![CDATA[<i>new</i>]]> items\\n'
+    masked, fragments = mask_text(text)
+    assert "%1$s" not in masked and "<b>" not in masked and "\\n" not in masked
+    # The text inside CDATA is still sent to the model
+    assert "new" in masked and "items" in masked
+    assert unmask_text(masked, fragments) == text
+
+
+@pytest.mark.parametrize("translation, problems", [
+    ("%1$s a {count} fichiers", []),
+    ("{count} fichiers pour %1$s", []),
+    ("%1$s a des fichiers", ["missing {count}"]),
+    ("%1$s a {count} {count} fichiers", ["unexpected {count}"]),
+    ("%1$s a ⟦7⟧ fichiers", ["unrestored placeholder token", "missing {count}"]),
+    ("  ", ["empty translation"]),
+])
+def test_validate_translation(translation, problems):
+    assert validate_translation("%1$s has {count} files", translation) == problems
+
+
+def test_restore_translations_fails_only_the_mangled_keys():
+    sources = {"a": "Hi %s", "b": "<b>Bold</b>", "c": "Plain"}
+    masked, fragments = mask_strings(sources)
+    assert masked["a"] == "Hi ⟦0⟧"
+    valid, failed = restore_translations(
+        {"a": "Salut ⟦ 0 ⟧", "b": "Gras", "c": None, "extra": "ignored"}, fragments, sources
+    )
+    assert valid == {"a": "Salut %s"}
+    assert set(failed) == {"b", "c"}
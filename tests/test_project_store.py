@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+
+from translate_tool.project_store import PROJECT_SCOPE, ProjectStore
+
+STRINGS_XML = """<resources>
+    <string name="save">Save</string>
+    <string name="cancel">Cancel</string>
+    <plurals name="files"><item quantity="one">%d file</item><item quantity="other">%d files</item></plurals>
+</resources>"""
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProjectStore(str(tmp_path / "projects.db"))
+    store.create_project("app", "Manual Upload")
+    yield store
+    store.close()
+
+
+def test_string_counts_are_stored_with_files(store, monkeypatch):
+    store.save_files("app", {"values/strings.xml": STRINGS_XML, "broken.xml": "<resources>"})
+    # Listing the files must not parse them again
+    monkeypatch.setattr("translate_tool.project_store.count_strings", None)
+    assert store.load_string_counts("app") == {"values/strings.xml": 4, "broken.xml": 0}
+
+
+def test_string_counts_of_older_databases_are_filled_in(tmp_path):
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript("""
+        CREATE TABLE files (project TEXT NOT NULL, path TEXT NOT NULL, content TEXT NOT NULL,
+                            content_hash TEXT NOT NULL, PRIMARY KEY (project, path));
+        INSERT INTO files VALUES ('app', 'values/strings.xml', '<resources><string name="a">A</string></resources>', 'x');
+    """)
+    connection.commit()
+    connection.close()
+
+    store = ProjectStore(path)
+    assert store.load_string_counts("app") == {"values/strings.xml": 1}
+    store.close()
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT string_count FROM files").fetchone() == (1,)
+    connection.close()
+
+
+def test_machine_saves_keep_human_edits(store):
+    store.save_strings("app", PROJECT_SCOPE, "fr", {"save": "Sauver", "cancel": "Annuler"})
+    store.save_strings("app", PROJECT_SCOPE, "fr", {"save": "Enregistrer"}, human_edited=True)
+
+    store.save_strings("app", PROJECT_SCOPE, "fr", {"save": "Sauvegarder", "cancel": "Annuler"})
+    store.append_strings("app", PROJECT_SCOPE, "fr", [("save", "Sauver")])
+    assert store.load_strings("app", PROJECT_SCOPE, "fr")["fr"]["save"] == "Enregistrer"
+
+    # A full replace that lacks the edited key doesn't delete it either
+    store.save_strings("app", PROJECT_SCOPE, "fr", {"cancel": "Annuler"})
+    assert store.load_strings("app", PROJECT_SCOPE, "fr")["fr"] == {"save": "Enregistrer", "cancel": "Annuler"}
+    assert store.load_human_edited("app", PROJECT_SCOPE, "fr") == {"save"}
+
+
+def test_reviewer_saves_overwrite_human_edits(store):
+    store.save_strings("app", PROJECT_SCOPE, "fr", {"save": "Enregistrer"}, human_edited=True)
+    store.save_strings("app", PROJECT_SCOPE, "fr", {"save": "Sauvegarder"}, human_edited=True)
+    assert store.load_strings("app", PROJECT_SCOPE, "fr")["fr"]["save"] == "Sauvegarder"
+
+
+def test_unchanged_saves_write_nothing(store):
+    strings = {"save": "Sauver", "cancel": "Annuler"}
+    assert store.save_strings("app", PROJECT_SCOPE, "fr", strings) == 2
+    assert store.save_strings("app", PROJECT_SCOPE, "fr", strings) == 0
+    assert store.save_files("app", {"values/strings.xml": STRINGS_XML}) == 1
+    assert store.save_files("app", {"values/strings.xml": STRINGS_XML}) == 0
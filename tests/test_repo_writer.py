@@ -0,0 +1,80 @@
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+from translate_tool.repo_writer import GitHubTarget, LocalGitTarget, commit_locale_files, git_blob_sha, plan_locale_files
+
+
+@pytest.fixture
+def target(tmp_path, monkeypatch):
+    for variable in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(variable, "Translator")
+    for variable in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(variable, "translator@example.com")
+    path = str(tmp_path / "repo.git")
+    subprocess.run(["git", "init", "--bare", "--quiet", path], check=True)
+    return LocalGitTarget(path, "main")
+
+
+def render(source_path, lang_code, translations):
+    return "".join(f"{key}={value}\n" for key, value in sorted(translations.items()))
+
+
+def test_locale_files_are_placed_next_to_their_source():
+    files = plan_locale_files({
+        "app/src/main/res/values/strings.xml": {"en": {"save": "Save"}, "zh-CN": {"save": "保存"}, "fr": {}},
+        "shared/MR/base/strings.xml": {"de": {"save": "Speichern"}},
+        "docs/strings.xml": {"de": {"save": "Speichern"}},
+    }, render)
+    assert sorted(files) == ["app/src/main/res/values-zh-rCN/strings.xml", "shared/MR/de/strings.xml"]
+
+
+def test_local_target_commits_only_changed_files(target):
+    files = {"res/values-fr/strings.xml": "save=Sauver\n", "res/values-de/strings.xml": "save=Speichern\n"}
+    first = commit_locale_files(target, files)
+    assert first["changed"] == sorted(files)
+
+    files["res/values-fr/strings.xml"] = "save=Enregistrer\n"
+    second = commit_locale_files(target, files)
+    assert second["changed"] == ["res/values-fr/strings.xml"]
+    assert target._git("rev-parse", f"{second['commit']}^") == first["commit"]
+    assert target.blob_shas() == {path: git_blob_sha(content) for path, content in files.items()}
+
+    assert commit_locale_files(target, files) == {"changed": [], "commit": None, "url": None}
+
+
+def entry(path, sha, entry_type="blob"):
+    return SimpleNamespace(path=path, sha=sha, type=entry_type)
+
+
+class TruncatingRepo:
+    """A PyGithub repository whose recursive tree listing is truncated, as GitHub does for large repos."""
+
+    def __init__(self):
+        self.trees = {
+            "root": [entry("res", "res-tree", "tree"), entry("README.md", "readme")],
+            "res-tree": [entry("values-fr", "fr-tree", "tree")],
+            "fr-tree": [entry("strings.xml", git_blob_sha("save=Sauver\n"))],
+        }
+        self.listed = []
+
+    def get_branch(self, branch):
+        return SimpleNamespace(commit=SimpleNamespace(sha="root"))
+
+    def get_git_tree(self, sha, recursive=False):
+        if recursive:
+            return SimpleNamespace(tree=[entry("README.md", "readme")], raw_data={"truncated": True})
+        self.listed.append(sha)
+        return SimpleNamespace(tree=self.trees[sha], raw_data={"truncated": False})
+
+
+def test_github_target_lists_directories_when_the_tree_is_truncated():
+    repo = TruncatingRepo()
+    target = GitHubTarget(repo, "main")
+    shas = target.blob_shas(["res/values-fr/strings.xml", "res/values-de/strings.xml", "other/strings.xml"])
+    assert shas == {"res/values-fr/strings.xml": git_blob_sha("save=Sauver\n")}
+    # Only the directories on the way to the requested files are listed, each once
+    assert sorted(repo.listed) == ["fr-tree", "res-tree", "root"]
+
+    assert target.blob_shas() == {"README.md": "readme", "res/values-fr/strings.xml": git_blob_sha("save=Sauver\n")}
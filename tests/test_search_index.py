@@ -0,0 +1,41 @@
+import pytest
+
+from translate_tool.search_index import SearchIndex
+
+ROWS = {
+    "save": ["save", "Save", "Enregistrer"],
+    "save_as": ["save_as", "Save as…", "Enregistrer sous…"],
+    "cancel": ["cancel", "Cancel", "Annuler"],
+    "pattern": ["pattern", "Match a.*b [x]", None],
+}
+
+
+@pytest.mark.parametrize("query, keys", [
+    ("", ["save", "save_as", "cancel", "pattern"]),
+    ("ENREGISTRER", ["save", "save_as"]),
+    ("sous", ["save_as"]),
+    ("an", ["cancel"]),
+    ("a.*b [x]", ["pattern"]),
+    (".*", ["pattern"]),
+    ("missing", []),
+])
+def test_literal_search_is_case_insensitive_and_keeps_index_order(query, keys):
+    assert SearchIndex(ROWS).search(query) == keys
+
+
+def test_updates_replace_the_indexed_fields():
+    index = SearchIndex(ROWS)
+    index.update("cancel", ["cancel", "Cancel", "Abbrechen"])
+    assert index.search("annuler") == []
+    assert index.search("abbrechen") == ["cancel"]
+    index.update("new", ["new", "New", "Neu"])
+    assert len(index) == 5
+    # Updated keys keep their position
+    assert index.search("")[-2:] == ["pattern", "new"]
+
+
+def test_fuzzy_search_ranks_by_trigram_overlap():
+    index = SearchIndex(ROWS)
+    assert index.search("enregistrer", fuzzy=True)[0] == "save"
+    assert "save" in index.search("enregistrre", fuzzy=True)
+    assert index.search("enregistrre") == []
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+
+from translate_tool.backends import MockBackend
+from translate_tool.service import _handle_connection, create_app
+
+
+async def exchange(app, request):
+    """Send raw bytes to the built-in server and return the status code and parsed body."""
+    server = await asyncio.start_server(lambda reader, writer: _handle_connection(app, reader, writer), "127.0.0.1", 0)
+    async with server:
+        reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+        writer.write(request)
+        await writer.drain()
+        # The server closes the connection after its response
+        response = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ")[1]), json.loads(body) if body else None
+
+
+def post_jobs(payload):
+    body = json.dumps(payload).encode()
+    return b"POST /jobs HTTP/1.1\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+
+
+@pytest.fixture
+def app():
+    app = create_app(backend=MockBackend(), max_wait=0.01, call_timeout=None)
+    yield app
+    app.close()
+
+
+@pytest.mark.parametrize("request_bytes", [
+    b"GARBAGE\r\n\r\n",
+    b"GET /health\r\n\r\n",
+    b"POST /jobs HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+    b"POST /jobs HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+])
+def test_malformed_requests_get_400_and_the_connection_is_closed(app, request_bytes):
+    status, payload = asyncio.run(exchange(app, request_bytes))
+    assert status == 400
+    assert payload["error"].startswith("Invalid request")
+
+
+@pytest.mark.parametrize("payload", [
+    {"language": "French", "strings": {"a": "Save"}, "contexts": ["button"]},
+    {"language": "French", "strings": {"a": "Save"}, "skip_keys": "a"},
+    {"language": "French", "strings": {"a": "Save"}, "skip_keys": [{"a": 1}]},
+    {"language": "French", "strings": ["Save"]},
+])
+def test_submit_rejects_fields_of_the_wrong_type(app, payload):
+    status, body = asyncio.run(exchange(app, post_jobs(payload)))
+    assert status == 400
+
+
+def test_submitted_job_is_translated(app):
+    async def run():
+        status, job = await exchange(app, post_jobs({
+            "language": "French", "strings": {"save": "Save", "id": "com.example"},
+            "contexts": {"save": "button"}, "skip_keys": ["id"]
+        }))
+        assert status == 202
+        for _ in range(100):
+            status, job = await exchange(app, f"GET /jobs/{job['id']} HTTP/1.1\r\n\r\n".encode())
+            if job["status"] not in ("queued", "running"):
+                break
+            await asyncio.sleep(0.02)
+        return job
+
+    job = asyncio.run(run())
+    assert job["status"] == "done"
+    assert job["translations"]["id"] == "com.example"
+    assert job["translations"]["save"] != "Save"
@@ -0,0 +1,60 @@
+from translate_tool.shared_cache import BoundedCache, TranslationMemory, approximate_size
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = BoundedCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_size_bound_evicts_and_skips_oversized_entries():
+    value = "x" * 1000
+    cache = BoundedCache(max_bytes=approximate_size(value) * 2)
+    cache.set("a", value)
+    cache.set("b", value)
+    cache.set("c", value)
+    assert len(cache) == 2
+    assert cache.get("a") is None
+
+    cache.set("huge", value * 10)
+    # An entry larger than the whole cache is dropped rather than flushing everything
+    assert cache.get("huge") is None
+    assert len(cache) == 2
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("translate_tool.shared_cache.time.monotonic", lambda: now[0])
+    cache = BoundedCache(ttl=10)
+    cache.set("a", 1)
+    now[0] = 110.0
+    assert cache.get("a") == 1
+    now[0] = 120.5
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_translation_memory_is_keyed_by_language_and_context():
+    memory = TranslationMemory()
+    texts = {"save": "Save", "title": "Save"}
+    contexts = {"title": "screen title"}
+    memory.remember(texts, {"save": "Enregistrer", "title": "Sauvegarde"}, "French", contexts)
+
+    cached, pending = memory.lookup({"button": "Save", "heading": "Save"}, "French", {"heading": "screen title"})
+    assert cached == {"button": "Enregistrer", "heading": "Sauvegarde"}
+    assert pending == {}
+    assert memory.lookup({"save": "Save"}, "German") == ({}, {"save": "Save"})
+
+
+def test_translation_memory_ignores_untranslated_results():
+    memory = TranslationMemory()
+    # Failed batches fall back to the source text, which must not be remembered
+    memory.remember({"save": "Save", "empty": "Empty"}, {"save": "Save", "empty": ""}, "French")
+    assert memory.lookup({"save": "Save", "empty": "Empty"}, "French")[0] == {}
@@ -0,0 +1,27 @@
+import pytest
+
+from translate_tool.string_filters import classify_string, split_translatable, summarize_skips
+
+
+@pytest.mark.parametrize("key, text, reason", [
+    ("hidden", "Hello", "translatable=false"),
+    ("blank", "   ", "empty"),
+    ("site", "https://example.com/help", "url"),
+    ("mail", "support@example.com", "email"),
+    ("price", "-1,299.50", "number"),
+    ("ref", "@string/app_name", "resource reference"),
+    ("format", "%1$s: {count}", "placeholder only"),
+    ("label", "Save %d files", None),
+    ("word", "OK", None),
+])
+def test_classify_string(key, text, reason):
+    assert classify_string(key, text, untranslatable={"hidden"}) == reason
+
+
+def test_split_translatable_passes_skipped_strings_through():
+    to_translate, passthrough, reasons = split_translatable(
+        {"save": "Save", "url": "www.example.com", "count": "%d", "id": "Main"}, untranslatable={"id"}
+    )
+    assert to_translate == {"save": "Save"}
+    assert passthrough == {"url": "www.example.com", "count": "%d", "id": "Main"}
+    assert summarize_skips(reasons) == {"url": 1, "placeholder only": 1, "translatable=false": 1}
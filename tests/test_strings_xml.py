@@ -0,0 +1,111 @@
+import io
+
+import pytest
+
+from translate_tool import strings_xml
+from translate_tool.formats import render
+
+SOURCE = """<?xml version="1.0" encoding="utf-8"?>
+<resources xmlns:tools="http://schemas.android.com/tools" xmlns:xliff="urn:oasis:names:tc:xliff:document:1.2">
+    <string name="reference">@string/app_name</string>
+    <string name="theme_reference">?android:attr/textColorPrimary</string>
+    <string name="at_text">\\@home</string>
+    <string name="escaped_reference">\\@string/app_name</string>
+    <string name="link"><![CDATA[<a href="%1$s">Don\\'t open</a>]]></string>
+    <string name="entity">Tom &amp; Jerry</string>
+    <string name="styled">Tom &amp; <b>Jerry</b></string>
+    <string name="escaped_markup">&lt;b&gt;bold&lt;/b&gt;</string>
+    <string name="quotes">Say \\"hi\\", it\\'s fine</string>
+    <string name="placeholder">Hello <xliff:g id="name" example="Bob">%1$s</xliff:g></string>
+    <string name="ignored" tools:ignore="MissingTranslation" formatted="false">%s of %d</string>
+    <string name="locked" translatable="false">Mifos</string>
+    <string-array name="days">
+        <item>@string/monday</item>
+        <item>Tuesday\\'s</item>
+    </string-array>
+    <plurals name="files">
+        <item quantity="one">%d file</item>
+        <item quantity="other">%d files &amp; folders</item>
+    </plurals>
+</resources>
+"""
+
+
+def round_trip(source, language_code=None):
+    strings = strings_xml.parse_strings_xml(source)
+    return strings, strings_xml.dict_to_strings_xml(
+        strings, language_code, strings_xml.untranslatable_keys(source), strings_xml.resource_attributes(source)
+    )
+
+
+def test_parse_decodes_values():
+    strings = strings_xml.parse_strings_xml(SOURCE)
+    assert strings["reference"] == "@string/app_name"
+    assert strings["at_text"] == "@home"
+    assert strings["entity"] == "Tom & Jerry"
+    assert strings["styled"] == "Tom & <b>Jerry</b>"
+    assert strings["quotes"] == 'Say "hi", it\'s fine'
+    assert strings["link"] == '<![CDATA[<a href="%1$s">Don\'t open</a>]]>'
+    assert strings["escaped_markup"] == "<![CDATA[<b>bold</b>]]>"
+    assert strings["days[1]"] == "Tuesday's"
+    assert strings["files#other"] == "%d files & folders"
+
+
+@pytest.mark.parametrize("name, line", [
+    ("reference", '<string name="reference">@string/app_name</string>'),
+    ("theme_reference", '<string name="theme_reference">?android:attr/textColorPrimary</string>'),
+    ("at_text", '<string name="at_text">\\@home</string>'),
+    ("escaped_reference", '<string name="escaped_reference">\\@string/app_name</string>'),
+    ("link", '<string name="link"><![CDATA[<a href=\\"%1$s\\">Don\\\'t open</a>]]></string>'),
+    ("entity", '<string name="entity">Tom &amp; Jerry</string>'),
+    ("styled", '<string name="styled">Tom &amp; <b>Jerry</b></string>'),
+    ("quotes", '<string name="quotes">Say \\"hi\\", it\\\'s fine</string>'),
+    ("ignored", '<string name="ignored" tools:ignore="MissingTranslation" formatted="false">%s of %d</string>'),
+    ("locked", '<string name="locked" translatable="false">Mifos</string>'),
+    ("array", "<item>@string/monday</item>"),
+])
+def test_write_keeps_source_meaning(name, line):
+    _, written = round_trip(SOURCE)
+    assert line in written
+
+
+def test_round_trip_is_stable():
+    strings, written = round_trip(SOURCE)
+    assert strings_xml.parse_strings_xml(written) == strings
+    assert round_trip(written) == (strings, written)
+
+
+def test_round_trip_keeps_plurals_and_arrays():
+    _, written = round_trip(SOURCE)
+    assert '<item quantity="other">%d files &amp; folders</item>' in written
+    assert "<item>Tuesday\\'s</item>" in written
+
+
+def test_translation_keeps_attributes_and_drops_untranslatable():
+    _, written = round_trip(SOURCE, "fr")
+    assert 'tools:ignore="MissingTranslation"' in written
+    assert 'name="locked"' not in written
+
+
+def test_android_export_keeps_attributes():
+    strings = strings_xml.parse_strings_xml(SOURCE)
+    written = render("Android XML", strings, "fr", attributes=strings_xml.resource_attributes(SOURCE))
+    assert 'formatted="false"' in written
+
+
+@pytest.mark.parametrize("text, escaped", [
+    ("@string/app_name", "@string/app_name"),
+    ("@android:color/white", "@android:color/white"),
+    ("@null", "@null"),
+    ("?attr/colorPrimary", "?attr/colorPrimary"),
+    ("@home", "\\@home"),
+    ("? Really", "\\? Really"),
+    ("\\@string/app_name", "\\@string/app_name"),
+])
+def test_escape_only_escapes_non_references(text, escaped):
+    assert strings_xml.escape_android_text(text) == escaped
+
+
+def test_cdata_split_across_chunks(monkeypatch):
+    monkeypatch.setattr(strings_xml, "READ_CHUNK_BYTES", 3)
+    assert strings_xml.parse_strings_xml(io.BytesIO(SOURCE.encode("utf-8"))) == strings_xml.parse_strings_xml(SOURCE)
@@ -0,0 +1,6 @@
+"""
+Core building blocks for the UI String Translator.
+
+Modules in this package are kept free of Streamlit calls so they can be shared
+between the app and other entry points.
+"""
@@ -0,0 +1,233 @@
+"""
+Model backends the Translator sends its prompts to.
+
+A backend has a batch_model and a single_model name and one method:
+
+    generate(prompt, model=None)   returns the response text; model defaults
+                                   to batch_model
+
+Backends that know how many tokens a call used also provide
+
+    generate_with_usage(prompt, model=None)
+                                   returns (text, usage), where usage is a
+                                   dict with "prompt_tokens" and
+                                   "output_tokens", or None if unknown
+
+otherwise the Translator estimates usage from the text lengths.
+
+GeminiBackend calls the Gemini API. MockBackend answers locally and
+deterministically, with tunable latency, failures and malformed responses,
+so batching, retries and concurrency can be load-tested without a network.
+"""
+
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from translate_tool.budget import estimate_tokens
+
+# Model for multi-string prompts, and for translating one string at a time
+BATCH_MODEL = os.getenv("TRANSLATOR_BATCH_MODEL", "gemini-2.0-flash")
+SINGLE_MODEL = os.getenv("TRANSLATOR_SINGLE_MODEL", "gemini-1.5-pro")
+MAX_OUTPUT_TOKENS = 8192
+# Model tier used while the primary model's circuit is open; unset for none
+FALLBACK_MODEL = os.getenv("TRANSLATOR_FALLBACK_MODEL")
+
+# How the prompts in translate_tool.core name the language and embed their input
+PROMPT_LANGUAGE_PATTERN = re.compile(r"UI strings? to (.+?)[.:]?\s*$", re.MULTILINE)
+PROMPT_TEXT_PATTERN = re.compile(r'Original text: "(.*?)"\n\s*Context:', re.DOTALL)
+
+
+def load_genai():
+    """Import the Gemini SDK."""
+    import google.generativeai as genai
+    return genai
+
+
+def configure_gemini(api_key):
+    """Configure the Gemini SDK with an API key."""
+    load_genai().configure(api_key=api_key)
+
+
+class GeminiBackend:
+    """
+    Sends prompts to the Gemini API.
+
+    Args:
+        batch_model (str): Model for multi-string prompts
+        single_model (str): Model for single-string prompts
+        max_output_tokens (int): Output limit of each call
+        api_key (str): If given, configures the SDK with it
+        timeout (float): Seconds before the SDK gives up on a request; None for its default
+    """
+
+    name = "gemini"
+
+    def __init__(self, batch_model=BATCH_MODEL, single_model=SINGLE_MODEL, max_output_tokens=MAX_OUTPUT_TOKENS, api_key=None,
+                 timeout=None):
+        self.batch_model = batch_model
+        self.single_model = single_model
+        self.max_output_tokens = max_output_tokens
+        self.timeout = timeout
+        if api_key:
+            configure_gemini(api_key)
+
+    def generate(self, prompt, model=None):
+        return self.generate_with_usage(prompt, model)[0]
+
+    def generate_with_usage(self, prompt, model=None):
+        generation_config = {"max_output_tokens": self.max_output_tokens} if self.max_output_tokens else None
+        options = {"request_options": {"timeout": self.timeout}} if self.timeout else {}
+        response = load_genai().GenerativeModel(model or self.batch_model, generation_config=generation_config).generate_content(
+            prompt, **options
+        )
+        return response.text.strip(), response_usage(response)
+
+
+def response_usage(response):
+    """Read the token counts of a Gemini response, or None if it has no usage metadata."""
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is None:
+        return None
+    return {
+        "prompt_tokens": getattr(metadata, "prompt_token_count", 0) or 0,
+        "output_tokens": getattr(metadata, "candidates_token_count", 0) or 0
+    }
+
+
+class MockBackendError(RuntimeError):
+    """A simulated model failure."""
+
+
+class MockBackend:
+    """
+    Answers translation prompts locally.
+
+    Each string is "translated" by prefixing it with the language, e.g.
+    "[French] Save"; placeholder tokens pass through untouched, so responses
+    validate like real ones. Randomness comes from a seeded generator, so a
+    run with the same settings and call order is reproducible.
+
+    Args:
+        latency (float): Seconds each call takes
+        jitter (float): Extra random latency of up to this many seconds
+        failure_rate (float): Probability that a call raises MockBackendError
+        malformed_rate (float): Probability that a call returns unparseable JSON
+        slow_rate (float): Probability that a call stalls for slow_latency seconds,
+            like a request stuck on the server
+        slow_latency (float): Seconds a stalled call takes
+        seed (int): Seed of the random generator
+        batch_model (str): Reported batch model name
+        single_model (str): Reported single model name
+        timeout (float): Seconds after which a call gives up with MockBackendError, like
+            GeminiBackend's request timeout; None waits for every call
+    """
+
+    name = "mock"
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, malformed_rate=0.0, seed=0,
+                 batch_model="mock-batch", single_model="mock-single", slow_rate=0.0, slow_latency=30.0, timeout=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.malformed_rate = malformed_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.timeout = timeout
+        self.batch_model = batch_model
+        self.single_model = single_model
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.malformed = 0
+        self.stalled = 0
+
+    def _draw(self):
+        with self._lock:
+            self.calls += 1
+            draws = self._random.random(), self._random.random(), self._random.random()
+            # Only drawn when enabled, so seeded runs without stalls stay reproducible
+            stalled = self.slow_rate > 0 and self._random.random() < self.slow_rate
+            self.stalled += int(stalled)
+            return draws + (stalled,)
+
+    def generate(self, prompt, model=None):
+        delay_draw, failure_draw, malformed_draw, stalled = self._draw()
+        delay = self.slow_latency if stalled else self.latency + self.jitter * delay_draw
+        if self.timeout and delay > self.timeout:
+            time.sleep(self.timeout)
+            raise MockBackendError(f"Simulated request timeout after {self.timeout:g}s")
+        if delay:
+            time.sleep(delay)
+        if failure_draw < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            raise MockBackendError("Simulated model failure")
+
+        language_match = PROMPT_LANGUAGE_PATTERN.search(prompt)
+        language = language_match.group(1) if language_match else "translated"
+        # Only batch prompts carry an "Input:" array; a tier may use one model for both
+        if "Input:" not in prompt:
+            text_match = PROMPT_TEXT_PATTERN.search(prompt)
+            text = text_match.group(1) if text_match else ""
+            return f"[{language}] {text}"
+
+        items = _prompt_items(prompt)
+        response = json.dumps(
+            [dict(item, translation=f"[{language}] {item.get('text', '')}") for item in items],
+            ensure_ascii=False
+        )
+        if malformed_draw < self.malformed_rate:
+            with self._lock:
+                self.malformed += 1
+            # Cut the array off mid-item, like a response that hit the output limit
+            return response[:max(1, len(response) // 2)].rsplit('"key"', 1)[0]
+        return response
+
+    def generate_with_usage(self, prompt, model=None):
+        # Mock responses are priced like real ones, from their length
+        text = self.generate(prompt, model)
+        return text, {"prompt_tokens": estimate_tokens(prompt), "output_tokens": estimate_tokens(text)}
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "failures": self.failures, "malformed": self.malformed, "stalled": self.stalled}
+
+
+def _prompt_items(prompt):
+    """Extract the JSON array of items from a batch prompt."""
+    start = prompt.find("[", prompt.find("Input:"))
+    if start < 0:
+        return []
+    try:
+        items, _ = json.JSONDecoder().raw_decode(prompt, start)
+    except ValueError:
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+BACKENDS = {
+    GeminiBackend.name: GeminiBackend,
+    MockBackend.name: MockBackend
+}
+
+
+def create_backend(name=None, **options):
+    """
+    Create a backend by name.
+
+    Args:
+        name (str): "gemini" or "mock"; defaults to $TRANSLATOR_BACKEND or "gemini"
+        **options: Constructor arguments of the backend
+
+    Raises:
+        ValueError: If the backend isn't known
+    """
+    name = name or os.getenv("TRANSLATOR_BACKEND", GeminiBackend.name)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name}")
+    return BACKENDS[name](**options)
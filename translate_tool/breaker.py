@@ -0,0 +1,141 @@
+"""
+Circuit breaker for a model backend.
+
+After failure_threshold consecutive failed calls the breaker opens: callers
+stop sending to the backend and either move to a fallback tier or fail fast
+with CircuitOpen, instead of burning every retry of every batch on an outage.
+Once reset_timeout seconds have passed it is half-open: the next call is let
+through as a trial while every other caller still stays away. The breaker
+closes if the trial succeeds, and opens again with twice the wait, up to
+max_reset_timeout, if it fails.
+
+Callers take a permit with acquire() and report the call's outcome with it.
+Outcomes of calls let through before the breaker last changed state are
+ignored, so a slow call that started before an outage can't close the
+breaker, and one that ends after recovery can't open it again.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+FAILURE_THRESHOLD = 5
+# Seconds before the first trial call, and the longest wait between trials
+RESET_TIMEOUT = 30.0
+MAX_RESET_TIMEOUT = 300.0
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# generation is the state the call was let through in; trial marks the half-open call
+Permit = namedtuple("Permit", ["generation", "trial"])
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(RuntimeError):
+    """Raised instead of calling a backend whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures of a backend and stops traffic while it is down.
+
+    Args:
+        name (str): Name used in log messages
+        failure_threshold (int): Consecutive failures that open the breaker
+        reset_timeout (float): Seconds the breaker stays open before the first trial call
+        max_reset_timeout (float): Longest wait between trial calls
+        clock: Returns the current time in seconds; time.monotonic by default
+    """
+
+    def __init__(self, name="backend", failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT,
+                 max_reset_timeout=MAX_RESET_TIMEOUT, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._generation = 0
+        self._failures = 0
+        self._delay = reset_timeout
+        self._retry_at = None
+        self.opened = 0
+        self.trials = 0
+
+    @property
+    def state(self):
+        return self._state
+
+    def allow(self):
+        """Return whether a call would be let through now, without taking the half-open trial."""
+        with self._lock:
+            return self._state == CLOSED or (self._state == OPEN and self.clock() >= self._retry_at)
+
+    def acquire(self):
+        """
+        Let a call through if the breaker allows it.
+
+        Returns:
+            Permit: Pass it to record_success, record_failure or release once the call ends;
+                None if the call must not be sent
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return Permit(self._generation, False)
+            if self._state == OPEN and self.clock() >= self._retry_at:
+                self._transition(HALF_OPEN)
+                self.trials += 1
+                return Permit(self._generation, True)
+            return None
+
+    def record_success(self, permit):
+        with self._lock:
+            if permit.generation != self._generation:
+                return
+            self._failures = 0
+            if self._state != HALF_OPEN:
+                return
+            self._delay = self.reset_timeout
+            self._transition(CLOSED)
+        logger.info(f"Circuit for {self.name} closed after a successful trial call")
+
+    def record_failure(self, permit):
+        """Count a failed call, opening the breaker once failure_threshold are in a row or a trial fails."""
+        with self._lock:
+            if permit.generation != self._generation:
+                return
+            if self._state == HALF_OPEN:
+                self._delay = min(self._delay * 2, self.max_reset_timeout)
+                message = f"Trial call to {self.name} failed; retrying in {self._delay:g}s"
+            else:
+                self._failures += 1
+                if self._failures < self.failure_threshold:
+                    return
+                self._delay = self.reset_timeout
+                self.opened += 1
+                message = f"Circuit for {self.name} opened after {self.failure_threshold} consecutive failures"
+            self._transition(OPEN)
+            self._retry_at = self.clock() + self._delay
+        logger.warning(message)
+
+    def release(self, permit):
+        """Return a permit whose call ended without an outcome, e.g. because the run was cancelled."""
+        with self._lock:
+            if permit.trial and permit.generation == self._generation and self._state == HALF_OPEN:
+                # Let the next caller make the trial instead
+                self._transition(OPEN)
+                self._retry_at = self.clock()
+
+    def _transition(self, state):
+        # Called with the lock held; outcomes of calls let through before now are ignored
+        self._state = state
+        self._generation += 1
+
+    def stats(self):
+        with self._lock:
+            return {"state": self._state, "consecutive_failures": self._failures, "opened": self.opened, "trials": self.trials}
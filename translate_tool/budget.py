@@ -0,0 +1,312 @@
+"""
+Token and cost accounting, and budgets that stop a run before it overspends.
+
+Every model call is recorded in a UsageLedger with the token counts the API
+reported (or an estimate when a backend doesn't report usage), so usage can
+be totalled per run, language, model and project. A TokenBudget wraps the
+calls of one run:
+
+    reservation = budget.reserve(prompt_tokens, expected_output_tokens, model)
+    ... call the model ...
+    budget.settle(reservation, prompt_tokens, output_tokens, language=...)
+
+reserve() raises BudgetExceeded when the call would take the run over its
+token or cost limit. While other calls are still in flight it waits for them
+to settle first, so concurrent batches slow down near the limit instead of
+overshooting it together. A call that is abandoned before it answers gives
+its reservation back with release(); its usage is still recorded if it
+settles later.
+"""
+
+import threading
+
+# Rough estimate of characters per token, used when a backend doesn't report usage
+CHARS_PER_TOKEN = 4
+
+# USD per million tokens, as (prompt, output)
+MODEL_PRICES = {
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00)
+}
+
+# Share of a budget after which a warning is reported
+WARN_FRACTION = 0.8
+
+
+def estimate_tokens(text):
+    """Estimate the tokens in a text from its length."""
+    return round(len(text) / CHARS_PER_TOKEN)
+
+
+def token_cost(model, prompt_tokens, output_tokens, prices=MODEL_PRICES):
+    """
+    Price a call in USD.
+
+    Returns:
+        float: The cost, or 0.0 for models without a price (such as the mock backend)
+    """
+    prompt_price, output_price = prices.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + output_tokens * output_price) / 1_000_000
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised when a run would exceed its token or cost budget."""
+
+
+class UsageLedger:
+    """
+    Token usage of model calls, grouped by project, language and model.
+
+    Thread-safe, so one ledger can be shared by concurrent batches and by
+    several runs.
+
+    Args:
+        prices (dict): Model name to USD per million (prompt, output) tokens
+    """
+
+    FIELDS = ("project", "language", "model")
+
+    def __init__(self, prices=MODEL_PRICES):
+        self.prices = prices
+        self._lock = threading.Lock()
+        # (project, language, model) -> {"calls", "estimated_calls", "prompt_tokens", "output_tokens"}
+        self._usage = {}
+
+    def record(self, model, prompt_tokens, output_tokens, language=None, project=None, estimated=False):
+        """Record one model call."""
+        key = (project, language, model)
+        with self._lock:
+            usage = self._usage.get(key)
+            if usage is None:
+                usage = self._usage[key] = {"calls": 0, "estimated_calls": 0, "prompt_tokens": 0, "output_tokens": 0}
+            usage["calls"] += 1
+            usage["estimated_calls"] += int(estimated)
+            usage["prompt_tokens"] += prompt_tokens
+            usage["output_tokens"] += output_tokens
+
+    def totals(self, by=FIELDS):
+        """
+        Total the recorded usage.
+
+        Args:
+            by (tuple): Fields to group by, any of "project", "language" and "model";
+                an empty tuple gives a single row
+
+        Returns:
+            list: One dict per group with the group fields, "calls", "estimated_calls",
+                "prompt_tokens", "output_tokens", "total_tokens" and "cost_usd"
+        """
+        with self._lock:
+            items = [(dict(zip(self.FIELDS, key)), dict(usage)) for key, usage in self._usage.items()]
+
+        groups = {}
+        for fields, usage in items:
+            group_key = tuple(fields[name] for name in by)
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = dict(
+                    {name: fields[name] for name in by},
+                    calls=0, estimated_calls=0, prompt_tokens=0, output_tokens=0, cost_usd=0.0
+                )
+            for name in ("calls", "estimated_calls", "prompt_tokens", "output_tokens"):
+                group[name] += usage[name]
+            group["cost_usd"] += token_cost(fields["model"], usage["prompt_tokens"], usage["output_tokens"], self.prices)
+
+        rows = []
+        for group in groups.values():
+            group["total_tokens"] = group["prompt_tokens"] + group["output_tokens"]
+            rows.append(group)
+        return sorted(rows, key=lambda row: tuple(str(row[name] or "") for name in by))
+
+    def total(self):
+        """Return the usage of every recorded call as a single row."""
+        rows = self.totals(by=())
+        return rows[0] if rows else {
+            "calls": 0, "estimated_calls": 0, "prompt_tokens": 0, "output_tokens": 0, "total_tokens": 0, "cost_usd": 0.0
+        }
+
+
+class Reservation:
+    """
+    Budget held for a model call until it settles or is released.
+
+    Args:
+        tokens (int): Reserved prompt plus output tokens
+        cost (float): Reserved USD
+    """
+
+    def __init__(self, tokens, cost):
+        self.tokens = tokens
+        self.cost = cost
+        self.held = True
+
+
+class ReservationGroup:
+    """
+    Reservations of the attempts of one call, e.g. a call and its hedge.
+
+    When the call is abandoned, release() gives back every reservation at
+    once, and attempts that reserve afterwards get theirs back immediately.
+
+    Args:
+        budget (TokenBudget): The budget the reservations were made against
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._reservations = []
+        self.released = False
+
+    def add(self, reservation):
+        """Hold a reservation for the call; returns False, releasing it, if the call was already abandoned."""
+        with self._lock:
+            if not self.released:
+                self._reservations.append(reservation)
+                return True
+        self.budget.release(reservation)
+        return False
+
+    def release(self):
+        with self._lock:
+            self.released = True
+            reservations, self._reservations = self._reservations, []
+        for reservation in reservations:
+            self.budget.release(reservation)
+
+
+class TokenBudget:
+    """
+    Token and cost limits of one run.
+
+    Args:
+        max_tokens (int): Prompt plus output tokens the run may use; None for no limit
+        max_cost (float): USD the run may spend; None for no limit
+        ledger (UsageLedger): Receives every call; defaults to a new ledger
+        project (str): Project the run's usage is recorded under
+        warn_fraction (float): Share of a limit after which warn() is called once
+        warn: Called with a message when the run passes warn_fraction of a limit
+    """
+
+    def __init__(self, max_tokens=None, max_cost=None, ledger=None, project=None, warn_fraction=WARN_FRACTION, warn=None):
+        self.max_tokens = max_tokens
+        self.max_cost = max_cost
+        self.ledger = ledger if ledger is not None else UsageLedger()
+        self.project = project
+        self.warn_fraction = warn_fraction
+        self.warn = warn
+        self._condition = threading.Condition()
+        self._warned = False
+        self.used_tokens = 0
+        self.used_cost = 0.0
+        # Tokens and cost reserved by calls that are still in flight
+        self._reserved_tokens = 0
+        self._reserved_cost = 0.0
+
+    @property
+    def limited(self):
+        return self.max_tokens is not None or self.max_cost is not None
+
+    def _over(self, tokens, cost):
+        return (
+            (self.max_tokens is not None and tokens > self.max_tokens)
+            or (self.max_cost is not None and cost > self.max_cost)
+        )
+
+    def remaining(self):
+        """Return the (tokens, USD) left in the budget; None for a dimension without a limit."""
+        with self._condition:
+            tokens = None if self.max_tokens is None else max(0, self.max_tokens - self.used_tokens)
+            cost = None if self.max_cost is None else max(0.0, self.max_cost - self.used_cost)
+        return tokens, cost
+
+    def describe(self):
+        """Describe the limits, e.g. "200,000 tokens / $1.50"."""
+        parts = []
+        if self.max_tokens is not None:
+            parts.append(f"{self.max_tokens:,} tokens")
+        if self.max_cost is not None:
+            parts.append(f"${self.max_cost:g}")
+        return " / ".join(parts) or "unlimited"
+
+    def check_estimate(self, estimate):
+        """
+        Check a pre-flight estimate against what is left of the budget.
+
+        Args:
+            estimate (dict): "prompt_tokens", "output_tokens" and "cost_usd" of the planned work
+
+        Raises:
+            BudgetExceeded: If the estimate alone would exceed the budget
+        """
+        with self._condition:
+            tokens = self.used_tokens + estimate["prompt_tokens"] + estimate["output_tokens"]
+            cost = self.used_cost + estimate["cost_usd"]
+            if self._over(tokens, cost):
+                raise BudgetExceeded(
+                    f"Estimated usage of {estimate['prompt_tokens'] + estimate['output_tokens']:,} tokens "
+                    f"(${estimate['cost_usd']:.4f}) exceeds the run budget of {self.describe()}."
+                )
+
+    def reserve(self, prompt_tokens, output_tokens, model):
+        """
+        Reserve budget for a model call before it is sent.
+
+        Waits while calls in flight could take the run over its limits, and
+        raises once the call would exceed them even on its own.
+
+        Returns:
+            Reservation: The reservation to pass to settle() or release()
+
+        Raises:
+            BudgetExceeded: If the call would exceed the budget
+        """
+        tokens = prompt_tokens + output_tokens
+        cost = token_cost(model, prompt_tokens, output_tokens, self.ledger.prices)
+        with self._condition:
+            while self._over(self.used_tokens + self._reserved_tokens + tokens, self.used_cost + self._reserved_cost + cost):
+                if not self._reserved_tokens:
+                    raise BudgetExceeded(
+                        f"The next model call needs about {tokens:,} tokens, which would exceed the run budget of "
+                        f"{self.describe()} ({self.used_tokens:,} tokens / ${self.used_cost:.4f} used)."
+                    )
+                self._condition.wait()
+            self._reserved_tokens += tokens
+            self._reserved_cost += cost
+        return Reservation(tokens, cost)
+
+    def _give_back(self, reservation):
+        # Called with the condition held; a reservation is only given back once
+        if reservation.held:
+            reservation.held = False
+            self._reserved_tokens -= reservation.tokens
+            self._reserved_cost -= reservation.cost
+
+    def release(self, reservation):
+        """Give back a reservation without recording usage, e.g. for a call that was abandoned."""
+        with self._condition:
+            self._give_back(reservation)
+            self._condition.notify_all()
+
+    def settle(self, reservation, model, prompt_tokens, output_tokens, language=None, estimated=False):
+        """Release a reservation, unless release() already did, and record the call's actual usage."""
+        self.ledger.record(model, prompt_tokens, output_tokens, language, self.project, estimated)
+        warning = None
+        with self._condition:
+            self._give_back(reservation)
+            self.used_tokens += prompt_tokens + output_tokens
+            self.used_cost += token_cost(model, prompt_tokens, output_tokens, self.ledger.prices)
+            if not self._warned and self.limited and self._over_fraction(self.warn_fraction):
+                self._warned = True
+                warning = f"This run has used {self.used_tokens:,} tokens (${self.used_cost:.4f}) of its {self.describe()} budget."
+            self._condition.notify_all()
+        if warning and self.warn:
+            self.warn(warning)
+
+    def _over_fraction(self, fraction):
+        return (
+            (self.max_tokens is not None and self.used_tokens >= self.max_tokens * fraction)
+            or (self.max_cost is not None and self.used_cost >= self.max_cost * fraction)
+        )
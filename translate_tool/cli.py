@@ -0,0 +1,253 @@
+"""
+Command-line entry point for headless translation runs.
+
+    python -m translate_tool run --repo https://github.com/owner/repo --langs fr,de,ja
+    python -m translate_tool serve --port 8000
+
+`run` scans the repository, translates every strings.xml it finds and writes
+the locale files to a directory or ZIP archive. `serve` starts the HTTP
+translation service in translate_tool.service. Credentials are read from the
+GITHUB_TOKEN and GEMINI_API_KEY environment variables (or a .env file) unless
+given as options. The exit status is non-zero if nothing was exported, and 3
+if the run was stopped by its --max-tokens or --max-cost budget or cancelled
+after --run-timeout.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+
+from translate_tool import core, formats, service
+from translate_tool.backends import BACKENDS, BATCH_MODEL, FALLBACK_MODEL, SINGLE_MODEL, GeminiBackend, MockBackend
+from translate_tool.budget import BudgetExceeded, TokenBudget
+from translate_tool.glossary import Glossary
+from translate_tool.hedging import TranslationCancelled
+from translate_tool.metrics import RunMetrics
+from translate_tool.shared_cache import TranslationMemory
+
+
+def parse_languages(value):
+    """Split a comma-separated list of language codes or names into language codes."""
+    codes = []
+    for item in value.split(","):
+        item = item.strip()
+        if item:
+            codes.append(core.LANGUAGE_CODES.get(item, item))
+    return codes
+
+
+def create_backend_from_args(args, api_key=None):
+    """Create the model backend selected on the command line."""
+    if args.backend == "mock":
+        return MockBackend(
+            args.mock_latency, args.mock_jitter, args.mock_failure_rate, args.mock_malformed_rate, args.mock_seed,
+            slow_rate=args.mock_slow_rate, slow_latency=args.mock_slow_latency, timeout=args.call_timeout
+        )
+    return GeminiBackend(args.batch_model, args.single_model, api_key=api_key, timeout=args.call_timeout)
+
+
+def create_fallback_backend_from_args(args):
+    """Create the backend of the --fallback-model tier, or None if there is none."""
+    if not args.fallback_model:
+        return None
+    if args.backend == "mock":
+        # A healthy tier, so outages of the primary can be simulated with --mock-failure-rate
+        return MockBackend(args.mock_latency, args.mock_jitter, seed=args.mock_seed,
+                           batch_model=args.fallback_model, single_model=args.fallback_model, timeout=args.call_timeout)
+    return GeminiBackend(args.fallback_model, args.fallback_model, timeout=args.call_timeout)
+
+
+def add_backend_arguments(parser):
+    # Defaults are read from the environment here rather than at import, so a .env loaded by main() applies
+    group = parser.add_argument_group("model backend")
+    group.add_argument("--backend", choices=sorted(BACKENDS), default=os.getenv("TRANSLATOR_BACKEND", "gemini"),
+                       help="Send prompts to Gemini, or answer them locally for offline testing")
+    group.add_argument("--batch-model", default=os.getenv("TRANSLATOR_BATCH_MODEL", BATCH_MODEL),
+                       help="Gemini model for batches of strings")
+    group.add_argument("--single-model", default=os.getenv("TRANSLATOR_SINGLE_MODEL", SINGLE_MODEL),
+                       help="Gemini model for single strings")
+    group.add_argument("--fallback-model", default=os.getenv("TRANSLATOR_FALLBACK_MODEL", FALLBACK_MODEL),
+                       help="Model to send requests to while the primary model keeps failing (defaults to $TRANSLATOR_FALLBACK_MODEL)")
+    group.add_argument("--mock-latency", type=float, default=0.0, help="Seconds each mock call takes")
+    group.add_argument("--mock-jitter", type=float, default=0.0, help="Extra random mock latency, in seconds")
+    group.add_argument("--mock-failure-rate", type=float, default=0.0, help="Share of mock calls that raise")
+    group.add_argument("--mock-malformed-rate", type=float, default=0.0, help="Share of mock calls that return broken JSON")
+    group.add_argument("--mock-slow-rate", type=float, default=0.0, help="Share of mock calls that stall")
+    group.add_argument("--mock-slow-latency", type=float, default=30.0, help="Seconds a stalled mock call takes")
+    group.add_argument("--mock-seed", type=int, default=0)
+    group.add_argument("--call-timeout", type=float, default=core.CALL_TIMEOUT,
+                       help="Seconds a model call may take before it is abandoned and retried")
+    group.add_argument("--hedge", action="store_true",
+                       help="Send a duplicate of model calls slower than the recent p95 and use the first answer")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m translate_tool", description="Translate UI strings without the web UI.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="Scan a GitHub repository, translate its strings and export them")
+    run.add_argument("--repo", required=True, help="GitHub repository URL, optionally with /tree/<branch>")
+    run.add_argument("--langs", required=True, type=parse_languages,
+                     help="Comma-separated target language codes or names, e.g. fr,de,ja")
+    run.add_argument("--format", default="Android XML", choices=formats.format_names(), help="Export format")
+    run.add_argument("--output", default="translations", help="Output directory, or a path ending in .zip")
+    run.add_argument("--workers", type=int, default=4, help="(file, language) pairs translated at once")
+    run.add_argument("--concurrency", type=int, default=1, help="Batches per translation sent to the model at once")
+    run.add_argument("--batch-size", type=int, default=core.BATCH_SIZE, help="Strings per prompt in batch mode")
+    run.add_argument("--batch-delay", type=float, default=core.BATCH_DELAY, help="Seconds to wait between batches")
+    run.add_argument("--full-scan", action="store_true", help="Walk the whole tree instead of common module layouts first")
+    run.add_argument("--no-code-context", action="store_true",
+                     help="Don't index where strings are used in the Kotlin/Java sources for prompt context")
+    run.add_argument("--glossary", default=None,
+                     help="JSON or CSV glossary of terms whose translations are enforced, e.g. {\"Mifos X\": null}")
+    run.add_argument("--github-token", default=None, help="Defaults to $GITHUB_TOKEN")
+    run.add_argument("--api-key", default=None, help="Defaults to $GEMINI_API_KEY")
+    run.add_argument("--metrics-file", default=None, help="Write the run's timings and counters here in OpenMetrics format")
+    run.add_argument("--max-tokens", type=int, default=None, help="Stop before the run uses more prompt plus output tokens")
+    run.add_argument("--max-cost", type=float, default=None, help="Stop before the run spends more USD")
+    run.add_argument("--run-timeout", type=float, default=None, help="Cancel the translation after this many seconds")
+    run.add_argument("-v", "--verbose", action="store_true", help="Also log every file the scan visits")
+    add_backend_arguments(run)
+
+    serve = subparsers.add_parser("serve", help="Run the HTTP translation service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--batch-size", type=int, default=core.BATCH_SIZE, help="Strings per prompt")
+    serve.add_argument("--max-wait-ms", type=float, default=service.MAX_WAIT * 1000,
+                       help="Longest time a string waits for its batch to fill up")
+    serve.add_argument("--max-in-flight", type=int, default=service.MAX_IN_FLIGHT, help="Batches sent to the model at once")
+    serve.add_argument("--api-key", default=None, help="Defaults to $GEMINI_API_KEY")
+    add_backend_arguments(serve)
+    return parser
+
+
+def run(args):
+    github_token = args.github_token or os.getenv("GITHUB_TOKEN")
+    api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+    if not github_token:
+        logging.error("No GitHub token. Pass --github-token or set GITHUB_TOKEN.")
+        return 2
+    if not api_key and args.backend == "gemini":
+        logging.error("No Gemini API key. Pass --api-key or set GEMINI_API_KEY.")
+        return 2
+
+    glossary = None
+    if args.glossary:
+        try:
+            glossary = Glossary.load(args.glossary)
+        except (OSError, ValueError) as e:
+            logging.error(f"Can't read the glossary: {e}")
+            return 2
+
+    reporter = core.LoggingReporter(verbose=args.verbose)
+    metrics = RunMetrics()
+    owner, repo_name, _ = core.parse_repo_url(args.repo)
+    budget = TokenBudget(args.max_tokens, args.max_cost, project=f"{owner}/{repo_name}", warn=reporter.warning)
+    translator = core.Translator(
+        reporter,
+        backend=create_backend_from_args(args, api_key),
+        translation_memory=TranslationMemory(),
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        batch_delay=args.batch_delay,
+        metrics=metrics,
+        budget=budget,
+        call_timeout=args.call_timeout,
+        hedge=args.hedge,
+        fallback_backend=create_fallback_backend_from_args(args),
+        glossary=glossary
+    )
+    timer = None
+    if args.run_timeout:
+        timer = threading.Timer(args.run_timeout, translator.cancel)
+        timer.daemon = True
+        timer.start()
+    try:
+        summary = core.run_pipeline(
+            core.github_client(github_token),
+            args.repo,
+            args.langs,
+            translator,
+            export_format=args.format,
+            output=args.output,
+            pattern_search=not args.full_scan,
+            workers=args.workers,
+            index_contexts=not args.no_code_context
+        )
+    except (BudgetExceeded, TranslationCancelled) as e:
+        logging.error(f"Run stopped: {e}")
+        summary = None
+    finally:
+        if timer:
+            timer.cancel()
+    log_summary(metrics)
+    log_usage(budget.ledger)
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(metrics.to_openmetrics())
+    if summary is None:
+        return 3
+    return 0 if summary["exported"] else 1
+
+
+def log_summary(metrics):
+    """Log where the run spent its time."""
+    summary = metrics.summary()
+    logging.info(f"Run finished in {summary['elapsed_s']:.1f}s")
+    for row in summary["stages"]:
+        labels = "".join(f" {name}={value}" for name, value in row["labels"].items())
+        logging.info(
+            f"  {row['stage']}{labels}: {row['count']} x, {row['total_s']:.2f}s total, "
+            f"p50 {row['p50_ms']:.0f} ms, p95 {row['p95_ms']:.0f} ms"
+        )
+    for name, value in sorted(summary["counters"].items()):
+        logging.info(f"  {name}: {value}")
+
+
+def log_usage(ledger):
+    """Log the tokens and cost of the run, per language and model."""
+    total = ledger.total()
+    logging.info(
+        f"Token usage: {total['prompt_tokens']:,} prompt + {total['output_tokens']:,} output tokens "
+        f"in {total['calls']} calls (${total['cost_usd']:.4f})"
+    )
+    for row in ledger.totals(by=("language", "model")):
+        estimated = f", {row['estimated_calls']} estimated" if row["estimated_calls"] else ""
+        logging.info(
+            f"  {row['language'] or '-'} ({row['model']}): {row['total_tokens']:,} tokens "
+            f"in {row['calls']} calls{estimated} (${row['cost_usd']:.4f})"
+        )
+
+
+def serve(args):
+    api_key = args.api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key and args.backend == "gemini":
+        logging.error("No Gemini API key. Pass --api-key or set GEMINI_API_KEY.")
+        return 2
+
+    app = service.create_app(
+        create_backend_from_args(args, api_key), args.batch_size, args.max_wait_ms / 1000, args.max_in_flight,
+        args.call_timeout, args.hedge, create_fallback_backend_from_args(args)
+    )
+    logging.info(f"Serving on http://{args.host}:{args.port}")
+    service.serve(app, args.host, args.port)
+    return 0
+
+
+def main(argv=None):
+    # Load .env before the parser reads its defaults and credentials are looked up
+    from dotenv import load_dotenv
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "run":
+        return run(args)
+    if args.command == "serve":
+        return serve(args)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Usage contexts for string keys, extracted from Kotlin and Java sources.
+
+The model translates "Save" better when it knows the string is a button
+label on a profile screen. Compose code refers to strings as Res.string.<key>
+(Compose Multiplatform) or R.string.<key> (Android), so the indexer finds
+every such reference and describes it compactly, e.g.
+
+    EditProfileScreen > Button > Text(text): Text(text = stringResource(Res.string.save))
+
+That description becomes the "context" of the key in translation prompts.
+"""
+
+import bisect
+import posixpath
+import re
+
+SOURCE_EXTENSIONS = (".kt", ".kts", ".java")
+
+KEY_REFERENCE = re.compile(r"\b(?:Res|R)\.string\.([A-Za-z_]\w*)")
+FUNCTION_DECLARATION = re.compile(r"\bfun\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?(\w+)\s*\(")
+STRING_LITERAL = re.compile(r'"(?:\\.|[^"\\\n])*"')
+TRAILING_CALL = re.compile(r"(\w+)\s*\(\s*$")
+NAMED_ARGUMENT = re.compile(r"\b([a-z]\w*)\s*=\s*$")
+PROPERTY_DECLARATION = re.compile(r"\b(?:val|var)\s+$")
+DECLARATION_START = re.compile(r"^\s*(?:(?:private|protected|internal|public|override|const)\s+)*(?:val|var|fun|class|object)\b", re.MULTILINE)
+IDENTIFIER_BEFORE = re.compile(r"(\w+)\s*$")
+
+# Calls that only resolve or wrap a string resource, and say nothing about where it is shown
+RESOURCE_CALLS = frozenset({
+    "stringResource", "pluralStringResource", "getString", "getQuantityString", "getText",
+    "format", "remember", "listOf", "setOf", "mapOf", "Pair", "to", "let", "also", "apply", "run", "with"
+})
+
+# Characters of code before a reference that are searched for the elements around it
+WINDOW_CHARS = 800
+MAX_USAGES = 2
+MAX_SNIPPET_CHARS = 120
+MAX_CONTEXT_CHARS = 240
+# Usages kept per key while indexing, and the largest source file read
+MAX_INDEXED_USAGES = 8
+MAX_SOURCE_BYTES = 1024 * 1024
+
+
+def _truncate(text, limit):
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def _blank_literal(match):
+    return '"' + " " * (len(match.group(0)) - 2) + '"'
+
+
+def blank_string_literals(source):
+    """Blank the inside of string literals, keeping offsets, so their brackets aren't counted."""
+    return STRING_LITERAL.sub(_blank_literal, source)
+
+
+def named_argument(code):
+    """Return the name of the argument code ends in, e.g. "text" for "Text(text = ", or None."""
+    match = NAMED_ARGUMENT.search(code)
+    # "val title = " assigns a property rather than passing an argument
+    if not match or PROPERTY_DECLARATION.search(code, 0, match.start()):
+        return None
+    return match.group(1)
+
+
+def enclosing_elements(code):
+    """
+    Name the calls and lambdas that are still open at the end of a piece of code.
+
+    Args:
+        code (str): Source code up to a string reference, with string literals blanked
+
+    Returns:
+        list: Call names from the outermost to the innermost, e.g. ["Column", "Button", "Text"];
+            a lambda passed as a named argument is shown on its call, e.g. "TopAppBar(title)"
+    """
+    stack = []
+    last_closed = None
+    for position, char in enumerate(code):
+        if char in "({":
+            name = None
+            before = code[:position]
+            match = IDENTIFIER_BEFORE.search(before)
+            argument = named_argument(before) if char == "{" else None
+            if argument:
+                name = ("argument", argument)
+            elif match:
+                name = match.group(1)
+            elif char == "{" and before.rstrip().endswith(")"):
+                # A trailing lambda belongs to the call that was just closed
+                name = last_closed
+            stack.append(name)
+        elif char in ")}" and stack:
+            last_closed = stack.pop()
+
+    elements = []
+    for name in stack:
+        if isinstance(name, tuple):
+            if elements:
+                elements[-1] = f"{elements[-1]}({name[1]})"
+        elif name and name not in RESOURCE_CALLS and not name[0].isdigit():
+            elements.append(name)
+    return elements
+
+
+def function_declarations(source):
+    """Return the (end offset, name) of every function declared in a source file, in order."""
+    return [(match.end(), match.group(1)) for match in FUNCTION_DECLARATION.finditer(source)]
+
+
+def _function_is_open(blanked, declaration_end, start):
+    """Return whether a reference at start is still inside the function declared before it."""
+    depth = blanked.count("{", declaration_end, start) - blanked.count("}", declaration_end, start)
+    if depth > 0:
+        return True
+    # An expression body, e.g. fun title() = stringResource(Res.string.title)
+    body = blanked[declaration_end:start]
+    return depth == 0 and "{" not in body and not DECLARATION_START.search(body)
+
+
+def describe_usage(source, start, path, functions=None, blanked=None):
+    """
+    Describe the string reference at a position in a source file.
+
+    Args:
+        source (str): The source file
+        start (int): Offset of the reference
+        path (str): Path of the file, named when the reference is outside any function
+        functions (list): function_declarations(source), when describing several references
+        blanked (str): blank_string_literals(source), when describing several references
+
+    Returns:
+        str: e.g. "LoginScreen > Button > Text(text): Text(text = stringResource(Res.string.login))"
+    """
+    if functions is None:
+        functions = function_declarations(source)
+    if blanked is None:
+        blanked = blank_string_literals(source)
+    position = bisect.bisect_right(functions, (start, "")) - 1
+    function = functions[position] if position >= 0 else None
+    if function and not _function_is_open(blanked, function[0], start):
+        # The reference follows the end of the function, e.g. in a top-level property
+        function = None
+    # The window starts after the declaration, so the function itself isn't taken for an enclosing call
+    function_start = function[0] if function else 0
+    window = blanked[max(function_start, start - WINDOW_CHARS):start]
+
+    elements = enclosing_elements(window)
+    # Drop resource lookups wrapping the reference, to find the argument it is passed as
+    head = window
+    while True:
+        match = TRAILING_CALL.search(head)
+        if not match or match.group(1) not in RESOURCE_CALLS:
+            break
+        head = head[:match.start()]
+    argument = named_argument(head)
+
+    path_parts = []
+    if function:
+        path_parts.append(function[1])
+    elif path:
+        path_parts.append(posixpath.basename(path))
+    path_parts.extend(elements[-2:])
+    description = " > ".join(path_parts)
+    if argument:
+        description += f"({argument})"
+
+    line_start = source.rfind("\n", 0, start) + 1
+    line_end = source.find("\n", start)
+    line = " ".join(source[line_start:line_end if line_end >= 0 else len(source)].split())
+    return f"{description}: {_truncate(line, MAX_SNIPPET_CHARS)}" if description else _truncate(line, MAX_SNIPPET_CHARS)
+
+
+class ContextIndex:
+    """
+    Where each string key is used in a set of source files.
+
+    Args:
+        keys: Optional keys to index; references to other keys are ignored
+    """
+
+    def __init__(self, keys=None):
+        self.keys = set(keys) if keys is not None else None
+        # key -> list of usage descriptions
+        self._usages = {}
+        self.files_indexed = 0
+
+    def add_source(self, path, source):
+        """Index the string references in one source file."""
+        self.files_indexed += 1
+        functions = blanked = None
+        for match in KEY_REFERENCE.finditer(source):
+            key = match.group(1)
+            if self.keys is not None and key not in self.keys:
+                continue
+            usages = self._usages.setdefault(key, [])
+            if len(usages) >= MAX_INDEXED_USAGES:
+                continue
+            if functions is None:
+                functions = function_declarations(source)
+                blanked = blank_string_literals(source)
+            description = describe_usage(source, match.start(), path, functions, blanked)
+            if description not in usages:
+                usages.append(description)
+
+    def add_archive(self, archive_file):
+        """
+        Index the Kotlin and Java sources in a ZIP archive of a repository.
+
+        Args:
+            archive_file: A seekable file object of the archive
+        """
+        import zipfile
+
+        with zipfile.ZipFile(archive_file) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not info.filename.endswith(SOURCE_EXTENSIONS) or info.file_size > MAX_SOURCE_BYTES:
+                    continue
+                # GitHub archives put everything under an "<owner>-<repo>-<sha>/" folder
+                path = info.filename.split("/", 1)[-1]
+                self.add_source(path, archive.read(info).decode("utf-8", errors="replace"))
+
+    def contexts(self):
+        """
+        Return the context of every indexed key.
+
+        Usages in different functions are preferred, so two screens that show
+        the same string both end up in its context.
+
+        Returns:
+            dict: Key to a context of at most MAX_CONTEXT_CHARS characters
+        """
+        contexts = {}
+        for key, usages in self._usages.items():
+            chosen = []
+            seen_functions = set()
+            for usage in usages:
+                function = usage.split(" > ", 1)[0].split(":", 1)[0]
+                if function not in seen_functions:
+                    seen_functions.add(function)
+                    chosen.append(usage)
+            for usage in usages:
+                if usage not in chosen:
+                    chosen.append(usage)
+            contexts[key] = _truncate(" | ".join(chosen[:MAX_USAGES]), MAX_CONTEXT_CHARS)
+        return contexts
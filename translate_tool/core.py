@@ -0,0 +1,1525 @@
+"""
+The scan → parse → translate → export pipeline, without any UI.
+
+Everything the Streamlit app does with a repository and the model lives here,
+so it can also run headless from the command line, CI or cron. Status and
+progress are reported through a Reporter instead of Streamlit calls: the app
+passes one that renders status boxes and progress bars, the CLI one that logs.
+
+Prompts go to a backend from translate_tool.backends, Gemini by default.
+PyGithub is imported on first use.
+"""
+
+import base64
+import contextlib
+import json
+import logging
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from translate_tool import formats
+from translate_tool.backends import GeminiBackend
+from translate_tool.breaker import CircuitBreaker, CircuitOpen
+from translate_tool.budget import BudgetExceeded, CHARS_PER_TOKEN, ReservationGroup, TokenBudget, estimate_tokens, token_cost
+from translate_tool.context_index import ContextIndex
+from translate_tool.glossary import format_glossary
+from translate_tool.hedging import LatencyTracker, ModelTimeout, TranslationCancelled, call_with_deadline
+from translate_tool.metrics import NULL_METRICS
+from translate_tool.export import ExportJob, export_path_for, render_export_files, write_export_zip
+from translate_tool.placeholders import (
+    PROMPT_INSTRUCTION as PLACEHOLDER_PROMPT_INSTRUCTION, mask_strings, mask_text, restore_translations,
+    unmask_text, validate_translation, VALIDATION_RETRIES
+)
+from translate_tool.string_filters import classify_string, split_translatable, summarize_skips
+
+SUPPORTED_LANGUAGES = [
+    "Arabic", "Bengali", "Chinese (Simplified)", "Chinese (Traditional)",
+    "Dutch", "English", "French", "German", "Hindi", "Indonesian",
+    "Italian", "Japanese", "Korean", "Portuguese", "Russian",
+    "Spanish", "Swedish", "Thai", "Turkish", "Vietnamese"
+]
+
+LANGUAGE_CODES = {
+    "Arabic": "ar",
+    "Bengali": "bn",
+    "Chinese (Simplified)": "zh-CN",
+    "Chinese (Traditional)": "zh-TW",
+    "Dutch": "nl",
+    "English": "en",
+    "French": "fr",
+    "German": "de",
+    "Hindi": "hi",
+    "Indonesian": "id",
+    "Italian": "it",
+    "Japanese": "ja",
+    "Korean": "ko",
+    "Portuguese": "pt",
+    "Russian": "ru",
+    "Spanish": "es",
+    "Swedish": "sv",
+    "Thai": "th",
+    "Turkish": "tr",
+    "Vietnamese": "vi"
+}
+
+# Common patterns where strings.xml files are typically located
+COMMON_PATTERNS = [
+    # Mifos KMP specific patterns - prioritize these
+    "feature/*/src/commonMain/composeResources/values/strings.xml",
+    "feature/*/src/*/composeResources/values/strings.xml",
+    "feature/*/src/*/resources/values/strings.xml",
+
+    # KMM/Compose Multiplatform patterns
+    "*/src/commonMain/composeResources/values/strings.xml",
+    "*/*/src/commonMain/composeResources/values/strings.xml",
+    "*/src/commonMain/resources/MR/base/strings.xml",
+    "*/*/src/commonMain/resources/MR/base/strings.xml",
+
+    # Android module patterns
+    "*/src/main/res/values/strings.xml",
+    "*/*/src/main/res/values/strings.xml",
+    "feature/*/src/main/res/values/strings.xml",
+
+    # General fallbacks
+    "**/values/strings.xml",
+    "**/values-*/strings.xml"
+]
+
+# Seconds to wait for a repository archive, when indexing where strings are used
+ARCHIVE_TIMEOUT = 120
+
+BATCH_SIZE = 50
+MAX_RETRIES = 3
+# Seconds to wait before retrying a failed batch, and between batches to avoid rate limiting
+RETRY_DELAY = 2
+BATCH_DELAY = 1
+# Seconds a single model call may take before it is abandoned and retried
+CALL_TIMEOUT = 300
+# Input size, in estimated tokens, that is split into batches
+SINGLE_CALL_TOKEN_LIMIT = 10000000
+# Translations run a little longer than their source text on average
+TRANSLATION_EXPANSION = 1.3
+
+# Errors that stop a run instead of being retried or falling back to the source text
+STOP_ERRORS = (BudgetExceeded, TranslationCancelled)
+
+TRANSLATION_PROMPT = """
+Translate the following UI strings to {target_language}.
+
+Each item includes:
+- id: A unique identifier
+- key: The string identifier
+- text: The text to translate
+- context: (Optional) Where/how this string is used in the UI
+
+Guidelines:
+- Keep translations concise and natural
+- Use everyday language, not formal or complex terms
+- Maintain the same meaning and intent as the original
+- Don't add extra words or explanations
+- Ensure translations would fit well on buttons or UI elements
+- {placeholder_instruction}
+- Preserve formatting and special characters
+- DO NOT include any comments in the JSON output
+- DO NOT use comment lines with // or /* */ in your response
+{glossary}
+Input:
+{items}
+
+Return ONLY a valid JSON array with the same structure as input, but add a "translation" field to each item.
+Don't include any explanations, comments, or additional text outside or inside the JSON array.
+"""
+
+SINGLE_TRANSLATION_PROMPT = """
+Translate the following UI string to {target_language}:
+
+Original text: "{text}"
+
+Context: {context}
+
+Guidelines:
+- Keep the translation concise and natural
+- Use everyday language, not formal or complex terms
+- Maintain the same meaning and intent as the original
+- Don't add extra words or explanations
+- Ensure the translation would fit well on a button or UI element
+- {placeholder_instruction}
+{glossary}
+Return ONLY the translated text without any explanations or additional comments.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class Reporter:
+    """
+    Receives status messages and progress from the pipeline.
+
+    The base class ignores everything; subclass it and override what you need.
+    Methods may be called from worker threads when work runs concurrently.
+    """
+
+    def info(self, message):
+        pass
+
+    def success(self, message):
+        pass
+
+    def warning(self, message):
+        pass
+
+    def error(self, message):
+        pass
+
+    def detail(self, message):
+        """A low-priority message, such as each file a scan visits."""
+
+    def progress(self, done, total, message=None):
+        """
+        Report progress of the current step.
+
+        Args:
+            done (int): Units of work finished; 0 starts a new step
+            total (int): Units of work in the step
+            message (str): Optional description of what is happening now
+        """
+
+    @contextlib.contextmanager
+    def stage(self, message):
+        """Wrap a long-running step."""
+        yield
+
+
+NULL_REPORTER = Reporter()
+
+
+class LoggingReporter(Reporter):
+    """Report through the logging module, for headless runs."""
+
+    def __init__(self, log=logger, verbose=False):
+        self.log = log
+        self.verbose = verbose
+
+    def info(self, message):
+        self.log.info(message)
+
+    def success(self, message):
+        self.log.info(message)
+
+    def warning(self, message):
+        self.log.warning(message)
+
+    def error(self, message):
+        self.log.error(message)
+
+    def detail(self, message):
+        if self.verbose:
+            self.log.info(message)
+        else:
+            self.log.debug(message)
+
+    def progress(self, done, total, message=None):
+        if message:
+            self.log.info(f"{message} [{done}/{total}]")
+
+    @contextlib.contextmanager
+    def stage(self, message):
+        self.log.info(message)
+        yield
+
+
+def github_client(token):
+    """
+    Create an authenticated PyGithub client.
+
+    Args:
+        token (str): A GitHub token
+
+    Returns:
+        github.Github: The client
+    """
+    import github
+    return github.Github(auth=github.Auth.Token(token))
+
+
+def language_name(lang_code):
+    """Return the display name of a language code, or the code itself if it isn't listed."""
+    for name, code in LANGUAGE_CODES.items():
+        if code.lower() == lang_code.lower():
+            return name
+    return lang_code
+
+
+def parse_repo_url(repo_url):
+    """
+    Split a GitHub repository URL into owner, repository name and branch.
+
+    Args:
+        repo_url (str): The GitHub repository URL (can include /tree/branch-name)
+
+    Returns:
+        tuple: (owner, repo_name, branch), where branch is None if not specified
+    """
+    # Extract branch if specified in the URL
+    branch = None
+    if "/tree/" in repo_url:
+        # Split the URL at /tree/ to separate branch name
+        base_url, branch_part = repo_url.split("/tree/", 1)
+        # Get the branch name (it might have additional path components)
+        branch = branch_part.split("/")[0]
+        # Reconstruct the base repo URL without the branch part
+        repo_url = base_url
+
+    # Extract owner and repo name from URL
+    url_parts = repo_url.strip('/').split('/')
+    return url_parts[-2], url_parts[-1], branch
+
+
+def scan_repository(client, repo_url, pattern_search=True, cache=None, use_cache=True, reporter=NULL_REPORTER, metrics=NULL_METRICS):
+    """
+    Scan a GitHub repository for strings.xml files.
+
+    Common module layouts are searched first; the whole tree is only walked
+    when they find nothing or pattern_search is off. Results can be cached by
+    the scanned commit.
+
+    Args:
+        client: A PyGithub client
+        repo_url (str): The GitHub repository URL (can include /tree/branch-name)
+        pattern_search (bool): Whether to use pattern-based search
+        cache: Optional cache with get/set, keyed by (repository, commit SHA, pattern_search)
+        use_cache (bool): Whether to reuse a cached scan; a fresh scan is stored either way
+        reporter (Reporter): Receives status and progress
+        metrics (RunMetrics): Receives the scan and fetch spans
+
+    Returns:
+        dict: A dictionary mapping file paths to their content
+    """
+    with metrics.span("scan"):
+        return _scan_repository(client, repo_url, pattern_search, cache, use_cache, reporter, metrics)
+
+
+def _scan_repository(client, repo_url, pattern_search, cache, use_cache, reporter, metrics):
+    try:
+        owner, repo_name, branch = parse_repo_url(repo_url)
+        metrics.count("github_calls")
+        repo = client.get_repo(f"{owner}/{repo_name}")
+
+        # If branch was specified in the URL, use it
+        if branch:
+            reporter.info(f"Scanning branch: {branch}")
+            # Verify the branch exists
+            try:
+                branch_ref = repo.get_branch(branch)
+            except Exception as e:
+                reporter.error(f"Branch '{branch}' not found. Error: {str(e)}")
+                return {}
+        else:
+            # Otherwise use the default branch
+            branch = repo.default_branch
+            branch_ref = repo.get_branch(branch)
+            reporter.info(f"Using default branch: {branch}")
+
+        cache_key = (repo.full_name, branch_ref.commit.sha, pattern_search)
+        if cache is not None and use_cache:
+            cached_files = cache.get(cache_key)
+            if cached_files is not None:
+                reporter.info(f"Using cached scan of {branch} at {branch_ref.commit.sha[:7]}")
+                return dict(cached_files)
+
+        found_files = {}
+
+        # If pattern search is enabled, search for common patterns first
+        if pattern_search:
+            with reporter.stage(f"Searching for strings.xml files using common patterns in branch '{branch}'..."):
+                reporter.progress(0, len(COMMON_PATTERNS))
+                for i, pattern in enumerate(COMMON_PATTERNS):
+                    try:
+                        reporter.progress(i + 1, len(COMMON_PATTERNS))
+                        reporter.detail(f"Trying pattern: {pattern}")
+
+                        # Search for files matching the pattern
+                        contents = fetch_contents(repo, "", branch, metrics)
+                        files = search_by_pattern(repo, contents, pattern.split("/"), 0, branch, reporter, metrics)
+
+                        if files:
+                            reporter.detail(f"Found {len(files)} files with pattern: {pattern}")
+                        found_files.update(files)
+                    except Exception as e:
+                        # Continue with next pattern if an error occurs
+                        reporter.detail(f"Error with pattern {pattern}: {str(e)}")
+                        continue
+
+            # If we found files, return them without doing a full repository scan
+            if found_files:
+                if cache is not None:
+                    cache.set(cache_key, dict(found_files))
+                return found_files
+
+        # If no files were found with pattern search or pattern search is disabled,
+        # fall back to full repository scan (slower but thorough)
+        reporter.info("Pattern search didn't find strings.xml files. Performing a full repository scan (this may take longer)...")
+        found_files = search_files_in_repo(repo, "strings.xml", branch, reporter, metrics)
+        if found_files and cache is not None:
+            cache.set(cache_key, dict(found_files))
+        return found_files
+
+    except Exception as e:
+        reporter.error(f"Error scanning repository: {str(e)}")
+        return {}
+
+
+def fetch_contents(repo, path, branch, metrics=NULL_METRICS):
+    """List a repository directory, timed as a fetch."""
+    metrics.count("github_calls")
+    with metrics.span("fetch"):
+        return repo.get_contents(path, ref=branch)
+
+
+def search_by_pattern(repo, contents, pattern_parts, current_depth, branch, reporter=NULL_REPORTER, metrics=NULL_METRICS):
+    """
+    Recursively search for files that match a pattern.
+
+    Args:
+        repo: GitHub repository object
+        contents: Current contents to search through
+        pattern_parts: List of parts in the pattern path
+        current_depth: Current depth in the pattern
+        branch: Branch to search in
+        reporter (Reporter): Receives the files visited
+        metrics (RunMetrics): Receives the fetch spans
+
+    Returns:
+        dict: A dictionary mapping file paths to their content
+    """
+    found_files = {}
+
+    if current_depth >= len(pattern_parts):
+        return found_files
+
+    current_pattern = pattern_parts[current_depth]
+
+    for content_item in contents:
+        # Skip non-matching items unless it's a wildcard
+        if current_pattern != "*" and current_pattern != "**" and content_item.name != current_pattern:
+            continue
+
+        if content_item.type == "dir":
+            # If it's a directory and matches the pattern (or pattern is a wildcard)
+            try:
+                next_contents = fetch_contents(repo, content_item.path, branch, metrics)
+
+                # If the pattern is "**", we need to search at this level AND deeper
+                if current_pattern == "**":
+                    # Search at this level with the next pattern part
+                    found_files.update(search_by_pattern(repo, next_contents, pattern_parts, current_depth + 1, branch, reporter, metrics))
+                    # Also search at this same level for more directories
+                    found_files.update(search_by_pattern(repo, next_contents, pattern_parts, current_depth, branch, reporter, metrics))
+                else:
+                    # Regular directory match, go one level deeper in the pattern
+                    found_files.update(search_by_pattern(repo, next_contents, pattern_parts, current_depth + 1, branch, reporter, metrics))
+            except Exception as e:
+                # Skip if we can't access the directory content
+                reporter.detail(f"Error accessing directory {content_item.path}: {str(e)}")
+                continue
+
+        elif content_item.type == "file" and current_depth == len(pattern_parts) - 1:
+            # If it's a file and the last pattern part matches the filename
+            if content_item.name == pattern_parts[-1] or pattern_parts[-1] == "*":
+                try:
+                    found_files[content_item.path] = base64.b64decode(content_item.content).decode('utf-8')
+                    reporter.detail(f"Found matching file: {content_item.path}")
+                except Exception as e:
+                    # Skip if we can't decode the content
+                    reporter.detail(f"Error decoding content of {content_item.path}: {str(e)}")
+                    continue
+
+    return found_files
+
+
+def search_files_in_repo(repo, filename, branch, reporter=NULL_REPORTER, metrics=NULL_METRICS):
+    """
+    Search for files in a repository with a specific filename.
+
+    Args:
+        repo: GitHub repository object
+        filename (str): The filename to search for
+        branch (str): Branch to search in
+        reporter (Reporter): Receives status and progress
+        metrics (RunMetrics): Receives the fetch spans
+
+    Returns:
+        dict: A dictionary mapping file paths to their content
+    """
+    found_files = {}
+
+    # Get all files in the repository
+    contents = fetch_contents(repo, "", branch, metrics)
+
+    with reporter.stage(f"Scanning repository for {filename} files in branch '{branch}'..."):
+        total_files = len(contents)
+        processed = 0
+        reporter.progress(0, total_files)
+
+        while contents:
+            file_content = contents.pop(0)
+            processed += 1
+            reporter.progress(processed, max(processed, total_files))
+
+            if file_content.type == "dir":
+                try:
+                    # Add directory contents to the queue
+                    dir_contents = fetch_contents(repo, file_content.path, branch, metrics)
+                    contents.extend(dir_contents)
+                    total_files += len(dir_contents) - 1  # Adjust total count
+                except Exception as e:
+                    # Skip if we can't access the directory
+                    reporter.detail(f"Error accessing directory {file_content.path}: {str(e)}")
+                    continue
+            elif file_content.name == filename:
+                # Found a strings.xml file
+                try:
+                    found_files[file_content.path] = base64.b64decode(file_content.content).decode('utf-8')
+                    reporter.detail(f"Found file: {file_content.path}")
+                except Exception as e:
+                    # Skip if we can't decode the content
+                    reporter.detail(f"Error decoding content of {file_content.path}: {str(e)}")
+                    continue
+
+    return found_files
+
+
+def index_repository_contexts(client, repo_url, keys=None, cache=None, use_cache=True, reporter=NULL_REPORTER, metrics=NULL_METRICS):
+    """
+    Find where string keys are used in a repository's Kotlin and Java sources.
+
+    The repository is downloaded once as a ZIP archive of the scanned commit,
+    instead of fetching every source file through the contents API, and the
+    Res.string.<key> / R.string.<key> references in it are described by
+    translate_tool.context_index. Indexing is best effort: on any error the
+    strings are simply translated without context.
+
+    Args:
+        client: A PyGithub client
+        repo_url (str): The GitHub repository URL (can include /tree/branch-name)
+        keys: Optional keys to return contexts for; all referenced keys by default
+        cache: Optional cache with get/set, keyed by (repository, commit SHA, "contexts")
+        use_cache (bool): Whether to reuse a cached index; a fresh index is stored either way
+        reporter (Reporter): Receives status
+        metrics (RunMetrics): Receives the context_index span
+
+    Returns:
+        dict: Key to a short description of where it is used
+    """
+    with metrics.span("context_index"):
+        try:
+            owner, repo_name, branch = parse_repo_url(repo_url)
+            metrics.count("github_calls", 2)
+            repo = client.get_repo(f"{owner}/{repo_name}")
+            commit_sha = repo.get_branch(branch or repo.default_branch).commit.sha
+
+            cache_key = (repo.full_name, commit_sha, "contexts")
+            contexts = cache.get(cache_key) if cache is not None and use_cache else None
+            if contexts is None:
+                with reporter.stage("Indexing where strings are used in Kotlin and Java sources..."):
+                    index = ContextIndex()
+                    with download_archive(repo, commit_sha, metrics) as archive:
+                        index.add_archive(archive)
+                contexts = index.contexts()
+                reporter.detail(f"Indexed {index.files_indexed} source files at {commit_sha[:7]}")
+                if cache is not None:
+                    cache.set(cache_key, contexts)
+        except Exception as e:
+            reporter.warning(f"Couldn't index where strings are used, translating without code context: {str(e)}")
+            return {}
+
+    if keys is not None:
+        contexts = {key: contexts[key] for key in keys if key in contexts}
+    reporter.info(f"Found usage context for {len(contexts)} strings.")
+    return dict(contexts)
+
+
+def download_archive(repo, ref, metrics=NULL_METRICS):
+    """
+    Download a ZIP archive of a repository at a commit into a temporary file.
+
+    Returns:
+        file: The archive, positioned at the start; it is deleted when closed
+    """
+    # Imported here, like the clients, to keep importing the package fast
+    import urllib.request
+
+    metrics.count("github_calls")
+    with metrics.span("fetch"):
+        url = repo.get_archive_link("zipball", ref)
+        archive = tempfile.TemporaryFile()
+        try:
+            with urllib.request.urlopen(url, timeout=ARCHIVE_TIMEOUT) as response:
+                shutil.copyfileobj(response, archive)
+        except Exception:
+            archive.close()
+            raise
+    archive.seek(0)
+    return archive
+
+
+def parse_translation_response(response_text, reporter=NULL_REPORTER):
+    """
+    Parse the translation response with improved error handling for common issues.
+
+    Args:
+        response_text (str): The raw text response from the API
+        reporter (Reporter): Receives parse errors
+
+    Returns:
+        dict: A dictionary of key-value pairs with translations, or empty dict if parsing fails
+    """
+    try:
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].strip()
+
+        response_text = re.sub(r'\s*//.*', '', response_text)
+        response_text = re.sub(r'/\*.*?\*/', '', response_text, flags=re.DOTALL)
+
+        response_text = re.sub(r',\s*}', '}', response_text)
+        response_text = re.sub(r',\s*\]', ']', response_text)
+
+        response_text = re.sub(r'([{,]\s*)([a-zA-Z0-9_]+)(\s*:)', r'\1"\2"\3', response_text)
+
+        response_text = re.sub(r'}\s*{', '},{', response_text)
+
+        translations_data = json.loads(response_text)
+
+        # Process translations
+        all_results = {}
+
+        # Handle both array and object formats
+        if isinstance(translations_data, list):
+            for item in translations_data:
+                key = item.get("key")
+                translation = item.get("translation")
+                if key and translation:
+                    all_results[key] = translation
+        elif isinstance(translations_data, dict):
+            for key, item in translations_data.items():
+                if isinstance(item, dict) and "translation" in item:
+                    all_results[key] = item["translation"]
+                else:
+                    all_results[key] = item
+
+        return all_results
+
+    except json.JSONDecodeError as json_err:
+        reporter.warning(f"JSON error: {str(json_err)}")
+        reporter.detail(response_text[:200] + "..." if len(response_text) > 200 else response_text)
+
+        # Try extracting individual JSON objects
+        pattern = r'{[^{}]*"key"\s*:\s*"([^"]+)"[^{}]*"translation"\s*:\s*"([^"]+)"[^{}]*}'
+        matches = re.finditer(pattern, response_text)
+
+        translations = {}
+        for match in matches:
+            try:
+                obj_text = match.group(0)
+                # Fix potential issues within the object
+                obj_text = re.sub(r',\s*}', '}', obj_text)
+                obj = json.loads(obj_text)
+                if "key" in obj and "translation" in obj:
+                    translations[obj["key"]] = obj["translation"]
+            except:
+                key_match = re.search(r'"key"\s*:\s*"([^"]+)"', match.group(0))
+                translation_match = re.search(r'"translation"\s*:\s*"([^"]+)"', match.group(0))
+                if key_match and translation_match:
+                    translations[key_match.group(1)] = translation_match.group(1)
+
+        if translations:
+            return translations
+
+        pattern = r'"key"\s*:\s*"([^"]+)"[^}]+"translation"\s*:\s*"([^"]+)"'
+        matches = re.finditer(pattern, response_text)
+
+        translations = {}
+        for match in matches:
+            translations[match.group(1)] = match.group(2)
+
+        return translations
+
+
+def build_translation_prompt(texts_dict, target_language, contexts_dict=None, glossary_entries=None):
+    """
+    Build the prompt that asks the model to translate a batch of strings.
+
+    Args:
+        texts_dict (dict): String keys and (masked) source texts
+        target_language (str): The target language name
+        contexts_dict (dict): Optional contexts for each key
+        glossary_entries (dict): Glossary terms found in the batch, to their required translations
+
+    Returns:
+        str: The prompt
+    """
+    return TRANSLATION_PROMPT.format(
+        target_language=target_language,
+        placeholder_instruction=PLACEHOLDER_PROMPT_INSTRUCTION,
+        glossary=glossary_section(glossary_entries),
+        items=json.dumps(_translation_items(texts_dict, contexts_dict), ensure_ascii=False, indent=2)
+    )
+
+
+def glossary_section(glossary_entries):
+    """Return the glossary part of a prompt, or nothing when no glossary terms apply."""
+    if not glossary_entries:
+        return ""
+    return f"""
+Glossary - always translate these terms exactly like this:
+{format_glossary(glossary_entries)}
+"""
+
+
+def _translation_items(texts_dict, contexts_dict=None):
+    contexts_dict = contexts_dict or {}
+    return [
+        {"id": key, "key": key, "text": text, "context": contexts_dict.get(key, "")}
+        for key, text in texts_dict.items()
+    ]
+
+
+def estimate_response_tokens(texts_dict, contexts_dict=None):
+    """
+    Estimate the tokens of the model's answer to a batch prompt.
+
+    The answer echoes every item back with a "translation" field added.
+    """
+    items = json.dumps(_translation_items(texts_dict, contexts_dict), ensure_ascii=False)
+    translations = sum(len(text) for text in texts_dict.values()) * TRANSLATION_EXPANSION
+    fields = len(texts_dict) * len(', "translation": ""')
+    return round((len(items) + translations + fields) / CHARS_PER_TOKEN)
+
+
+class Translator:
+    """
+    Translates strings with a model backend.
+
+    Strings that must not be translated are passed through, placeholders are
+    masked before the model sees them and validated afterwards, and strings
+    that fail validation are retried on their own. With a glossary, each
+    prompt carries the entries whose terms occur in it, and translations that
+    don't use them are retried the same way.
+
+    Args:
+        reporter (Reporter): Receives status and progress
+        backend: The model backend; defaults to a GeminiBackend
+        translation_memory: Optional TranslationMemory shared between runs
+        batch_size (int): Strings per prompt in batch mode
+        concurrency (int): Batches sent to the model at once
+        batch_delay (float): Seconds to wait between batches
+        retry_delay (float): Seconds to wait before retrying a failed batch
+        metrics (RunMetrics): Receives timing spans and counters
+        budget (TokenBudget): Records token usage and stops the run when it would exceed
+            its limits; defaults to an unlimited budget
+        call_timeout (float): Seconds a model call may take before it is abandoned and
+            retried; None waits indefinitely
+        hedge (bool): Send a duplicate of calls that take longer than the model's recent
+            p95 latency, and use whichever answer arrives first
+        fallback_backend: Backend of a fallback model tier, used while the primary's circuit is open
+        breaker (CircuitBreaker): Circuit of the primary backend; pass one to share it between translators
+        fallback_breaker (CircuitBreaker): Circuit of the fallback backend
+        glossary (Glossary): Terms whose translations are enforced
+    """
+
+    def __init__(self, reporter=NULL_REPORTER, backend=None, translation_memory=None, batch_size=BATCH_SIZE,
+                 concurrency=1, batch_delay=BATCH_DELAY, retry_delay=RETRY_DELAY, metrics=NULL_METRICS, budget=None,
+                 call_timeout=CALL_TIMEOUT, hedge=False, fallback_backend=None, breaker=None, fallback_breaker=None,
+                 glossary=None):
+        self.reporter = reporter
+        self.metrics = metrics
+        self.budget = budget or TokenBudget(warn=reporter.warning)
+        self.call_timeout = call_timeout
+        self.hedge = hedge
+        self.latency = LatencyTracker()
+        self._cancelled = threading.Event()
+        self.backend = backend or GeminiBackend(timeout=call_timeout)
+        self.translation_memory = translation_memory
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.batch_delay = batch_delay
+        self.retry_delay = retry_delay
+        self.breaker = breaker or CircuitBreaker(self.backend.batch_model)
+        self.fallback_backend = fallback_backend
+        self.fallback_breaker = None
+        if fallback_backend is not None:
+            self.fallback_breaker = fallback_breaker or CircuitBreaker(fallback_backend.batch_model)
+        self._routed_to = self.backend
+        self.glossary = glossary
+
+    def cancel(self):
+        """Stop the run: calls in flight are abandoned and no new ones are sent."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def generate(self, prompt, model=None, language=None, expected_output_tokens=None):
+        """
+        Send a prompt to the backend and return the response text.
+
+        The call is abandoned after call_timeout seconds, and hedged if hedging
+        is on. Each attempt is reserved against the budget first, and its usage
+        is recorded as reported by the backend, or estimated from the text lengths.
+        An abandoned call gives its reservations back at once, and only the
+        call's outcome, not that of each attempt, is recorded on the breaker.
+
+        Args:
+            prompt (str): The prompt
+            model (str): The model; defaults to the backend's batch model
+            language (str): The target language the usage is recorded under
+            expected_output_tokens (int): Output tokens to reserve; defaults to the prompt's size
+
+        Raises:
+            BudgetExceeded: If the call would take the run over its budget
+            ModelTimeout: If the model didn't answer within call_timeout
+            TranslationCancelled: If the run was cancelled
+            CircuitOpen: If neither the primary nor the fallback tier is available
+        """
+        if self.cancelled:
+            raise TranslationCancelled("The run was cancelled.")
+        backend, model, breaker, permit = self._route(model or self.backend.batch_model)
+        # Hedging is driven by how long callers wait for an answer, not by abandoned attempts
+        started = time.perf_counter()
+        reservations = ReservationGroup(self.budget)
+
+        def attempt():
+            return self._attempt(prompt, backend, model, language, expected_output_tokens, reservations)
+
+        def on_hedge():
+            self.metrics.count("hedged_requests", model=model)
+
+        # The outcome is recorded here, once per call, so attempts abandoned by the deadline or
+        # a hedge never reach the breaker
+        try:
+            if self.call_timeout is None and not self.hedge:
+                response_text, winner = attempt(), 0
+            else:
+                response_text, winner = call_with_deadline(
+                    attempt,
+                    self.call_timeout,
+                    self.latency.hedge_delay(model) if self.hedge else None,
+                    self._cancelled,
+                    on_hedge
+                )
+        except STOP_ERRORS:
+            reservations.release()
+            breaker.release(permit)
+            raise
+        except ModelTimeout:
+            # Attempts still running settle their usage when they end, but stop holding budget now
+            reservations.release()
+            self.metrics.count("timeouts", model=model)
+            breaker.record_failure(permit)
+            raise
+        except Exception:
+            breaker.record_failure(permit)
+            raise
+        breaker.record_success(permit)
+        self.latency.observe(model, time.perf_counter() - started)
+        if winner:
+            self.metrics.count("hedge_wins", model=model)
+        return response_text
+
+    def _route(self, model):
+        """
+        Pick the tier for a call: the primary backend, or the fallback tier while the primary's circuit is open.
+
+        A half-open primary takes the call as its trial.
+
+        Returns:
+            tuple: (backend, model, breaker, permit of the breaker)
+
+        Raises:
+            CircuitOpen: If no tier is available
+        """
+        permit = self.breaker.acquire()
+        if permit is not None:
+            backend, breaker = self.backend, self.breaker
+        else:
+            if self.fallback_backend is not None:
+                permit = self.fallback_breaker.acquire()
+            if permit is None:
+                self.metrics.count("circuit_rejections")
+                tiers = "and its fallback tier are" if self.fallback_backend is not None else "is"
+                raise CircuitOpen(f"{self.backend.batch_model} {tiers} failing; not sending requests until a trial call succeeds.")
+            backend, breaker = self.fallback_backend, self.fallback_breaker
+            model = backend.single_model if model == self.backend.single_model else backend.batch_model
+            self.metrics.count("fallback_tier_calls", model=model)
+
+        # A trial call of the primary doesn't mean it has recovered yet
+        if backend is not self._routed_to and not (permit.trial and backend is self.backend):
+            self._routed_to = backend
+            if backend is self.fallback_backend:
+                self.reporter.warning(f"{self.backend.batch_model} is failing. Sending requests to {backend.batch_model} until it recovers.")
+            else:
+                self.reporter.info(f"{self.backend.batch_model} recovered. Sending requests to it again.")
+        return backend, model, breaker, permit
+
+    def _attempt(self, prompt, backend, model, language, expected_output_tokens, reservations):
+        """Make one model call, recording its latency, usage and budget."""
+        prompt_tokens = estimate_tokens(prompt)
+        if expected_output_tokens is None:
+            expected_output_tokens = prompt_tokens
+        reservation = self.budget.reserve(prompt_tokens, expected_output_tokens, model)
+        if not reservations.add(reservation):
+            # The call was given up while this attempt waited for budget
+            raise ModelTimeout("The call was abandoned before it was sent.")
+        self.metrics.count("model_calls", model=model)
+        response_text, usage = "", None
+        try:
+            with self.metrics.span("model_call", model=model):
+                if hasattr(backend, "generate_with_usage"):
+                    response_text, usage = backend.generate_with_usage(prompt, model)
+                else:
+                    response_text = backend.generate(prompt, model)
+        finally:
+            # Failed calls are recorded too, with their estimated prompt size
+            estimated = usage is None
+            if estimated:
+                usage = {"prompt_tokens": prompt_tokens, "output_tokens": estimate_tokens(response_text)}
+            self.budget.settle(reservation, model, usage["prompt_tokens"], usage["output_tokens"], language, estimated)
+            self.metrics.count("prompt_tokens", usage["prompt_tokens"], model=model)
+            self.metrics.count("output_tokens", usage["output_tokens"], model=model)
+        return response_text
+
+    def _sleep(self, seconds, stage):
+        """Wait before a retry or between batches, timed as its own stage."""
+        if seconds:
+            with self.metrics.span(stage):
+                if self._cancelled.wait(seconds):
+                    raise TranslationCancelled("The run was cancelled.")
+
+    def _parse_response(self, response_text, fragments_by_key, sources):
+        """
+        Parse a batch response and restore its placeholders.
+
+        Returns:
+            dict: The translations that passed validation, or None if nothing could be parsed
+        """
+        with self.metrics.span("response_parse"):
+            translations = parse_translation_response(response_text, self.reporter)
+            if not translations:
+                return None
+            valid, failed = restore_translations(translations, fragments_by_key, sources)
+        if failed:
+            self.metrics.count("validation_failures", len(failed))
+        self.metrics.count("strings_translated", len(valid))
+        return valid
+
+    def _glossary_entries(self, sources, target_language):
+        """Return the glossary entries whose terms occur in some source texts, for their prompt."""
+        if not self.glossary:
+            return None
+        return self.glossary.batch_entries(sources.values(), LANGUAGE_CODES.get(target_language, target_language))
+
+    def _glossary_violations(self, translations, sources, target_language):
+        """Return the keys whose translation doesn't use the required translation of a glossary term."""
+        if not self.glossary:
+            return []
+        language = LANGUAGE_CODES.get(target_language, target_language)
+        keys = [
+            key for key, translation in translations.items()
+            if key in sources and self.glossary.violations(sources[key], translation, language)
+        ]
+        if keys:
+            self.metrics.count("glossary_violations", len(keys))
+        return keys
+
+    def filter_untranslatable(self, texts_dict, skip_keys=()):
+        """
+        Split off strings that must not be sent to the model.
+
+        translatable="false" keys, URLs, numbers and placeholder-only strings are
+        returned unchanged instead of being translated.
+
+        Returns:
+            tuple: (dict of strings to translate, dict of strings passed through)
+        """
+        string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
+        to_translate, passthrough, reasons = split_translatable(string_contents, skip_keys)
+        if reasons:
+            summary = ", ".join(f"{count} {reason}" for reason, count in summarize_skips(reasons).items())
+            self.reporter.info(f"Passing through {len(passthrough)} untranslatable strings ({summary}).")
+        return to_translate, passthrough
+
+    def estimate_usage(self, texts_dict, target_language, contexts_dict={}, skip_keys=()):
+        """
+        Estimate the tokens and cost of translate_all_strings without calling the model.
+
+        Strings that would be passed through or found in the translation memory
+        cost nothing; retries are not included.
+
+        Returns:
+            dict: "strings", "calls", "prompt_tokens", "output_tokens" and "cost_usd"
+        """
+        string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
+        pending, _, _ = split_translatable(string_contents, skip_keys)
+        if self.translation_memory is not None:
+            _, pending = self.translation_memory.lookup(pending, target_language, contexts_dict)
+        if not pending:
+            return {"strings": 0, "calls": 0, "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+
+        masked_contents, _ = mask_strings(pending)
+        prompts = [build_translation_prompt(
+            masked_contents, target_language, contexts_dict, self._glossary_entries(pending, target_language)
+        )]
+        if estimate_tokens(prompts[0]) > SINGLE_CALL_TOKEN_LIMIT:
+            texts_list = list(masked_contents.items())
+            batches = [dict(texts_list[i:i + self.batch_size]) for i in range(0, len(texts_list), self.batch_size)]
+            prompts = [
+                build_translation_prompt(
+                    batch, target_language, contexts_dict, self._glossary_entries({key: pending[key] for key in batch}, target_language)
+                )
+                for batch in batches
+            ]
+        prompt_tokens = sum(estimate_tokens(prompt) for prompt in prompts)
+        output_tokens = estimate_response_tokens(masked_contents, contexts_dict)
+        return {
+            "strings": len(pending),
+            "calls": len(prompts),
+            "prompt_tokens": prompt_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": token_cost(self.backend.batch_model, prompt_tokens, output_tokens, self.budget.ledger.prices)
+        }
+
+    def translate_all_strings(self, texts_dict, target_language, contexts_dict={}, skip_keys=()):
+        """
+        Translate a dictionary of strings, reusing the translation memory.
+
+        Untranslatable strings are passed through unchanged, and only strings
+        that were not translated before are sent to the model.
+
+        Args:
+            texts_dict (dict): A dictionary of string keys and source texts
+            target_language (str): The target language name
+            contexts_dict (dict): Optional contexts for each key
+            skip_keys (set): Keys marked translatable="false"
+
+        Returns:
+            dict: A dictionary of string keys and translations
+        """
+        string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
+        to_translate, passthrough = self.filter_untranslatable(string_contents, skip_keys)
+
+        cached, pending = {}, to_translate
+        if self.translation_memory is not None:
+            cached, pending = self.translation_memory.lookup(to_translate, target_language, contexts_dict)
+            # Translations remembered before the glossary changed are translated again
+            for key in self._glossary_violations(cached, to_translate, target_language):
+                pending[key] = to_translate[key]
+                del cached[key]
+        if cached:
+            self.reporter.info(f"Reused {len(cached)} translations from translation memory.")
+
+        translations = {}
+        if pending:
+            translations = self.translate_strings_with_model(pending, target_language, contexts_dict)
+            if self.translation_memory is not None:
+                self.translation_memory.remember(pending, translations, target_language, contexts_dict)
+
+        results = {}
+        for key in string_contents:
+            if key in passthrough:
+                results[key] = passthrough[key]
+            elif key in cached:
+                results[key] = cached[key]
+            elif key in translations:
+                results[key] = translations[key]
+        return results
+
+    def translate_strings_with_model(self, texts_dict, target_language, contexts_dict={}):
+        """
+        Translate strings in a single model call, falling back to batches.
+
+        Args:
+            texts_dict (dict): A dictionary of string keys and source texts
+            target_language (str): The target language name
+            contexts_dict (dict): Optional contexts for each key
+
+        Returns:
+            dict: A dictionary of string keys and translations
+        """
+        # Filter only string values
+        string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
+        try:
+            # Swap placeholders and markup for opaque tokens the model can't mangle
+            with self.metrics.span("batch_build"):
+                masked_contents, fragments_by_key = mask_strings(string_contents)
+                prompt = build_translation_prompt(
+                    masked_contents, target_language, contexts_dict, self._glossary_entries(string_contents, target_language)
+                )
+
+            if estimate_tokens(prompt) > SINGLE_CALL_TOKEN_LIMIT:
+                self.reporter.info("Input is too large for a single API call. Switching to batch mode...")
+                return self.batch_translate_texts(string_contents, target_language, contexts_dict)
+
+            response_text = self.generate(
+                prompt, language=target_language, expected_output_tokens=estimate_response_tokens(masked_contents, contexts_dict)
+            )
+            valid = self._parse_response(response_text, fragments_by_key, string_contents)
+
+            if valid is not None:
+                failed_keys = [key for key in string_contents if key not in valid]
+                noncompliant_keys = self._glossary_violations(valid, string_contents, target_language)
+                if failed_keys:
+                    self.reporter.warning(f"{len(failed_keys)} translations failed placeholder validation. Retrying only those strings...")
+                if noncompliant_keys:
+                    self.reporter.warning(f"{len(noncompliant_keys)} translations don't follow the glossary. Retrying only those strings...")
+                if failed_keys or noncompliant_keys:
+                    # Only the keys that lost placeholders, went missing or ignored the glossary are sent again
+                    retried = self.batch_translate_texts(
+                        {key: string_contents[key] for key in failed_keys + noncompliant_keys}, target_language, contexts_dict
+                    )
+                    self._merge_retried(valid, retried, string_contents)
+                return valid
+
+            # If parsing completely fails, fall back to batch translation
+            self.reporter.warning("Failed to parse response. Switching to batch mode...")
+            return self.batch_translate_texts(string_contents, target_language, contexts_dict)
+
+        except STOP_ERRORS:
+            raise
+        except CircuitOpen as e:
+            # Batch mode would only fail fast on every batch as well
+            self.reporter.error(f"Translation skipped: {str(e)}")
+            self.metrics.count("fallbacks_to_source", len(string_contents))
+            return dict(string_contents)
+        except Exception as e:
+            self.reporter.error(f"Translation error: {str(e)}")
+            # Fall back to batch translation
+            self.reporter.warning("Error in single API call. Switching to batch mode...")
+            return self.batch_translate_texts(string_contents, target_language, contexts_dict)
+
+    def _translate_batch(self, batch, batch_number, target_language, contexts_dict, fragments_by_key, sources):
+        """
+        Translate one batch of masked strings, retrying failed calls.
+
+        Returns:
+            tuple: (valid translations, sources that failed validation), or (None, None)
+                if the batch failed after all retries
+        """
+        batch_sources = {key: sources[key] for key, _ in batch}
+        with self.metrics.span("batch_build"):
+            prompt = build_translation_prompt(
+                dict(batch), target_language, contexts_dict, self._glossary_entries(batch_sources, target_language)
+            )
+            expected_output_tokens = estimate_response_tokens(dict(batch), contexts_dict)
+
+        for retry in range(MAX_RETRIES):
+            try:
+                response_text = self.generate(prompt, language=target_language, expected_output_tokens=expected_output_tokens)
+                valid = self._parse_response(response_text, fragments_by_key, batch_sources)
+                if valid is not None:
+                    failed = {key: text for key, text in batch_sources.items() if key not in valid}
+                    return valid, failed
+                if retry < MAX_RETRIES - 1:
+                    self.reporter.warning(f"Failed to parse batch {batch_number}. Retrying ({retry + 1}/{MAX_RETRIES})...")
+                    self.metrics.count("retries")
+                    self._sleep(self.retry_delay, "retry")
+                else:
+                    self.reporter.error(f"Failed to translate batch {batch_number} after {MAX_RETRIES} attempts. Skipping batch.")
+            except STOP_ERRORS:
+                raise
+            except CircuitOpen as e:
+                self.reporter.error(f"Skipping batch {batch_number}: {str(e)}")
+                break
+            except Exception as batch_error:
+                if retry < MAX_RETRIES - 1:
+                    self.reporter.warning(f"Error in batch {batch_number}: {str(batch_error)}. Retrying ({retry + 1}/{MAX_RETRIES})...")
+                    self.metrics.count("retries")
+                    self._sleep(self.retry_delay, "retry")
+                else:
+                    self.reporter.error(f"Failed to process batch {batch_number} after {MAX_RETRIES} attempts. Skipping batch.")
+        return None, None
+
+    @staticmethod
+    def _merge_retried(results, retried, sources):
+        """Merge retried translations, without replacing a translation with a retry that fell back to the source."""
+        for key, translation in retried.items():
+            if key in results and translation == sources.get(key):
+                continue
+            results[key] = translation
+
+    def batch_translate_texts(self, texts_dict, target_language, contexts_dict={}, skip_keys=(), validation_retries=VALIDATION_RETRIES):
+        """
+        Translate strings in batches of batch_size, concurrency batches at a time.
+
+        Batches that fail after all retries keep their source text. Strings that
+        fail placeholder validation or don't follow the glossary are retried
+        together once every batch is done.
+
+        Args:
+            texts_dict (dict): A dictionary of string keys and source texts
+            target_language (str): The target language name
+            contexts_dict (dict): Optional contexts for each key
+            skip_keys (set): Keys marked translatable="false"
+            validation_retries (int): Rounds of retries for strings that fail validation or the glossary
+
+        Returns:
+            dict: A dictionary of string keys and translations
+        """
+        try:
+            string_contents = {k: v for k, v in texts_dict.items() if isinstance(v, str)}
+            to_translate, passthrough = self.filter_untranslatable(string_contents, skip_keys)
+
+            with self.metrics.span("batch_build"):
+                masked_contents, fragments_by_key = mask_strings(to_translate)
+            texts_list = list(masked_contents.items())
+            batches = [texts_list[i:i + self.batch_size] for i in range(0, len(texts_list), self.batch_size)]
+            # Keys whose translation failed placeholder validation or ignored the glossary,
+            # retried once all batches are done
+            retry_queue = {}
+            glossary_queue = {}
+            all_results = dict(passthrough)
+
+            def collect(batch, result):
+                valid, failed = result
+                if valid is None:
+                    # Add batch keys with original values to show something rather than nothing
+                    self.metrics.count("fallbacks_to_source", len(batch))
+                    for key, _ in batch:
+                        all_results.setdefault(key, to_translate[key])
+                    return
+                all_results.update(valid)
+                retry_queue.update(failed)
+                glossary_queue.update({key: to_translate[key] for key in self._glossary_violations(valid, to_translate, target_language)})
+
+            total_batches = len(batches)
+            self.reporter.progress(0, total_batches)
+            if self.concurrency > 1 and total_batches > 1:
+                with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                    futures = {
+                        pool.submit(self._translate_batch, batch, number, target_language, contexts_dict, fragments_by_key, to_translate): batch
+                        for number, batch in enumerate(batches, 1)
+                    }
+                    try:
+                        for done, future in enumerate(as_completed(futures), 1):
+                            collect(futures[future], future.result())
+                            self.reporter.progress(done, total_batches, f"Translated {done} of {total_batches} batches")
+                    except STOP_ERRORS:
+                        # Batches that haven't started yet are dropped
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise
+            else:
+                for number, batch in enumerate(batches, 1):
+                    self.reporter.progress(number - 1, total_batches, f"Translating batch {number} of {total_batches} ({len(batch)} strings)")
+                    collect(batch, self._translate_batch(batch, number, target_language, contexts_dict, fragments_by_key, to_translate))
+                    self.reporter.progress(number, total_batches)
+                    # Small delay between batches to avoid rate limiting
+                    self._sleep(self.batch_delay, "sleep")
+
+            if retry_queue or glossary_queue:
+                if validation_retries > 0:
+                    if retry_queue:
+                        self.reporter.warning(f"{len(retry_queue)} translations failed placeholder validation. Retrying only those strings...")
+                    if glossary_queue:
+                        self.reporter.warning(f"{len(glossary_queue)} translations don't follow the glossary. Retrying only those strings...")
+                    retried = self.batch_translate_texts(
+                        dict(retry_queue, **glossary_queue), target_language, contexts_dict, validation_retries=validation_retries - 1
+                    )
+                    self._merge_retried(all_results, retried, to_translate)
+                else:
+                    if retry_queue:
+                        self.reporter.error(f"{len(retry_queue)} translations still failed placeholder validation. Keeping the original text for them.")
+                        self.metrics.count("fallbacks_to_source", len(retry_queue))
+                    if glossary_queue:
+                        self.reporter.warning(f"{len(glossary_queue)} translations still don't follow the glossary. Keeping them for review.")
+
+            # Check if any strings were not translated and add them with original text
+            for key, text in string_contents.items():
+                if key not in all_results:
+                    all_results[key] = text
+
+            return all_results
+
+        except STOP_ERRORS:
+            raise
+        except Exception as e:
+            self.reporter.error(f"Batch translation error: {str(e)}")
+            # Create a dictionary with original strings as fallback
+            self.metrics.count("fallbacks_to_source", len(texts_dict))
+            return {k: v for k, v in texts_dict.items() if isinstance(v, str)}
+
+    def translate_text(self, text, target_language, context="", key=None, skip_keys=()):
+        """
+        Translate a single string.
+
+        Returns:
+            str: The translation, the text itself if it must not be translated,
+                or None if translation or placeholder validation failed
+        """
+        # Untranslatable strings are returned as-is without calling the model
+        if classify_string(key, text, skip_keys) is not None:
+            return text
+
+        try:
+            masked_text, fragments = mask_text(text)
+            prompt = SINGLE_TRANSLATION_PROMPT.format(
+                target_language=target_language,
+                text=masked_text,
+                context=context,
+                placeholder_instruction=PLACEHOLDER_PROMPT_INSTRUCTION,
+                glossary=glossary_section(self._glossary_entries({key: text}, target_language))
+            )
+
+            translation = self.generate(
+                prompt, self.backend.single_model, target_language, round(estimate_tokens(text) * TRANSLATION_EXPANSION)
+            )
+            if ":" in translation:
+                translation = translation.split(":", 1)[1].strip()
+
+            translation = unmask_text(translation.strip('"\''), fragments)
+
+            problems = validate_translation(text, translation)
+            if problems:
+                self.reporter.warning(f"Translation of {key or text} failed placeholder validation: {'; '.join(problems)}")
+                self.metrics.count("validation_failures")
+                return None
+            if self._glossary_violations({key: translation}, {key: text}, target_language):
+                self.reporter.warning(f"Translation of {key or text} doesn't follow the glossary.")
+
+            return translation
+        except STOP_ERRORS:
+            raise
+        except Exception as e:
+            self.reporter.error(f"Single translation error: {str(e)}")
+            return None
+
+
+def parse_source_files(files, reporter=NULL_REPORTER, metrics=NULL_METRICS):
+    """
+    Parse scanned or local source files into strings.
+
+    Args:
+        files (dict): A dictionary mapping file paths to their content
+        reporter (Reporter): Receives files that can't be parsed
+        metrics (RunMetrics): Receives a parse span per file
+
+    Returns:
+        dict: File path to (strings dict, untranslatable keys); unparseable files are left out
+    """
+    parsed = {}
+    for file_path, content in files.items():
+        try:
+            with metrics.span("parse"):
+                strings = dict(formats.read_strings(file_path, content))
+                parsed[file_path] = (strings, formats.untranslatable_keys(file_path, content))
+        except Exception as e:
+            reporter.warning(f"Skipping {file_path}: {str(e)}")
+    return parsed
+
+
+def translate_files(translator, parsed_files, lang_codes, workers=1, contexts=None):
+    """
+    Translate every parsed file into every language.
+
+    Each (file, language) pair is an independent job, and up to workers jobs
+    run at once.
+
+    Args:
+        translator (Translator): The translator to use
+        parsed_files (dict): Output of parse_source_files
+        lang_codes (list): Target language codes
+        workers (int): Jobs to run at once
+        contexts (dict): Optional usage context for each key, from index_repository_contexts
+
+    Returns:
+        dict: File path to {lang_code: translations}, with the source strings under "en"
+    """
+    results = {file_path: {"en": strings} for file_path, (strings, _) in parsed_files.items()}
+    jobs = [
+        (file_path, lang_code)
+        for file_path in parsed_files
+        for lang_code in lang_codes
+        if lang_code != "en"
+    ]
+    reporter = translator.reporter
+
+    def run(job):
+        file_path, lang_code = job
+        strings, untranslatable = parsed_files[file_path]
+        return translator.translate_all_strings(strings, language_name(lang_code), contexts or {}, skip_keys=untranslatable)
+
+    reporter.progress(0, len(jobs))
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(run, job): job for job in jobs}
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                file_path, lang_code = futures[future]
+                results[file_path][lang_code] = future.result()
+                reporter.progress(done, len(jobs), f"Translated {file_path} to {lang_code}")
+        except STOP_ERRORS:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return results
+
+
+def estimate_files(translator, parsed_files, lang_codes, contexts=None):
+    """
+    Estimate the tokens and cost of translate_files before starting it.
+
+    Args:
+        translator (Translator): The translator that will run the jobs
+        parsed_files (dict): Output of parse_source_files
+        lang_codes (list): Target language codes
+        contexts (dict): Optional usage context for each key
+
+    Returns:
+        dict: Totals of "strings", "calls", "prompt_tokens", "output_tokens" and "cost_usd",
+            and the same per language code under "languages"
+    """
+    totals = {"strings": 0, "calls": 0, "prompt_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+    languages = {}
+    for lang_code in lang_codes:
+        if lang_code == "en":
+            continue
+        language_totals = languages[lang_code] = dict.fromkeys(totals, 0)
+        for strings, untranslatable in parsed_files.values():
+            estimate = translator.estimate_usage(strings, language_name(lang_code), contexts or {}, skip_keys=untranslatable)
+            for name, value in estimate.items():
+                language_totals[name] += value
+                totals[name] += value
+    return dict(totals, languages=languages)
+
+
+def module_directory(file_path):
+    """
+    Return the directory exports of a source file are placed under.
+
+    Android-style resources live in a "values" or "MR/base" folder, and the
+    locale folders are created next to it.
+    """
+    directory = posixpath.dirname(file_path)
+    if posixpath.basename(directory) in ("values", "base"):
+        directory = posixpath.dirname(directory)
+    return directory
+
+
+def export_jobs(translations_by_file, export_format, parsed_files=None, attributes=None):
+    """
+    Build the ExportJob list for translated files.
+
+    Exports of each source file are placed under its module directory, so
+    files with the same name in different modules don't collide.
+
+    Args:
+        translations_by_file (dict): Output of translate_files
+        export_format (str): One of the registered format names
+        parsed_files (dict): Output of parse_source_files, for untranslatable keys
+        attributes (dict): File path to the resource attributes of its source file, e.g. tools:ignore
+
+    Returns:
+        list: ExportJob entries
+    """
+    needs_source = formats.get_format(export_format).needs_source
+    jobs = []
+    for file_path, languages in translations_by_file.items():
+        file_base = file_path.split("/")[-1].split(".")[0]
+        untranslatable = parsed_files[file_path][1] if parsed_files and file_path in parsed_files else frozenset()
+        source_strings = languages.get("en") if needs_source else None
+        file_attributes = (attributes or {}).get(file_path)
+        for lang_code, translations in languages.items():
+            export_path = posixpath.join(module_directory(file_path), export_path_for(export_format, lang_code, file_base))
+            jobs.append(ExportJob(export_path, file_path, lang_code, translations, untranslatable, source_strings, file_attributes))
+    return jobs
+
+
+def write_export(files, output):
+    """
+    Write export files to a directory, or to a ZIP archive if output ends in .zip.
+
+    Args:
+        files: An iterable of (path, content) pairs
+        output (str): The output directory or .zip path
+
+    Returns:
+        list: The paths written, relative to the output
+    """
+    if output.lower().endswith(".zip"):
+        with write_export_zip(files) as archive, open(output, "wb") as zip_file:
+            for chunk in archive.iter_chunks():
+                zip_file.write(chunk)
+            return archive.paths
+
+    paths = []
+    for path, content in files:
+        target = os.path.join(output, *path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "w", encoding="utf-8") as target_file:
+            target_file.write(content)
+        paths.append(path)
+    return paths
+
+
+def run_pipeline(client, repo_url, lang_codes, translator, export_format="Android XML", output="translations",
+                 pattern_search=True, workers=1, scan_cache=None, index_contexts=True):
+    """
+    Scan a repository, translate its strings and export the locale files.
+
+    Args:
+        client: A PyGithub client
+        repo_url (str): The GitHub repository URL (can include /tree/branch-name)
+        lang_codes (list): Target language codes
+        translator (Translator): The translator to use; its reporter and metrics receive
+            the progress and timings of every stage
+        export_format (str): One of the registered format names
+        output (str): The output directory or .zip path
+        pattern_search (bool): Whether to search common layouts before walking the whole tree
+        workers (int): (file, language) jobs to translate at once
+        scan_cache: Optional cache for scan results and context indexes
+        index_contexts (bool): Whether to describe where each key is used in the sources,
+            as context for the model
+
+    Returns:
+        dict: Counts of files found, files parsed, strings and exported paths
+
+    Raises:
+        BudgetExceeded: If the pre-flight estimate, or the run itself, exceeds the translator's budget
+        TranslationCancelled: If the translator is cancelled during the run
+    """
+    reporter = translator.reporter
+    metrics = translator.metrics
+    files = scan_repository(client, repo_url, pattern_search, cache=scan_cache, reporter=reporter, metrics=metrics)
+    if not files:
+        reporter.error("No strings.xml files found in the repository.")
+        return {"files": 0, "parsed": 0, "strings": 0, "exported": []}
+    reporter.success(f"Found {len(files)} strings.xml files.")
+
+    parsed_files = parse_source_files(files, reporter, metrics)
+    string_count = sum(len(strings) for strings, _ in parsed_files.values())
+    reporter.info(f"Translating {string_count} strings from {len(parsed_files)} files into {len(lang_codes)} languages.")
+
+    contexts = {}
+    if index_contexts:
+        keys = {key for strings, _ in parsed_files.values() for key in strings}
+        contexts = index_repository_contexts(client, repo_url, keys, cache=scan_cache, reporter=reporter, metrics=metrics)
+
+    estimate = estimate_files(translator, parsed_files, lang_codes, contexts)
+    reporter.info(
+        f"Estimated usage: {estimate['calls']} model calls, {estimate['prompt_tokens']:,} prompt and "
+        f"{estimate['output_tokens']:,} output tokens (${estimate['cost_usd']:.4f}), before retries."
+    )
+    translator.budget.check_estimate(estimate)
+
+    translations_by_file = translate_files(translator, parsed_files, lang_codes, workers, contexts)
+    attributes = {file_path: formats.resource_attributes(file_path, files[file_path]) for file_path in parsed_files}
+    jobs = export_jobs(translations_by_file, export_format, parsed_files, attributes)
+    with metrics.span("export"):
+        exported = write_export(render_export_files(jobs, export_format), output)
+    reporter.success(f"Exported {len(exported)} files to {output}.")
+    return {"files": len(files), "parsed": len(parsed_files), "strings": string_count, "exported": exported}
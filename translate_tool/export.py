@@ -0,0 +1,266 @@
+"""
+Rendering and streaming ZIP export of locale files.
+
+Locale files are rendered in parallel across a process pool, cached by content
+hash, and written into the archive one at a time, into a binary temporary file
+that spills to disk once it grows past a limit. The whole archive is never
+assembled in memory.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+from translate_tool import formats
+
+# Archives larger than this are spooled to disk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Size of the chunks read back out of the spooled archive
+READ_CHUNK_BYTES = 1024 * 1024
+
+EXPORT_FORMATS = formats.format_names()
+
+# Below this many files to render, a worker pool costs more than it saves
+PARALLEL_RENDER_THRESHOLD = 8
+
+# Number of render worker processes; with 1 or fewer everything renders in the calling process
+EXPORT_WORKERS = int(os.getenv("TRANSLATOR_EXPORT_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+ExportJob = namedtuple(
+    "ExportJob",
+    ["export_path", "file_path", "lang_code", "translations", "untranslatable", "source_strings", "attributes"],
+    defaults=(frozenset(), None, None)
+)
+
+_render_pool = None
+_render_pool_lock = threading.Lock()
+
+
+def export_path_for(export_format, lang_code, file_base=None):
+    """
+    Return the path of a locale file inside the export archive.
+
+    Args:
+        export_format (str): One of EXPORT_FORMATS
+        lang_code (str): The language code
+        file_base (str): The source file name without extension, or None for
+            project-wide translations
+
+    Returns:
+        str: The export path
+    """
+    return formats.export_path(export_format, lang_code, file_base)
+
+
+def render_export_file(export_format, translations, lang_code=None, untranslatable=frozenset(), source_strings=None,
+                       attributes=None):
+    """
+    Render one language of a file in the given export format.
+
+    Args:
+        export_format (str): One of EXPORT_FORMATS
+        translations (dict): The strings to render
+        lang_code (str): The language being rendered
+        untranslatable (set): Keys marked translatable="false" in the source file
+        source_strings (dict): The source-language strings, for formats that store them
+        attributes (dict): Per-resource attributes of the source file, such as tools:ignore
+
+    Returns:
+        str: The file content
+    """
+    return formats.render(export_format, translations, lang_code, untranslatable, source_strings, attributes)
+
+
+def translations_hash(translations):
+    """Return a hash identifying the exact content and order of JSON-serializable translations."""
+    payload = json.dumps(translations, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _get_render_pool():
+    # Imported here so starting the app doesn't pay for the process pool machinery
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            # Spawned workers only import this module, never the Streamlit app
+            _render_pool = ProcessPoolExecutor(
+                max_workers=EXPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_render_pool.shutdown, wait=False, cancel_futures=True)
+        return _render_pool
+
+
+def _reset_render_pool():
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def render_export_files(jobs, export_format, cache=None):
+    """
+    Render export files in parallel, reusing cached renders of unchanged content.
+
+    At most a few files per worker are in flight at once, so memory stays
+    bounded while the results are streamed to the caller.
+
+    Args:
+        jobs (list): ExportJob entries to render
+        export_format (str): One of EXPORT_FORMATS
+        cache: Optional cache with get/set, keyed by (file, language, format, content hash)
+
+    Yields:
+        tuple: (export path, file content), in job order, each followed by its
+            companion file if the format has one (see formats.render_companion)
+    """
+    from concurrent.futures.process import BrokenProcessPool
+
+    keys = [
+        (job.file_path, job.lang_code, export_format,
+         translations_hash([job.translations, sorted(job.untranslatable), job.source_strings, job.attributes]))
+        for job in jobs
+    ]
+    missing = [
+        index for index, key in enumerate(keys)
+        if cache is None or cache.get(key) is None
+    ]
+
+    pool = None
+    if EXPORT_WORKERS > 1 and len(missing) >= PARALLEL_RENDER_THRESHOLD:
+        pool = _get_render_pool()
+    pending = {}
+    queue = iter(missing)
+    window = max(1, EXPORT_WORKERS) * 2
+
+    def fill_window():
+        for index in queue:
+            job = jobs[index]
+            pending[index] = pool.submit(
+                render_export_file, export_format, dict(job.translations), job.lang_code,
+                frozenset(job.untranslatable), dict(job.source_strings) if job.source_strings else None,
+                dict(job.attributes) if job.attributes else None
+            )
+            if len(pending) >= window:
+                break
+
+    if pool is not None:
+        fill_window()
+
+    for index, job in enumerate(jobs):
+        content = None
+        future = pending.pop(index, None)
+        if future is not None:
+            try:
+                content = future.result()
+            except BrokenProcessPool:
+                # A crashed worker shouldn't break the export; render the rest here
+                _reset_render_pool()
+                pool = None
+                pending.clear()
+            if pool is not None:
+                fill_window()
+        elif cache is not None:
+            content = cache.get(keys[index])
+
+        if content is None:
+            content = render_export_file(
+                export_format, job.translations, job.lang_code, job.untranslatable, job.source_strings, job.attributes
+            )
+        if cache is not None:
+            cache.set(keys[index], content)
+        yield job.export_path, content
+
+        # Plurals of formats that can't hold them go into a companion file next to it
+        companion = formats.render_companion(export_format, job.translations, job.lang_code, job.untranslatable)
+        if companion is not None:
+            extension, companion_content = companion
+            yield os.path.splitext(job.export_path)[0] + extension, companion_content
+
+
+class ExportArchive:
+    """
+    A finished export archive and the paths it contains.
+
+    Use as a context manager so the spooled file is closed when done.
+    """
+
+    def __init__(self, spool, paths):
+        self.spool = spool
+        self.paths = paths
+
+    @property
+    def size(self):
+        position = self.spool.tell()
+        self.spool.seek(0, 2)
+        size = self.spool.tell()
+        self.spool.seek(position)
+        return size
+
+    def iter_chunks(self, chunk_size=READ_CHUNK_BYTES):
+        """Yield the archive's bytes in chunks."""
+        self.spool.seek(0)
+        while True:
+            chunk = self.spool.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def getvalue(self):
+        """Read the whole archive, for consumers that need it as bytes."""
+        self.spool.seek(0)
+        return self.spool.read()
+
+    def close(self):
+        self.spool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_export_zip(files, compression_level=DEFAULT_COMPRESSION_LEVEL, spool_max_bytes=SPOOL_MAX_BYTES):
+    """
+    Stream generated locale files into a compressed ZIP archive.
+
+    Args:
+        files: An iterable of (path, content) pairs; content may be str or bytes
+        compression_level (int): Deflate level from 0 (store only) to 9
+        spool_max_bytes (int): Size after which the archive is moved to disk
+
+    Returns:
+        ExportArchive: The finished archive, positioned at the start
+    """
+    import tempfile
+    import zipfile
+
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes, mode="w+b")
+    compression = zipfile.ZIP_STORED if compression_level == 0 else zipfile.ZIP_DEFLATED
+    paths = []
+
+    try:
+        with zipfile.ZipFile(spool, "w", compression=compression,
+                             compresslevel=compression_level or None) as zf:
+            for path, content in files:
+                if isinstance(content, str):
+                    content = content.encode("utf-8")
+                zf.writestr(path, content)
+                paths.append(path)
+    except Exception:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return ExportArchive(spool, paths)
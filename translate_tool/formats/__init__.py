@@ -0,0 +1,165 @@
+"""
+Registry of the localization file formats the app can read and write.
+
+Ingestion, previews and the Export page all go through this registry. Each
+format is implemented by a codec module in this package that is imported the
+first time the format is used, so formats nobody touches cost nothing at
+startup.
+
+A codec module provides:
+
+    read(source)                      yields (key, value) pairs from a str,
+                                      bytes or binary file object
+    iter_render(translations, lang_code=None, untranslatable=frozenset(),
+                source_strings=None)  yields the text of one locale file
+    export_path(lang_code, file_base=None)
+                                      the file's path inside an export
+
+and optionally untranslatable_keys(source) and resource_attributes(source).
+Codecs with resource_attributes also take the attributes of the source file
+as a fifth iter_render argument, and write them on every locale file.
+
+Keys follow the app's flat conventions: plural quantities are "name#one" and
+array items are "name[0]".
+"""
+
+import importlib
+import os
+from collections import namedtuple
+
+from translate_tool.formats._common import read_text, split_plural_key
+
+FormatSpec = namedtuple("FormatSpec", ["name", "module", "extensions", "needs_source"])
+
+# needs_source marks formats that store the source text next to each translation
+FORMATS = [
+    FormatSpec("Android XML", "android_xml", (".xml",), False),
+    FormatSpec("iOS Strings", "apple_strings", (".strings",), False),
+    FormatSpec("iOS Stringsdict", "stringsdict", (".stringsdict",), False),
+    FormatSpec("XLIFF", "xliff", (".xlf", ".xliff"), True),
+    FormatSpec("Gettext PO", "gettext_po", (".po", ".pot"), True),
+    FormatSpec("Flutter ARB", "arb", (".arb",), False),
+    FormatSpec("JSON", "i18next_json", (".json",), False),
+    FormatSpec("Kotlin Multiplatform", "kotlin_multiplatform", (), False),
+]
+
+# Formats that can't hold plurals, and the format their plurals are exported in, next to them
+COMPANION_FORMATS = {"iOS Strings": "iOS Stringsdict"}
+
+_BY_NAME = {spec.name: spec for spec in FORMATS}
+_BY_EXTENSION = {extension: spec for spec in FORMATS for extension in spec.extensions}
+
+
+def format_names():
+    """Return the names of all registered formats, in display order."""
+    return [spec.name for spec in FORMATS]
+
+
+def get_format(name):
+    """
+    Look up a format by name.
+
+    Raises:
+        ValueError: If the format isn't registered
+    """
+    spec = _BY_NAME.get(name)
+    if spec is None:
+        raise ValueError(f"Unsupported format: {name}")
+    return spec
+
+
+def format_for_path(path):
+    """Return the format of a file by its extension, or None if it isn't supported."""
+    return _BY_EXTENSION.get(os.path.splitext(path)[1].lower())
+
+
+def upload_extensions():
+    """Return the file extensions that can be ingested, without the leading dot."""
+    return [extension[1:] for extension in _BY_EXTENSION]
+
+
+def get_codec(name):
+    """Import and return the codec module of a format."""
+    return importlib.import_module(f"{__name__}.{get_format(name).module}")
+
+
+def read_strings(path, source):
+    """
+    Stream the strings of a file, choosing the codec by the file's extension.
+
+    Args:
+        path (str): The file path or name
+        source (str, bytes or file): The file content
+
+    Yields:
+        tuple: (key, value) pairs
+
+    Raises:
+        ValueError: If the file type isn't supported or the content can't be parsed
+    """
+    spec = format_for_path(path)
+    if spec is None:
+        raise ValueError(f"Unsupported file type: {path}")
+    yield from get_codec(spec.name).read(source)
+
+
+def untranslatable_keys(path, source):
+    """Return the keys a file marks as untranslatable; empty for formats without that notion."""
+    spec = format_for_path(path)
+    if spec is None:
+        return frozenset()
+    codec = get_codec(spec.name)
+    if not hasattr(codec, "untranslatable_keys"):
+        return frozenset()
+    return frozenset(codec.untranslatable_keys(source))
+
+
+def resource_attributes(path, source):
+    """Return the per-resource attributes a file carries, such as tools:ignore; empty for other formats."""
+    spec = format_for_path(path)
+    if spec is None:
+        return {}
+    codec = get_codec(spec.name)
+    if not hasattr(codec, "resource_attributes"):
+        return {}
+    return codec.resource_attributes(source)
+
+
+def render(name, translations, lang_code=None, untranslatable=frozenset(), source_strings=None, attributes=None):
+    """
+    Render one language of a file in the named format.
+
+    Args:
+        name (str): The format name
+        translations (dict): The strings to render
+        lang_code (str): The language being rendered
+        untranslatable (set): Keys marked untranslatable in the source file
+        source_strings (dict): The source-language strings, for formats that need them
+        attributes (dict): resource_attributes of the source file, for formats that keep them
+
+    Returns:
+        str: The file content
+    """
+    codec = get_codec(name)
+    if attributes and hasattr(codec, "resource_attributes"):
+        return "".join(codec.iter_render(translations, lang_code, untranslatable, source_strings, attributes))
+    return "".join(codec.iter_render(translations, lang_code, untranslatable, source_strings))
+
+
+def render_companion(name, translations, lang_code=None, untranslatable=frozenset()):
+    """
+    Render the plurals a format can't hold in its companion format, e.g. .stringsdict next to .strings.
+
+    Returns:
+        tuple: (file extension of the companion file, its content), or None if the format
+            has no companion or the translations have no plurals
+    """
+    companion = COMPANION_FORMATS.get(name)
+    if companion is None or not any(split_plural_key(key) for key in translations):
+        return None
+    return get_format(companion).extensions[0], render(companion, translations, lang_code, untranslatable)
+
+
+def export_path(name, lang_code, file_base=None):
+    """Return the path of a locale file inside an export in the named format."""
+    return get_codec(name).export_path(lang_code, file_base)
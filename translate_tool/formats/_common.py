@@ -0,0 +1,87 @@
+"""Helpers shared by the format codecs."""
+
+import codecs
+import io
+
+# CLDR plural categories, as used in "name#quantity" keys
+PLURAL_QUANTITIES = ("zero", "one", "two", "few", "many", "other")
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def as_binary(source):
+    """Return a binary file object for a str, bytes or binary file source."""
+    if isinstance(source, str):
+        return io.BytesIO(source.encode("utf-8"))
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return source
+
+
+def _detect_encoding(head):
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    return "utf-8-sig"
+
+
+def iter_text(source, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yield decoded text chunks from a str, bytes or binary file source.
+
+    UTF-16 with a byte order mark is detected, since Apple .strings files
+    are often written that way; everything else is read as UTF-8.
+    """
+    if isinstance(source, str):
+        yield source
+        return
+    stream = as_binary(source)
+    head = stream.read(chunk_size)
+    decoder = codecs.getincrementaldecoder(_detect_encoding(head))()
+    chunk = head
+    while chunk:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+        chunk = stream.read(chunk_size)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def read_text(source):
+    """Return the whole decoded text of a source."""
+    return "".join(iter_text(source))
+
+
+def iter_lines(source):
+    """Yield the lines of a source without their line endings, reading it in chunks."""
+    pending = ""
+    for text in iter_text(source):
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def split_plural_key(key):
+    """Split "name#quantity" into (name, quantity), or return None for other keys."""
+    name, separator, quantity = key.rpartition("#")
+    if separator and name and quantity in PLURAL_QUANTITIES:
+        return name, quantity
+    return None
+
+
+def is_source_language(lang_code):
+    """Whether a language code is the source language, which keeps untranslatable keys."""
+    return lang_code in (None, "en")
+
+
+def escape_c_string(text):
+    """Escape text for a double-quoted C-style string (.strings and PO files)."""
+    return (text.replace("\\", "\\\\")
+            .replace('"', '\\"')
+            .replace("\n", "\\n")
+            .replace("\t", "\\t")
+            .replace("\r", "\\r"))
@@ -0,0 +1,25 @@
+"""Android strings.xml resources, via the streaming strings_xml codec."""
+
+from translate_tool import strings_xml
+
+
+def read(source):
+    for key, value, _ in strings_xml.iter_flat_resources(strings_xml.iter_resources(source)):
+        yield key, value
+
+
+def untranslatable_keys(source):
+    return strings_xml.untranslatable_keys(source)
+
+
+def resource_attributes(source):
+    return strings_xml.resource_attributes(source)
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None, attributes=None):
+    return strings_xml.iter_strings_xml(translations, lang_code, untranslatable, attributes)
+
+
+def export_path(lang_code, file_base=None):
+    file_base = file_base or "strings"
+    return f"values/{file_base}.xml" if lang_code == "en" else f"values-{lang_code}/{file_base}.xml"
@@ -0,0 +1,56 @@
+"""
+Apple .strings files: "key" = "value"; entries with C-style escapes.
+
+Plural keys ("name#one") can't be expressed in .strings; exports write them
+to a .stringsdict file next to it (see formats.render_companion).
+"""
+
+import re
+
+from translate_tool.formats._common import escape_c_string, is_source_language, read_text, split_plural_key
+
+# Comments are matched first so quotes inside them are never read as entries
+ENTRY_PATTERN = re.compile(
+    r'/\*.*?\*/|//[^\n]*'
+    r'|(?:"((?:[^"\\]|\\.)*)"|([A-Za-z0-9_.\-]+))\s*=\s*"((?:[^"\\]|\\.)*)"\s*;',
+    re.DOTALL
+)
+ESCAPE_PATTERN = re.compile(r'\\(U[0-9a-fA-F]{4}|u[0-9a-fA-F]{4}|.)', re.DOTALL)
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "0": "\0"}
+
+
+def unescape(text):
+    """Resolve the backslash escapes of a .strings value."""
+    if "\\" not in text:
+        return text
+
+    def replace(match):
+        escape = match.group(1)
+        if len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return ESCAPES.get(escape, escape)
+
+    return ESCAPE_PATTERN.sub(replace, text)
+
+
+def read(source):
+    for match in ENTRY_PATTERN.finditer(read_text(source)):
+        quoted_key, bare_key, value = match.groups()
+        if value is None:
+            continue
+        key = unescape(quoted_key) if quoted_key is not None else bare_key
+        yield key, unescape(value)
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None):
+    keep_untranslatable = is_source_language(lang_code)
+    for key, value in translations.items():
+        if value is None or split_plural_key(key):
+            continue
+        if key in untranslatable and not keep_untranslatable:
+            continue
+        yield f'"{escape_c_string(key)}" = "{escape_c_string(str(value))}";\n'
+
+
+def export_path(lang_code, file_base=None):
+    return f"{lang_code}.lproj/{file_base or 'Localizable'}.strings"
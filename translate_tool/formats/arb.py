@@ -0,0 +1,60 @@
+"""
+Flutter Application Resource Bundle (.arb) files.
+
+ARB is flat JSON with "@"-prefixed metadata entries. Plural keys
+("name#one") are merged into one ICU plural message on write:
+
+    "name": "{count, plural, one{1 item} other{{count} items}}"
+"""
+
+import json
+
+from translate_tool.formats._common import PLURAL_QUANTITIES, is_source_language, split_plural_key
+from translate_tool.json_keys import split_key
+from translate_tool.json_stream import iter_flat_json
+
+PLURAL_VARIABLE = "count"
+
+
+def read(source):
+    for flat_key, value in iter_flat_json(source):
+        segments = split_key(flat_key)
+        # Messages are top-level strings; "@@locale" and "@key" metadata aren't translated
+        if len(segments) == 1 and not segments[0].startswith("@"):
+            yield segments[0], value
+
+
+def _plural_message(quantities):
+    forms = " ".join(f"{quantity}{{{quantities[quantity]}}}" for quantity in PLURAL_QUANTITIES if quantity in quantities)
+    return f"{{{PLURAL_VARIABLE}, plural, {forms}}}"
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None):
+    keep_untranslatable = is_source_language(lang_code)
+    messages = {}
+    plurals = {}
+    for key, value in translations.items():
+        if value is None or (key in untranslatable and not keep_untranslatable):
+            continue
+        plural = split_plural_key(key)
+        if plural:
+            name, quantity = plural
+            if name not in plurals:
+                plurals[name] = {}
+                # Reserve the message's position in file order
+                messages[name] = None
+            plurals[name][quantity] = value
+        else:
+            messages[key] = value
+
+    yield "{\n"
+    yield f'  "@@locale": {json.dumps((lang_code or "en").replace("-", "_"))}'
+    for key, value in messages.items():
+        if value is None:
+            value = _plural_message(plurals[key])
+        yield f",\n  {json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)}"
+    yield "\n}\n"
+
+
+def export_path(lang_code, file_base=None):
+    return f"l10n/{file_base or 'app'}_{lang_code.replace('-', '_')}.arb"
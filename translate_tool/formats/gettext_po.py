@@ -0,0 +1,112 @@
+"""
+gettext PO catalogs.
+
+Each key is written as the entry's msgctxt, with the source text as msgid
+and the translation as msgstr, so keys stay unique even when two strings
+share the same English text. Plural keys are written as separate
+"name#quantity" entries instead of msgid_plural, because PO plural forms
+are indexed by per-language rules, not by CLDR categories.
+
+Reading streams the catalog line by line. An entry's key is its msgctxt, or
+its msgid when there is no context, and its value is the msgid source text.
+"""
+
+from translate_tool.formats._common import escape_c_string, is_source_language, iter_lines
+
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+
+
+def unquote(text):
+    """Decode a quoted PO string such as "Hello\\n"."""
+    text = text.strip()
+    if len(text) < 2 or not (text.startswith('"') and text.endswith('"')):
+        raise ValueError(f"Invalid PO string: {text[:40]!r}")
+    text = text[1:-1]
+    if "\\" not in text:
+        return text
+
+    result = []
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if char == "\\" and index + 1 < len(text):
+            result.append(ESCAPES.get(text[index + 1], text[index + 1]))
+            index += 2
+        else:
+            result.append(char)
+            index += 1
+    return "".join(result)
+
+
+def _iter_entries(source):
+    """Yield each entry's fields as a {keyword: text} dict."""
+    entry = {}
+    field = None
+    for line in iter_lines(source):
+        stripped = line.strip()
+        if not stripped:
+            if entry:
+                yield entry
+            entry, field = {}, None
+        elif stripped.startswith("#~"):
+            # Obsolete entries are kept in the file but are no longer used
+            continue
+        elif stripped.startswith("#"):
+            if field is not None and "msgstr" in field:
+                yield entry
+                entry, field = {}, None
+        elif stripped.startswith('"'):
+            if field is not None:
+                entry[field] += unquote(stripped)
+        else:
+            keyword, _, value = stripped.partition(" ")
+            # A new msgctxt or msgid after a msgstr starts the next entry
+            if keyword in ("msgctxt", "msgid") and entry and any(name.startswith("msgstr") for name in entry):
+                yield entry
+                entry = {}
+            field = keyword
+            entry[field] = unquote(value)
+    if entry:
+        yield entry
+
+
+def read(source):
+    for entry in _iter_entries(source):
+        msgid = entry.get("msgid")
+        if not msgid:
+            # The header entry has an empty msgid
+            continue
+        key = entry.get("msgctxt", msgid)
+        if "msgid_plural" in entry:
+            yield f"{key}#one", msgid
+            yield f"{key}#other", entry["msgid_plural"]
+        else:
+            yield key, msgid
+
+
+def _quote(text):
+    return f'"{escape_c_string(text)}"'
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None):
+    is_source = is_source_language(lang_code)
+    source_strings = source_strings or {}
+
+    yield 'msgid ""\n'
+    yield 'msgstr ""\n'
+    yield '"Content-Type: text/plain; charset=UTF-8\\n"\n'
+    yield f'"Language: {escape_c_string(lang_code or "en")}\\n"\n'
+    for key, value in translations.items():
+        if value is None:
+            continue
+        if key in untranslatable and not is_source:
+            continue
+        source_text = source_strings.get(key, value)
+        yield "\n"
+        yield f"msgctxt {_quote(key)}\n"
+        yield f"msgid {_quote(str(source_text))}\n"
+        yield f"msgstr {_quote(str(value))}\n"
+
+
+def export_path(lang_code, file_base=None):
+    return f"locale/{lang_code}/LC_MESSAGES/{file_base or 'messages'}.po"
@@ -0,0 +1,28 @@
+"""
+Nested i18next-style JSON bundles.
+
+Reading streams the bundle with iter_flat_json; writing rebuilds the nesting
+with unflatten_json and keeps keys flat only when they conflict.
+"""
+
+import json
+
+from translate_tool.json_keys import unflatten_json
+from translate_tool.json_stream import iter_flat_json
+
+
+def read(source):
+    return iter_flat_json(source)
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None):
+    try:
+        content = unflatten_json(translations)
+    except ValueError:
+        content = translations
+    yield json.dumps(content, ensure_ascii=False, indent=2)
+
+
+def export_path(lang_code, file_base=None):
+    file_base = file_base or "strings"
+    return f"{file_base}.json" if lang_code == "en" else f"{file_base}_{lang_code}.json"
@@ -0,0 +1,8 @@
+"""moko-resources strings.xml files for Kotlin Multiplatform; same content as Android XML."""
+
+from translate_tool.formats.android_xml import iter_render, read, resource_attributes, untranslatable_keys
+
+
+def export_path(lang_code, file_base=None):
+    folder = "base" if lang_code == "en" else lang_code
+    return f"commonMain/resources/MR/{folder}/{file_base or 'strings'}.xml"
@@ -0,0 +1,74 @@
+"""
+Apple .stringsdict plural rules, stored as a property list.
+
+Each "name#quantity" group becomes one entry whose localized format key
+points at a single plural variable:
+
+    name -> NSStringLocalizedFormatKey "%#@value@"
+            value -> NSStringPluralRuleType with one/other/... strings
+
+Only plural keys are written; plain strings belong in the .strings file.
+"""
+
+import plistlib
+import re
+
+from translate_tool.formats._common import PLURAL_QUANTITIES, as_binary, is_source_language, split_plural_key
+
+PLURAL_RULE_TYPE = "NSStringPluralRuleType"
+VARIABLE_NAME = "value"
+# The conversion of the first printf placeholder decides the variable's value type
+FORMAT_SPECIFIER_PATTERN = re.compile(r"%(?:\d+\$)?[-+ 0#]*\d*(?:\.\d+)?(?:ll|l|h|q|z|t|j)?([dDiuUxXoOfeEgGcCsS@])")
+
+
+def read(source):
+    entries = plistlib.load(as_binary(source))
+    for name, entry in entries.items():
+        if not isinstance(entry, dict):
+            continue
+        # Only the first plural variable of an entry maps onto "name#quantity" keys
+        for variable in entry.values():
+            if isinstance(variable, dict) and variable.get("NSStringFormatSpecTypeKey") == PLURAL_RULE_TYPE:
+                for quantity in PLURAL_QUANTITIES:
+                    if quantity in variable:
+                        yield f"{name}#{quantity}", variable[quantity]
+                break
+
+
+def value_type(quantities):
+    """Return the NSStringFormatValueTypeKey for a group of plural strings."""
+    for text in quantities.values():
+        match = FORMAT_SPECIFIER_PATTERN.search(text or "")
+        if match:
+            return match.group(1)
+    return "d"
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None):
+    keep_untranslatable = is_source_language(lang_code)
+    groups = {}
+    for key, value in translations.items():
+        plural = split_plural_key(key)
+        if plural is None or value is None:
+            continue
+        if key in untranslatable and not keep_untranslatable:
+            continue
+        name, quantity = plural
+        groups.setdefault(name, {})[quantity] = value
+
+    entries = {}
+    for name, quantities in groups.items():
+        variable = {
+            "NSStringFormatSpecTypeKey": PLURAL_RULE_TYPE,
+            "NSStringFormatValueTypeKey": value_type(quantities)
+        }
+        for quantity in PLURAL_QUANTITIES:
+            if quantity in quantities:
+                variable[quantity] = quantities[quantity]
+        entries[name] = {"NSStringLocalizedFormatKey": f"%#@{VARIABLE_NAME}@", VARIABLE_NAME: variable}
+
+    yield plistlib.dumps(entries, sort_keys=False).decode("utf-8")
+
+
+def export_path(lang_code, file_base=None):
+    return f"{lang_code}.lproj/{file_base or 'Localizable'}.stringsdict"
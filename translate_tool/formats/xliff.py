@@ -0,0 +1,76 @@
+"""
+XLIFF 1.2 files with the source text and its translation in each unit.
+
+Reading also accepts XLIFF 2.x <unit> elements. Units are streamed with
+iterparse and cleared once read.
+"""
+
+import xml.etree.ElementTree as ET
+
+from translate_tool.formats._common import as_binary, is_source_language
+
+XLIFF_NAMESPACE = "urn:oasis:names:tc:xliff:document:1.2"
+UNIT_TAGS = ("trans-unit", "unit")
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_attribute(text):
+    return _escape(text).replace('"', "&quot;")
+
+
+def _iter_units(source):
+    for _, elem in ET.iterparse(as_binary(source), events=("end",)):
+        if _local_name(elem.tag) not in UNIT_TAGS:
+            continue
+        source_elem = next((child for child in elem.iter() if _local_name(child.tag) == "source"), None)
+        unit_id = elem.get("id")
+        if unit_id is not None and source_elem is not None:
+            yield unit_id, "".join(source_elem.itertext()), elem.get("translate", "yes") == "no"
+        elem.clear()
+
+
+def read(source):
+    for unit_id, text, _ in _iter_units(source):
+        yield unit_id, text
+
+
+def untranslatable_keys(source):
+    return {unit_id for unit_id, _, untranslatable in _iter_units(source) if untranslatable}
+
+
+def iter_render(translations, lang_code=None, untranslatable=frozenset(), source_strings=None):
+    is_source = is_source_language(lang_code)
+    source_strings = source_strings or {}
+    target_language = "" if is_source else f' target-language="{_escape_attribute(lang_code)}"'
+
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<xliff xmlns="{XLIFF_NAMESPACE}" version="1.2">\n'
+    yield f'  <file original="strings" source-language="en"{target_language} datatype="plaintext">\n'
+    yield "    <body>\n"
+    for key, value in translations.items():
+        if value is None:
+            continue
+        flagged = key in untranslatable
+        if flagged and not is_source:
+            continue
+        translate = ' translate="no"' if flagged else ""
+        source_text = source_strings.get(key, value) if not is_source else value
+        yield f'      <trans-unit id="{_escape_attribute(key)}"{translate}>\n'
+        yield f"        <source>{_escape(str(source_text))}</source>\n"
+        if not is_source:
+            yield f"        <target>{_escape(str(value))}</target>\n"
+        yield "      </trans-unit>\n"
+    yield "    </body>\n"
+    yield "  </file>\n"
+    yield "</xliff>\n"
+
+
+def export_path(lang_code, file_base=None):
+    return f"xliff/{file_base or 'strings'}.{lang_code}.xlf"
@@ -0,0 +1,255 @@
+"""
+Per-project glossaries, and a matcher that finds their terms in one pass.
+
+A glossary fixes how terms are translated: "Loan" is always "Prêt" in
+French, and names like "Mifos X" stay as they are in every language. Only
+the entries whose terms occur in a batch are added to its prompt, and every
+translation is checked afterwards, so a batch that ignored the glossary
+can have just its offending keys translated again.
+
+Terms are found with an Aho-Corasick automaton built once per glossary, so
+matching a string costs one pass over it however many terms there are.
+"""
+
+import csv
+import json
+from collections import deque
+
+# Language of entries that apply to every language
+ALL_LANGUAGES = ""
+
+
+def _fold(text):
+    """Lowercase text without changing its length, so match offsets stay valid."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+class TermMatcher:
+    """
+    Aho-Corasick matcher for a fixed set of terms.
+
+    Matches are case-insensitive and must start and end on word boundaries,
+    so "Loan" is found in "Loan amount" but not in "Loaner". Where terms
+    overlap, the longest match wins: "Mifos X" hides "Mifos".
+
+    Args:
+        terms: The terms to find
+    """
+
+    def __init__(self, terms):
+        self.terms = list(dict.fromkeys(term for term in terms if term))
+        # Trie of folded terms: transitions, failure links and the terms ending at each node
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for index, term in enumerate(self.terms):
+            node = 0
+            for char in _fold(term):
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(index)
+        self._link()
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text):
+        """
+        Find the terms in a text.
+
+        Returns:
+            list: (start, end, term) of each match, left to right, without overlaps
+        """
+        if not self.terms or not text:
+            return []
+        folded = _fold(text)
+        matches = []
+        node = 0
+        for position, char in enumerate(folded):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for index in self._output[node]:
+                term = self.terms[index]
+                start = position + 1 - len(term)
+                end = position + 1
+                if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(term[-1]) and end < len(text) and _is_word_char(text[end]):
+                    continue
+                matches.append((start, end, term))
+
+        # Keep the leftmost, longest match wherever matches overlap
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        selected = []
+        covered_until = 0
+        for start, end, term in matches:
+            if start >= covered_until:
+                selected.append((start, end, term))
+                covered_until = end
+        return selected
+
+    def terms_in(self, text):
+        """Return the distinct terms found in a text, in order of appearance."""
+        return list(dict.fromkeys(term for _, _, term in self.find(text)))
+
+
+class Glossary:
+    """
+    Required translations of terms, per language.
+
+    An entry without a translation means the term is kept as it is. Entries
+    for a specific language take precedence over entries for all languages.
+
+    Args:
+        rows: Optional dicts with "term", "language" (a language code, or
+            ALL_LANGUAGES) and "translation" (empty to keep the term as is)
+    """
+
+    def __init__(self, rows=()):
+        # term -> {language: translation}
+        self._entries = {}
+        self._matcher = None
+        for row in rows:
+            self.add(row["term"], row.get("translation"), row.get("language"))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, term, translation=None, language=None):
+        """Add or replace an entry; a translation of None or "" keeps the term as is."""
+        term = (term or "").strip()
+        if not term:
+            return
+        self._entries.setdefault(term, {})[language or ALL_LANGUAGES] = (translation or "").strip()
+        self._matcher = None
+
+    def rows(self):
+        """Return the entries as "term", "language" and "translation" dicts, sorted by term."""
+        return [
+            {"term": term, "language": language, "translation": translation}
+            for term in sorted(self._entries, key=str.lower)
+            for language, translation in sorted(self._entries[term].items())
+        ]
+
+    @property
+    def matcher(self):
+        if self._matcher is None:
+            self._matcher = TermMatcher(self._entries)
+        return self._matcher
+
+    def required(self, term, language):
+        """Return the translation a term must have in a language, or None if it has no entry for it."""
+        translations = self._entries.get(term)
+        if not translations:
+            return None
+        translation = translations.get(language, translations.get(ALL_LANGUAGES))
+        if translation is None:
+            return None
+        return translation or term
+
+    def entries_for(self, text, language):
+        """
+        Return the entries that apply to a source text.
+
+        Returns:
+            dict: Term to its required translation, in order of appearance
+        """
+        entries = {}
+        for term in self.matcher.terms_in(text):
+            required = self.required(term, language)
+            if required is not None:
+                entries[term] = required
+        return entries
+
+    def batch_entries(self, texts, language):
+        """Return the entries that apply to any of several source texts, for a batch prompt."""
+        entries = {}
+        for text in texts:
+            entries.update(self.entries_for(text, language))
+        return entries
+
+    def violations(self, source, translation, language):
+        """
+        Check that a translation uses the required translation of every term in its source.
+
+        Required translations are looked for case-insensitively anywhere in
+        the translation, so inflected or capitalized uses still pass.
+
+        Returns:
+            list: (term, required translation) pairs the translation doesn't contain
+        """
+        entries = self.entries_for(source, language)
+        if not entries:
+            return []
+        folded = _fold(translation or "")
+        return [(term, required) for term, required in entries.items() if _fold(required) not in folded]
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a glossary file.
+
+        JSON files map each term to null (keep as is), a translation for every
+        language, or {language code: translation}. CSV files have "term",
+        "language" and "translation" columns.
+
+        Raises:
+            ValueError: If the file is not a JSON object or a CSV with a "term" column
+        """
+        with open(path, encoding="utf-8", newline="") as glossary_file:
+            if path.lower().endswith(".csv"):
+                reader = csv.DictReader(glossary_file)
+                if "term" not in (reader.fieldnames or ()):
+                    raise ValueError(f"{path} has no \"term\" column")
+                return cls(reader)
+            data = json.load(glossary_file)
+
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} must contain a JSON object of terms")
+        glossary = cls()
+        for term, value in data.items():
+            if isinstance(value, dict):
+                for language, translation in value.items():
+                    glossary.add(term, translation, language)
+            else:
+                glossary.add(term, value)
+        return glossary
+
+
+def format_glossary(entries):
+    """
+    Describe glossary entries for a prompt.
+
+    Returns:
+        str: One line per term, e.g. '- "Loan" → "Prêt"', or '- "Mifos X" (keep unchanged)'
+    """
+    lines = []
+    for term, required in entries.items():
+        if required == term:
+            lines.append(f'- "{term}" (keep unchanged)')
+        else:
+            lines.append(f'- "{term}" → "{required}"')
+    return "\n".join(lines)
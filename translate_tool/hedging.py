@@ -0,0 +1,148 @@
+"""
+Deadlines, hedged requests and cancellation for model calls.
+
+A model call that hangs would otherwise hold up its batch, and every batch
+queued behind it. call_with_deadline runs each attempt on its own daemon
+thread and waits for it, so that it can:
+
+- give up once the call's deadline passes (ModelTimeout),
+- send a duplicate "hedge" once the call has taken longer than the model's
+  recent p95 latency, and return whichever answer arrives first,
+- stop waiting as soon as the run is cancelled (TranslationCancelled).
+
+An abandoned attempt keeps running in the background until the backend
+returns or times out on its own; its answer is discarded.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from translate_tool.metrics import percentile
+
+# Latency quantile after which a hedge is sent, and the calls needed to estimate it
+HEDGE_QUANTILE = 0.95
+MIN_HEDGE_SAMPLES = 20
+# Recent call durations kept per model
+LATENCY_SAMPLES = 256
+# How often a cancellable wait checks whether the run was cancelled, in seconds
+POLL_INTERVAL = 0.05
+
+
+class ModelTimeout(TimeoutError):
+    """A model call did not answer before its deadline."""
+
+
+class TranslationCancelled(RuntimeError):
+    """Raised when a run is cancelled while it is translating."""
+
+
+class LatencyTracker:
+    """
+    Recent latencies of successful model calls, per model.
+
+    Args:
+        quantile (float): Latency quantile that triggers a hedge
+        min_samples (int): Calls of a model needed before it is hedged
+        max_samples (int): Recent calls kept per model
+    """
+
+    def __init__(self, quantile=HEDGE_QUANTILE, min_samples=MIN_HEDGE_SAMPLES, max_samples=LATENCY_SAMPLES):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def observe(self, model, seconds):
+        with self._lock:
+            samples = self._samples.get(model)
+            if samples is None:
+                samples = self._samples[model] = deque(maxlen=self.max_samples)
+            samples.append(seconds)
+
+    def hedge_delay(self, model):
+        """Return the seconds after which a call to a model is hedged, or None while there is too little history."""
+        with self._lock:
+            samples = list(self._samples.get(model, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return percentile(samples, self.quantile)
+
+
+def start_thread(function, *args):
+    """Run a function on a daemon thread and return a Future of its result."""
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+
+def call_with_deadline(attempt, timeout=None, hedge_delay=None, cancelled=None, on_hedge=None):
+    """
+    Call attempt() with a deadline, an optional hedge and cancellation.
+
+    The hedge is only sent while the first attempt is still running; if an
+    attempt fails, the other one is still waited for, and the error is raised
+    once none are left.
+
+    Args:
+        attempt: Makes one model call and returns its result
+        timeout (float): Seconds to wait for an answer; None waits indefinitely
+        hedge_delay (float): Seconds after which a duplicate attempt is sent; None never hedges
+        cancelled (threading.Event): Stops waiting when it is set
+        on_hedge: Called when the hedge is sent
+
+    Returns:
+        tuple: (result, index of the attempt that answered, 1 for the hedge)
+
+    Raises:
+        ModelTimeout: If no attempt answered before the deadline
+        TranslationCancelled: If cancelled was set while waiting
+    """
+    started = time.monotonic()
+    attempts = [start_thread(attempt)]
+    running = set(attempts)
+    hedged = hedge_delay is None
+    error = None
+
+    while True:
+        if cancelled is not None and cancelled.is_set():
+            raise TranslationCancelled("The run was cancelled.")
+        elapsed = time.monotonic() - started
+        if timeout is not None and elapsed >= timeout:
+            raise ModelTimeout(f"No answer from the model within {timeout:g}s")
+        if not hedged and elapsed >= hedge_delay:
+            hedged = True
+            hedge = start_thread(attempt)
+            attempts.append(hedge)
+            running.add(hedge)
+            if on_hedge:
+                on_hedge()
+
+        # Sleep until an attempt finishes or the next deadline, hedge or cancellation check
+        wake_times = []
+        if timeout is not None:
+            wake_times.append(timeout - elapsed)
+        if not hedged:
+            wake_times.append(hedge_delay - elapsed)
+        if cancelled is not None:
+            wake_times.append(POLL_INTERVAL)
+        done, _ = wait(running, timeout=max(0, min(wake_times)) if wake_times else None, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            running.discard(future)
+            if future.exception() is None:
+                return future.result(), attempts.index(future)
+            error = future.exception()
+        if not running:
+            raise error
@@ -0,0 +1,176 @@
+"""
+Flattening nested JSON locale bundles into flat keys and back.
+
+Nested objects are joined with a separator ("." by default) and array items
+get an index suffix, the same way strings.xml arrays are flattened:
+
+    {"errors": {"required": "..."}}   ->  "errors.required"
+    {"days": ["Mon", "Tue"]}          ->  "days[0]", "days[1]"
+
+Real i18n keys often contain dots themselves ("Username or password
+incorrect."), so the separator, "[" and backslashes inside a key are escaped
+with a backslash. That keeps the round trip lossless. Both directions are
+iterative and linear in the total size of the keys, so deeply nested bundles
+don't hit the recursion limit.
+"""
+
+DEFAULT_SEPARATOR = "."
+ESCAPE = "\\"
+
+
+def escape_key(key, separator=DEFAULT_SEPARATOR):
+    """Escape backslashes, the separator and "[" inside a single key segment."""
+    if ESCAPE not in key and separator not in key and "[" not in key:
+        return key
+    if len(separator) == 1:
+        escaped = key.replace(ESCAPE, ESCAPE + ESCAPE).replace("[", ESCAPE + "[")
+        return escaped if separator in (ESCAPE, "[") else escaped.replace(separator, ESCAPE + separator)
+    escaped = []
+    for char in key:
+        if char == ESCAPE or char == "[" or separator.startswith(char):
+            escaped.append(ESCAPE)
+        escaped.append(char)
+    return "".join(escaped)
+
+
+def split_key(flat_key, separator=DEFAULT_SEPARATOR):
+    """
+    Split a flat key into its path segments.
+
+    Args:
+        flat_key (str): A key produced by flatten_json
+        separator (str): The separator used when flattening
+
+    Returns:
+        list: Object keys as str and array indexes as int
+    """
+    segments = []
+    current = []
+    index = 0
+    length = len(flat_key)
+    # A leading index means the bundle itself is an array
+    pending_key = not flat_key.startswith("[")
+
+    while index < length:
+        char = flat_key[index]
+        if char == ESCAPE and index + 1 < length:
+            current.append(flat_key[index + 1])
+            index += 2
+        elif flat_key.startswith(separator, index):
+            if pending_key:
+                segments.append("".join(current))
+            current = []
+            pending_key = True
+            index += len(separator)
+        elif char == "[":
+            end = flat_key.find("]", index)
+            number = flat_key[index + 1:end] if end != -1 else ""
+            if not number.isdigit():
+                current.append(char)
+                index += 1
+                continue
+            if pending_key:
+                segments.append("".join(current))
+            current = []
+            pending_key = False
+            segments.append(int(number))
+            index = end + 1
+        else:
+            current.append(char)
+            index += 1
+
+    if pending_key:
+        segments.append("".join(current))
+    return segments
+
+
+def flatten_json(nested_json, separator=DEFAULT_SEPARATOR):
+    """
+    Flatten a nested JSON object into a single-level dictionary.
+
+    Args:
+        nested_json (dict or list): The parsed JSON bundle
+        separator (str): The string used to join nested keys
+
+    Returns:
+        dict: Flat keys mapped to leaf values. Empty objects and arrays are kept
+            as leaf values so the structure round-trips.
+    """
+    flattened = {}
+    stack = [iter(_children(nested_json, None, separator))]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            continue
+        path, value = child
+        if isinstance(value, (dict, list)) and value:
+            stack.append(iter(_children(value, path, separator)))
+        else:
+            flattened[path] = value
+    return flattened
+
+
+def _children(container, prefix, separator):
+    """
+    Yield (flat key, value) pairs for the direct children of a container.
+
+    prefix is None for the top level, so an empty top-level key still gets a separator.
+    """
+    if isinstance(container, list):
+        for index, value in enumerate(container):
+            yield f"{prefix or ''}[{index}]", value
+    else:
+        for key, value in container.items():
+            segment = escape_key(str(key), separator)
+            yield (segment if prefix is None else f"{prefix}{separator}{segment}"), value
+
+
+def unflatten_json(flattened_json, separator=DEFAULT_SEPARATOR):
+    """
+    Rebuild a nested JSON object from flat keys.
+
+    Args:
+        flattened_json (dict): Flat keys mapped to values
+        separator (str): The separator used when flattening
+
+    Returns:
+        dict or list: The nested bundle
+
+    Raises:
+        ValueError: If a key is used both as a value and as a parent of other keys
+    """
+    result = None
+    for flat_key, value in flattened_json.items():
+        segments = split_key(flat_key, separator)
+        if result is None:
+            result = [] if isinstance(segments[0], int) else {}
+
+        container = result
+        for position, segment in enumerate(segments):
+            last = position == len(segments) - 1
+            if isinstance(segment, int) != isinstance(container, list):
+                raise ValueError(f"Key {flat_key!r} conflicts with the structure of another key")
+            if last:
+                child = value
+            else:
+                child = [] if isinstance(segments[position + 1], int) else {}
+
+            if isinstance(container, list):
+                while len(container) <= segment:
+                    container.append(None)
+                existing = container[segment]
+                missing = existing is None
+            else:
+                existing = container.get(segment)
+                missing = segment not in container
+            # A value can't replace keys nested under the same path
+            if last and isinstance(existing, (dict, list)):
+                raise ValueError(f"Key {flat_key!r} conflicts with the value of another key")
+            if missing or last:
+                container[segment] = child
+            container = container[segment]
+
+            if not last and not isinstance(container, (dict, list)):
+                raise ValueError(f"Key {flat_key!r} conflicts with the value of another key")
+    return result if result is not None else {}
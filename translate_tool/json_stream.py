@@ -0,0 +1,232 @@
+"""
+Streaming ingestion of large JSON locale bundles.
+
+iter_flat_json reads a JSON document in chunks and yields the flattened
+(key, value) pairs as it goes, with the same keys flatten_json produces. The
+parsed document is never held in memory, so a 50 MB i18next bundle can be
+streamed straight into the project store. PreviewSampler keeps a small
+reservoir sample of the pairs for the upload preview.
+"""
+
+import codecs
+import json
+import random
+import re
+from json.decoder import scanstring
+
+from translate_tool.json_keys import DEFAULT_SEPARATOR, escape_key
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_PREVIEW_SIZE = 20
+
+WHITESPACE_PATTERN = re.compile(r"[ \t\n\r]*")
+SCALAR_PATTERN = re.compile(r"[^,\]\}\s]*")
+NUMBER_PATTERN = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?")
+LITERALS = {"true": True, "false": False, "null": None}
+
+
+class _Reader:
+    """A text buffer over a binary or text file that is refilled on demand."""
+
+    def __init__(self, source, chunk_size):
+        if isinstance(source, (str, bytes)):
+            self._chunks = iter([source])
+        else:
+            self._chunks = iter(lambda: source.read(chunk_size), source.read(0))
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, wanted=None):
+        """
+        Read more input. Returns False once the input is exhausted.
+
+        Reads at least as much as is already buffered, so a single huge token
+        is re-scanned a logarithmic number of times, not once per chunk.
+        """
+        if self.eof:
+            return False
+        wanted = max(wanted or self.chunk_size, len(self.buffer) - self.pos)
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+        pieces = []
+        size = 0
+        while size < wanted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                pieces.append(self._decoder.decode(b"", final=True))
+                self.eof = True
+                break
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            pieces.append(chunk)
+            size += len(chunk)
+        self.buffer += "".join(pieces)
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            self.pos = WHITESPACE_PATTERN.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def peek(self):
+        if self.pos < len(self.buffer) and self.buffer[self.pos] not in " \t\n\r":
+            return self.buffer[self.pos]
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of JSON input")
+        return self.buffer[self.pos]
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON input")
+        self.pos += 1
+
+    def read_string(self):
+        self.expect('"')
+        while True:
+            try:
+                value, end = scanstring(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # The string continues past the buffered input
+                if not self.fill():
+                    raise ValueError("Unterminated string in JSON input")
+                continue
+            self.pos = end
+            return value
+
+    def read_scalar(self):
+        while True:
+            token_end = SCALAR_PATTERN.match(self.buffer, self.pos).end()
+            # A number or literal cut off at the end of the buffer needs more input
+            if token_end == len(self.buffer) and self.fill():
+                continue
+            token = self.buffer[self.pos:token_end]
+            break
+
+        if token in LITERALS:
+            value = LITERALS[token]
+        else:
+            match = NUMBER_PATTERN.fullmatch(token)
+            if not match:
+                raise ValueError(f"Invalid JSON value {token[:20]!r}")
+            value = float(token) if match.group(1) or match.group(2) else int(token)
+        self.pos = token_end
+        return value
+
+
+def iter_flat_json(source, separator=DEFAULT_SEPARATOR, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream a JSON document as flattened (key, value) pairs.
+
+    Keys match flatten_json: nested keys are joined with the separator, dots in
+    keys are escaped and array items get an [index] suffix. Empty objects and
+    arrays are yielded as leaf values.
+
+    Args:
+        source (file, str or bytes): A binary or text file object, or the content itself
+        separator (str): The string used to join nested keys
+        chunk_size (int): How many bytes or characters to read at a time
+
+    Yields:
+        tuple: (flat key, value) pairs in document order
+
+    Raises:
+        ValueError: If the input is not valid JSON
+    """
+    reader = _Reader(source, chunk_size)
+    # Each frame is [is_array, path prefix, next array index]
+    stack = []
+
+    def child_path(frame, key):
+        if frame[0]:
+            path = f"{frame[1] or ''}[{frame[2]}]"
+            frame[2] += 1
+            return path
+        segment = escape_key(key, separator)
+        return segment if frame[1] is None else f"{frame[1]}{separator}{segment}"
+
+    def open_container(char, path):
+        """Push a container, or return its empty value if it closes immediately."""
+        reader.pos += 1
+        closing = "]" if char == "[" else "}"
+        if reader.peek() == closing:
+            reader.pos += 1
+            return [] if char == "[" else {}
+        stack.append([char == "[", path, 0])
+        return None
+
+    char = reader.peek()
+    if char not in "[{":
+        raise ValueError("A JSON locale bundle must be an object or an array")
+    open_container(char, None)
+
+    while stack:
+        frame = stack[-1]
+        key = None
+        if not frame[0]:
+            key = reader.read_string()
+            reader.expect(":")
+        path = child_path(frame, key)
+
+        char = reader.peek()
+        if char in "[{":
+            empty = open_container(char, path)
+            if empty is None:
+                # Descend into the new container
+                continue
+            yield path, empty
+        else:
+            yield path, reader.read_string() if char == '"' else reader.read_scalar()
+
+        # Close every container that ends here
+        while stack:
+            char = reader.peek()
+            if char == ",":
+                reader.pos += 1
+                break
+            closing = "]" if stack[-1][0] else "}"
+            if char != closing:
+                raise ValueError(f"Expected ',' or {closing!r} in JSON input")
+            reader.pos += 1
+            stack.pop()
+
+    reader.skip_whitespace()
+    if reader.pos < len(reader.buffer):
+        raise ValueError("Extra data after the end of the JSON document")
+
+
+class PreviewSampler:
+    """
+    Count streamed pairs and keep a uniform random sample of them for previews.
+
+    Uses reservoir sampling with a fixed seed, so the same file always shows
+    the same preview and memory stays bounded by the sample size.
+    """
+
+    def __init__(self, size=DEFAULT_PREVIEW_SIZE, seed=0):
+        self.size = size
+        self.count = 0
+        self._sample = []
+        self._random = random.Random(seed)
+
+    def observe(self, pairs):
+        """Pass pairs through unchanged while sampling them."""
+        for pair in pairs:
+            if len(self._sample) < self.size:
+                self._sample.append((self.count, pair))
+            else:
+                slot = self._random.randrange(self.count + 1)
+                if slot < self.size:
+                    self._sample[slot] = (self.count, pair)
+            self.count += 1
+            yield pair
+
+    def sample(self):
+        """Return the sampled pairs in document order."""
+        return [pair for _, pair in sorted(self._sample, key=lambda item: item[0])]
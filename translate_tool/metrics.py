@@ -0,0 +1,214 @@
+"""
+Timing spans and counters for a translation run.
+
+Every stage of the pipeline records how long it took in a span, and counts
+what it did in counters, so a slow run can be attributed to GitHub, prompt
+building, the model, response parsing, retries or rate-limit sleeps:
+
+    with metrics.span("model_call", model="gemini-2.0-flash"):
+        ...
+    metrics.count("retries")
+
+RunMetrics is thread-safe. summary() feeds the app's run summary panel and
+to_openmetrics() renders the Prometheus/OpenMetrics text format.
+"""
+
+import contextlib
+import threading
+import time
+from collections import deque
+
+# Pipeline stages, in the order they are reported
+STAGES = ("scan", "fetch", "context_index", "parse", "batch_build", "model_call", "response_parse", "retry", "sleep", "export")
+
+COUNTER_HELP = {
+    "github_calls": "GitHub API requests.",
+    "model_calls": "Model requests, including retries.",
+    "prompt_tokens": "Prompt tokens sent to the model.",
+    "output_tokens": "Tokens in model responses.",
+    "retries": "Model requests repeated after a failure or an unparseable response.",
+    "validation_failures": "Translations rejected by placeholder validation.",
+    "glossary_violations": "Translations that didn't use the required translation of a glossary term.",
+    "fallbacks_to_source": "Strings left in the source language because translation failed.",
+    "timeouts": "Model calls abandoned after their deadline.",
+    "hedged_requests": "Duplicate model calls sent because the first one was slower than usual.",
+    "hedge_wins": "Hedged model calls where the duplicate answered first.",
+    "fallback_tier_calls": "Model calls sent to the fallback tier while the primary's circuit was open.",
+    "circuit_rejections": "Model calls refused because every tier's circuit was open.",
+    "strings_translated": "Strings translated by the model."
+}
+
+# Durations kept per stage for quantiles
+MAX_SAMPLES = 1024
+QUANTILES = (0.5, 0.95)
+
+
+def percentile(values, fraction):
+    """Linear-interpolated percentile of a list of numbers, or None if it is empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _stage_order(stage):
+    return STAGES.index(stage) if stage in STAGES else len(STAGES)
+
+
+class RunMetrics:
+    """
+    Spans and counters of one run.
+
+    Args:
+        max_samples (int): Durations kept per stage and label set for quantiles
+    """
+
+    def __init__(self, max_samples=MAX_SAMPLES):
+        self.max_samples = max_samples
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._last_activity = self._started
+        self._lock = threading.Lock()
+        # (stage, labels) -> {"count", "total", "max", "samples"}
+        self._spans = {}
+        # (name, labels) -> value
+        self._counters = {}
+
+    @contextlib.contextmanager
+    def span(self, stage, **labels):
+        """Time the enclosed block as one occurrence of a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def observe(self, stage, seconds, **labels):
+        """Record a duration for a stage."""
+        key = (stage, _label_key(labels))
+        with self._lock:
+            stats = self._spans.get(key)
+            if stats is None:
+                stats = self._spans[key] = {"count": 0, "total": 0.0, "max": 0.0, "samples": deque(maxlen=self.max_samples)}
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["samples"].append(seconds)
+            self._last_activity = time.perf_counter()
+
+    def count(self, name, value=1, **labels):
+        """Add to a counter."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+            self._last_activity = time.perf_counter()
+
+    def counter(self, name):
+        """Return a counter's total over all its labels."""
+        with self._lock:
+            return sum(value for (counter_name, _), value in self._counters.items() if counter_name == name)
+
+    def elapsed(self):
+        """Seconds from the start of the run to the last thing it recorded."""
+        return self._last_activity - self._started
+
+    def summary(self):
+        """
+        Summarize the run for display.
+
+        Returns:
+            dict: "elapsed_s", "stages" (one row per stage and label set, slowest
+                stages first within pipeline order) and "counters" (totals by name)
+        """
+        with self._lock:
+            spans = [(stage, labels, dict(stats, samples=list(stats["samples"]))) for (stage, labels), stats in self._spans.items()]
+            counters = {}
+            for (name, _), value in self._counters.items():
+                counters[name] = counters.get(name, 0) + value
+
+        stages = []
+        for stage, labels, stats in sorted(spans, key=lambda item: (_stage_order(item[0]), -item[2]["total"])):
+            stages.append({
+                "stage": stage,
+                "labels": dict(labels),
+                "count": stats["count"],
+                "total_s": stats["total"],
+                "p50_ms": percentile(stats["samples"], 0.5) * 1000,
+                "p95_ms": percentile(stats["samples"], 0.95) * 1000,
+                "max_ms": stats["max"] * 1000
+            })
+        return {"elapsed_s": self.elapsed(), "stages": stages, "counters": counters}
+
+    def to_openmetrics(self, prefix="translate_tool"):
+        """
+        Render the spans and counters in the OpenMetrics text format.
+
+        Spans become a summary named <prefix>_stage_seconds with a stage label;
+        each counter becomes <prefix>_<name>_total.
+
+        Returns:
+            str: The exposition text, ending with "# EOF"
+        """
+        with self._lock:
+            spans = sorted(
+                ((stage, labels, stats["count"], stats["total"], list(stats["samples"])) for (stage, labels), stats in self._spans.items()),
+                key=lambda item: (_stage_order(item[0]), item[1])
+            )
+            counters = sorted(self._counters.items())
+
+        family = f"{prefix}_stage_seconds"
+        lines = [
+            f"# TYPE {family} summary",
+            f"# UNIT {family} seconds",
+            f"# HELP {family} Time spent in each pipeline stage."
+        ]
+        for stage, labels, count, total, samples in spans:
+            stage_labels = (("stage", stage),) + labels
+            for quantile in QUANTILES:
+                lines.append(f"{family}{_format_labels(stage_labels, [('quantile', str(quantile))])} {percentile(samples, quantile):.6f}")
+            lines.append(f"{family}_sum{_format_labels(stage_labels)} {total:.6f}")
+            lines.append(f"{family}_count{_format_labels(stage_labels)} {count}")
+
+        declared = set()
+        for (name, labels), value in counters:
+            counter_family = f"{prefix}_{name}"
+            if counter_family not in declared:
+                declared.add(counter_family)
+                lines.append(f"# TYPE {counter_family} counter")
+                if name in COUNTER_HELP:
+                    lines.append(f"# HELP {counter_family} {COUNTER_HELP[name]}")
+            lines.append(f"{counter_family}_total{_format_labels(labels)} {value}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class _NullMetrics(RunMetrics):
+    """Discards everything, for callers that don't collect metrics."""
+
+    def observe(self, stage, seconds, **labels):
+        pass
+
+    def count(self, name, value=1, **labels):
+        pass
+
+
+NULL_METRICS = _NullMetrics()
@@ -0,0 +1,143 @@
+"""
+Placeholder masking and validation around model calls.
+
+Before a string is sent to the model, its format placeholders (%1$d, {count}),
+markup tags (<b>, <xliff:g>), entities and backslash escapes are swapped for
+opaque tokens like ⟦0⟧. After the response comes back the tokens are restored
+and the result is validated per key, so only the keys whose placeholders got
+lost or mangled need to be translated again.
+"""
+
+import re
+from collections import Counter
+
+from translate_tool.string_filters import PLACEHOLDER_PATTERN
+
+TOKEN_FORMAT = "⟦{}⟧"
+TOKEN_PATTERN = re.compile(r"⟦\s*(\d+)\s*⟧")
+
+PROTECTED_PATTERN = re.compile(
+    r"<!\[CDATA\[|\]\]>"              # CDATA markers, whose content is translated
+    r"|<[^<>]+>"                      # markup tags
+    r"|&(?:[a-zA-Z]+|#\d+|#x[0-9a-fA-F]+);"  # XML/HTML entities
+    r"|\\[nt'\"@?\\]"                 # literal backslash escapes
+    r"|" + PLACEHOLDER_PATTERN.pattern
+)
+
+# How many times keys that fail validation are sent back to the model
+VALIDATION_RETRIES = 2
+
+PROMPT_INSTRUCTION = (
+    "Tokens like ⟦0⟧ stand for placeholders or markup: copy every token exactly once, unchanged"
+)
+
+
+def mask_text(text):
+    """
+    Replace placeholders, tags and escapes in a string with opaque tokens.
+
+    Args:
+        text (str): The source text
+
+    Returns:
+        tuple: (masked text, list of the original fragments by token number)
+    """
+    fragments = []
+
+    def replace(match):
+        fragments.append(match.group(0))
+        return TOKEN_FORMAT.format(len(fragments) - 1)
+
+    return PROTECTED_PATTERN.sub(replace, text), fragments
+
+
+def unmask_text(text, fragments):
+    """
+    Restore the original fragments into a masked (translated) string.
+
+    Unknown token numbers are left in place so validation can catch them.
+    """
+    def replace(match):
+        index = int(match.group(1))
+        if index < len(fragments):
+            return fragments[index]
+        return match.group(0)
+
+    return TOKEN_PATTERN.sub(replace, text)
+
+
+def protected_fragments(text):
+    """Return the multiset of placeholders, tags and escapes in a string."""
+    return Counter(match.group(0) for match in PROTECTED_PATTERN.finditer(text))
+
+
+def validate_translation(source, translation):
+    """
+    Check that a translation kept every placeholder, tag and escape of its source.
+
+    Args:
+        source (str): The source text
+        translation (str): The restored translation
+
+    Returns:
+        list: Descriptions of the problems found; empty if the translation is valid
+    """
+    if not isinstance(translation, str) or not translation.strip():
+        return ["empty translation"] if source.strip() else []
+
+    problems = []
+    if TOKEN_PATTERN.search(translation):
+        problems.append("unrestored placeholder token")
+
+    expected = protected_fragments(source)
+    actual = protected_fragments(translation)
+    missing = expected - actual
+    extra = actual - expected
+    if missing:
+        problems.append("missing " + ", ".join(sorted(missing)))
+    if extra:
+        problems.append("unexpected " + ", ".join(sorted(extra)))
+    return problems
+
+
+def mask_strings(texts_dict):
+    """
+    Mask every string in a dictionary.
+
+    Returns:
+        tuple: (dict of masked strings, dict of fragment lists by key)
+    """
+    masked = {}
+    fragments_by_key = {}
+    for key, text in texts_dict.items():
+        masked[key], fragments_by_key[key] = mask_text(text)
+    return masked, fragments_by_key
+
+
+def restore_translations(translations, fragments_by_key, sources):
+    """
+    Unmask model output and validate it against the source strings.
+
+    Args:
+        translations (dict): Masked translations returned by the model
+        fragments_by_key (dict): Fragment lists from mask_strings
+        sources (dict): The unmasked source strings
+
+    Returns:
+        tuple: (dict of valid restored translations, dict of problems for keys that failed)
+    """
+    valid = {}
+    failed = {}
+    for key, translation in translations.items():
+        if key not in sources:
+            continue
+        if not isinstance(translation, str):
+            failed[key] = ["translation is not a string"]
+            continue
+        restored = unmask_text(translation, fragments_by_key.get(key, []))
+        problems = validate_translation(sources[key], restored)
+        if problems:
+            failed[key] = problems
+        else:
+            valid[key] = restored
+    return valid, failed
@@ -0,0 +1,598 @@
+"""
+SQLite-backed persistence for projects, scanned files and translations.
+
+Every translated string is stored as one row per (project, file, key, language),
+so a project can be opened without loading any other project, and saves only
+touch the rows whose value actually changed.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from translate_tool import formats
+
+DEFAULT_DB_PATH = "translator.db"
+
+# File path used for project-wide translations that are not tied to a single file
+PROJECT_SCOPE = ""
+
+# Project sections that are loaded from the store on first access
+LAZY_SECTIONS = ("files", "translations", "file_translations", "contexts", "glossary")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    name TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    repo_url TEXT,
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    project TEXT NOT NULL,
+    path TEXT NOT NULL,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    string_count INTEGER,
+    PRIMARY KEY (project, path)
+);
+
+CREATE TABLE IF NOT EXISTS strings (
+    project TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT,
+    position INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    human_edited INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (project, file_path, lang, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_strings_project_lang ON strings (project, lang);
+
+CREATE TABLE IF NOT EXISTS token_usage (
+    project TEXT NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT NOT NULL,
+    calls INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cost_usd REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (project, language, model)
+);
+
+CREATE TABLE IF NOT EXISTS string_contexts (
+    project TEXT NOT NULL,
+    key TEXT NOT NULL,
+    context TEXT NOT NULL,
+    PRIMARY KEY (project, key)
+);
+
+CREATE TABLE IF NOT EXISTS glossary_terms (
+    project TEXT NOT NULL,
+    term TEXT NOT NULL,
+    language TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    PRIMARY KEY (project, term, language)
+);
+"""
+
+
+def content_hash(content):
+    """Return a stable hash for a file's content."""
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def count_strings(path, content):
+    """Return the number of distinct keys in a file; 0 if it can't be parsed."""
+    try:
+        return len({key for key, _ in formats.read_strings(path, content)})
+    except Exception:
+        return 0
+
+
+class StoredProject(dict):
+    """
+    A project dictionary whose heavy sections are loaded lazily.
+
+    Behaves like the plain project dicts the app has always used ("type",
+    "repo_url", "files", "translations", "file_translations", plus the
+    "contexts" of scanned keys and the "glossary" rows), but the file
+    contents and translations are only read from the store the first time
+    they are accessed.
+    """
+
+    def __init__(self, store, name, meta):
+        super().__init__(meta)
+        self._store = store
+        self._name = name
+
+    def _load(self, section):
+        if section == "files":
+            value = self._store.load_files(self._name)
+        elif section == "translations":
+            value = self._store.load_strings(self._name, PROJECT_SCOPE)
+        elif section == "contexts":
+            value = self._store.load_contexts(self._name)
+        elif section == "glossary":
+            value = self._store.load_glossary(self._name)
+        else:
+            value = self._store.load_file_translations(self._name)
+        dict.__setitem__(self, section, value)
+        return value
+
+    def invalidate(self, section):
+        """Drop a loaded section so it is read from the store again on next access."""
+        dict.pop(self, section, None)
+
+    def __missing__(self, key):
+        if key in LAZY_SECTIONS:
+            return self._load(key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in LAZY_SECTIONS or dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key)
+        if key in LAZY_SECTIONS:
+            return self._load(key)
+        return default
+
+
+class ProjectStore:
+    """
+    Durable project store backed by a single SQLite database.
+
+    A single connection is shared between threads and guarded by a lock, so
+    one instance can serve every Streamlit session in the process.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """Bring databases created by older versions up to the current schema."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(strings)")}
+        if "human_edited" not in columns:
+            self._conn.execute("ALTER TABLE strings ADD COLUMN human_edited INTEGER NOT NULL DEFAULT 0")
+        # Counts of older rows are filled in by load_string_counts
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(files)")}
+        if "string_count" not in columns:
+            self._conn.execute("ALTER TABLE files ADD COLUMN string_count INTEGER")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # Projects
+
+    def load_projects(self):
+        """
+        Load the list of projects without any of their files or translations.
+
+        Returns:
+            dict: A dictionary mapping project names to lazily loaded projects
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, type, repo_url FROM projects ORDER BY created_at"
+            ).fetchall()
+
+        projects = {}
+        for name, project_type, repo_url in rows:
+            meta = {"type": project_type}
+            if repo_url:
+                meta["repo_url"] = repo_url
+            projects[name] = StoredProject(self, name, meta)
+        return projects
+
+    def create_project(self, name, project_type, repo_url=None):
+        """
+        Create a project, replacing any existing project with the same name.
+
+        Returns:
+            StoredProject: The new, empty project
+        """
+        with self._lock, self._conn:
+            self._delete_project_rows(name)
+            self._conn.execute(
+                "INSERT INTO projects (name, type, repo_url, created_at) VALUES (?, ?, ?, ?)",
+                (name, project_type, repo_url, time.time())
+            )
+
+        project = StoredProject(self, name, {"type": project_type})
+        if repo_url:
+            project["repo_url"] = repo_url
+        dict.update(project, {"files": {}, "translations": {}, "file_translations": {}, "contexts": {}, "glossary": []})
+        return project
+
+    def delete_project(self, name):
+        with self._lock, self._conn:
+            self._delete_project_rows(name)
+
+    def _delete_project_rows(self, name):
+        self._conn.execute("DELETE FROM strings WHERE project = ?", (name,))
+        self._conn.execute("DELETE FROM token_usage WHERE project = ?", (name,))
+        self._conn.execute("DELETE FROM string_contexts WHERE project = ?", (name,))
+        self._conn.execute("DELETE FROM glossary_terms WHERE project = ?", (name,))
+        self._conn.execute("DELETE FROM files WHERE project = ?", (name,))
+        self._conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+
+    def project_summary(self, name):
+        """
+        Summarize a project without loading its content.
+
+        Returns:
+            dict: File count and the languages that have translations
+        """
+        with self._lock:
+            file_count = self._conn.execute(
+                "SELECT COUNT(*) FROM files WHERE project = ?", (name,)
+            ).fetchone()[0]
+            languages = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT lang FROM strings WHERE project = ? AND file_path = ?",
+                (name, PROJECT_SCOPE)
+            )]
+        return {"file_count": file_count, "languages": languages}
+
+    def projects_with_translations(self):
+        """Return the names of projects that have at least one stored string."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM projects WHERE EXISTS "
+                "(SELECT 1 FROM strings WHERE strings.project = projects.name) "
+                "ORDER BY created_at"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # Files
+
+    def load_files(self, project):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, content FROM files WHERE project = ? ORDER BY rowid", (project,)
+            ).fetchall()
+        return dict(rows)
+
+    def save_files(self, project, files):
+        """
+        Store the scanned files of a project.
+
+        Only files whose content hash changed are rewritten, and files that
+        are no longer present are removed. Each rewritten file's string count
+        is stored with it, so listing files never parses them.
+
+        Returns:
+            int: The number of rows written or deleted
+        """
+        with self._lock, self._conn:
+            existing = dict(self._conn.execute(
+                "SELECT path, content_hash FROM files WHERE project = ?", (project,)
+            ).fetchall())
+
+            upserts = []
+            for path, content in files.items():
+                digest = content_hash(content)
+                if existing.get(path) != digest:
+                    upserts.append((project, path, content, digest, count_strings(path, content)))
+            removed = [(project, path) for path in existing if path not in files]
+
+            self._conn.executemany(
+                "INSERT INTO files (project, path, content, content_hash, string_count) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (project, path) DO UPDATE SET "
+                "content = excluded.content, content_hash = excluded.content_hash, string_count = excluded.string_count",
+                upserts
+            )
+            self._conn.executemany("DELETE FROM files WHERE project = ? AND path = ?", removed)
+        return len(upserts) + len(removed)
+
+    def load_string_counts(self, project):
+        """
+        Return the number of strings in each file of a project, without loading the files.
+
+        Files stored before counts were kept are counted once and updated.
+
+        Returns:
+            dict: File path to its string count
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, string_count FROM files WHERE project = ? ORDER BY rowid", (project,)
+            ).fetchall()
+        counts = dict(rows)
+        missing = [path for path, count in rows if count is None]
+        if missing:
+            updates = []
+            for path in missing:
+                with self._lock:
+                    content = self._conn.execute(
+                        "SELECT content FROM files WHERE project = ? AND path = ?", (project, path)
+                    ).fetchone()[0]
+                counts[path] = count_strings(path, content)
+                updates.append((counts[path], project, path))
+            with self._lock, self._conn:
+                self._conn.executemany("UPDATE files SET string_count = ? WHERE project = ? AND path = ?", updates)
+        return counts
+
+    # String contexts
+
+    def load_contexts(self, project):
+        """Return where each key of a project is used in its sources, as key to context."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, context FROM string_contexts WHERE project = ?", (project,)
+            ).fetchall()
+        return dict(rows)
+
+    def save_contexts(self, project, contexts):
+        """Replace the contexts of a project's keys with those of its latest scan."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM string_contexts WHERE project = ?", (project,))
+            self._conn.executemany(
+                "INSERT INTO string_contexts (project, key, context) VALUES (?, ?, ?)",
+                [(project, key, context) for key, context in contexts.items()]
+            )
+
+    # Glossary
+
+    def load_glossary(self, project):
+        """
+        Return a project's glossary.
+
+        Returns:
+            list: Dicts with "term", "language" ("" for every language) and
+                "translation" ("" to keep the term as is), sorted by term
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT term, language, translation FROM glossary_terms WHERE project = ? ORDER BY term, language",
+                (project,)
+            ).fetchall()
+        return [{"term": term, "language": language, "translation": translation} for term, language, translation in rows]
+
+    def save_glossary(self, project, rows):
+        """Replace a project's glossary with rows like those of load_glossary."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM glossary_terms WHERE project = ?", (project,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO glossary_terms (project, term, language, translation) VALUES (?, ?, ?, ?)",
+                [(project, row["term"], row.get("language") or "", row.get("translation") or "") for row in rows]
+            )
+
+    # Strings
+
+    def load_strings(self, project, file_path=PROJECT_SCOPE, lang=None):
+        """
+        Load the strings stored for one file of a project.
+
+        Args:
+            project (str): The project name
+            file_path (str): The file path, or PROJECT_SCOPE for project-wide translations
+            lang (str): Optionally restrict the result to a single language
+
+        Returns:
+            dict: A dictionary mapping language codes to {key: value} dictionaries
+        """
+        query = "SELECT lang, key, value FROM strings WHERE project = ? AND file_path = ?"
+        params = [project, file_path]
+        if lang is not None:
+            query += " AND lang = ?"
+            params.append(lang)
+        query += " ORDER BY lang, position"
+
+        result = {}
+        with self._lock:
+            for row_lang, key, value in self._conn.execute(query, params):
+                result.setdefault(row_lang, {})[key] = value
+        return result
+
+    def load_file_translations(self, project):
+        """
+        Load every file-specific translation of a project.
+
+        Returns:
+            dict: A dictionary mapping file paths to {lang: {key: value}} dictionaries
+        """
+        result = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT file_path, lang, key, value FROM strings "
+                "WHERE project = ? AND file_path != ? ORDER BY file_path, lang, position",
+                (project, PROJECT_SCOPE)
+            )
+            for file_path, lang, key, value in rows:
+                result.setdefault(file_path, {}).setdefault(lang, {})[key] = value
+        return result
+
+    def save_strings(self, project, file_path, lang, strings, replace=True, human_edited=False):
+        """
+        Incrementally save the strings of one file and language.
+
+        Rows are only written when their value changed. With replace=True the
+        given dictionary is treated as the complete set of keys, and stored keys
+        that are missing from it are deleted.
+
+        Rows a reviewer edited by hand are never overwritten or deleted by a
+        machine save (human_edited=False).
+
+        Args:
+            project (str): The project name
+            file_path (str): The file path, or PROJECT_SCOPE for project-wide translations
+            lang (str): The language code
+            strings (dict): A dictionary of string keys and values
+            replace (bool): Whether keys missing from strings should be deleted
+            human_edited (bool): Whether these values were entered by a reviewer
+
+        Returns:
+            int: The number of rows written or deleted
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            existing = {
+                key: (value, position, edited) for key, value, position, edited in self._conn.execute(
+                    "SELECT key, value, position, human_edited FROM strings "
+                    "WHERE project = ? AND file_path = ? AND lang = ?",
+                    (project, file_path, lang)
+                )
+            }
+            next_position = max((entry[1] for entry in existing.values()), default=-1) + 1
+
+            upserts = []
+            for index, (key, value) in enumerate(strings.items()):
+                if value is not None and not isinstance(value, str):
+                    value = str(value)
+                if key in existing:
+                    if not human_edited and existing[key][2]:
+                        continue
+                    if existing[key][0] == value and existing[key][2] >= int(human_edited):
+                        continue
+                    position = existing[key][1]
+                else:
+                    position = index if replace else next_position
+                    next_position = max(next_position, position) + 1
+                upserts.append((project, file_path, lang, key, value, position, now, int(human_edited)))
+
+            removed = []
+            if replace:
+                removed = [
+                    (project, file_path, lang, key) for key, entry in existing.items()
+                    if key not in strings and (human_edited or not entry[2])
+                ]
+
+            self._conn.executemany(
+                "INSERT INTO strings (project, file_path, lang, key, value, position, updated_at, human_edited) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project, file_path, lang, key) DO UPDATE SET "
+                "value = excluded.value, updated_at = excluded.updated_at, "
+                "human_edited = MAX(strings.human_edited, excluded.human_edited)",
+                upserts
+            )
+            self._conn.executemany(
+                "DELETE FROM strings WHERE project = ? AND file_path = ? AND lang = ? AND key = ?",
+                removed
+            )
+        return len(upserts) + len(removed)
+
+    def append_strings(self, project, file_path, lang, pairs, batch_size=5000):
+        """
+        Stream (key, value) pairs into the store without building a dictionary.
+
+        Pairs are written in batches inside a single transaction, after any
+        strings already stored for the file and language. Rows a reviewer
+        edited by hand are left untouched.
+
+        Args:
+            project (str): The project name
+            file_path (str): The file path, or PROJECT_SCOPE for project-wide translations
+            lang (str): The language code
+            pairs: An iterable of (key, value) pairs
+            batch_size (int): How many rows to insert per statement
+
+        Returns:
+            int: The number of pairs read
+        """
+        now = time.time()
+        count = 0
+        with self._lock, self._conn:
+            next_position = self._conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM strings "
+                "WHERE project = ? AND file_path = ? AND lang = ?",
+                (project, file_path, lang)
+            ).fetchone()[0]
+
+            batch = []
+            for key, value in pairs:
+                if value is not None and not isinstance(value, str):
+                    value = str(value)
+                batch.append((project, file_path, lang, key, value, next_position + count, now))
+                count += 1
+                if len(batch) >= batch_size:
+                    self._insert_strings(batch)
+                    batch = []
+            if batch:
+                self._insert_strings(batch)
+        return count
+
+    def _insert_strings(self, rows):
+        self._conn.executemany(
+            "INSERT INTO strings (project, file_path, lang, key, value, position, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (project, file_path, lang, key) DO UPDATE SET "
+            "value = excluded.value, updated_at = excluded.updated_at "
+            "WHERE strings.human_edited = 0",
+            rows
+        )
+
+    def load_human_edited(self, project, file_path, lang):
+        """
+        Return the keys a reviewer edited by hand for one file and language.
+
+        Returns:
+            set: The human-edited keys
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM strings WHERE project = ? AND file_path = ? AND lang = ? AND human_edited = 1",
+                (project, file_path, lang)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    # Token usage
+
+    def record_usage(self, project, rows):
+        """
+        Add the token usage of a run to a project's running totals.
+
+        Args:
+            project (str): The project name
+            rows (list): UsageLedger.totals(by=("language", "model")) rows
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO token_usage (project, language, model, calls, prompt_tokens, output_tokens, cost_usd, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (project, language, model) DO UPDATE SET "
+                "calls = calls + excluded.calls, prompt_tokens = prompt_tokens + excluded.prompt_tokens, "
+                "output_tokens = output_tokens + excluded.output_tokens, cost_usd = cost_usd + excluded.cost_usd, "
+                "updated_at = excluded.updated_at",
+                [
+                    (project, row["language"] or "", row["model"], row["calls"], row["prompt_tokens"],
+                     row["output_tokens"], row["cost_usd"], now)
+                    for row in rows
+                ]
+            )
+
+    def load_usage(self, project):
+        """
+        Return a project's token usage so far, per language and model.
+
+        Returns:
+            list: Dicts with "language", "model", "calls", "prompt_tokens", "output_tokens" and "cost_usd"
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT language, model, calls, prompt_tokens, output_tokens, cost_usd FROM token_usage "
+                "WHERE project = ? ORDER BY language, model",
+                (project,)
+            ).fetchall()
+        return [
+            {"language": language, "model": model, "calls": calls, "prompt_tokens": prompt_tokens,
+             "output_tokens": output_tokens, "cost_usd": cost_usd}
+            for language, model, calls, prompt_tokens, output_tokens, cost_usd in rows
+        ]
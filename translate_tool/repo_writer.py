@@ -0,0 +1,299 @@
+"""
+Write translated locale files back to the scanned repository.
+
+Generated `values-<lang>/strings.xml` files are placed next to the source
+`values/strings.xml` that the scan found, and every changed file goes into a
+single commit. Files are compared by git blob hash against the target tree, so
+unchanged files are never re-uploaded. GitHub truncates recursive tree listings
+of very large repositories; the comparison then falls back to listing only the
+directories the locale files live in.
+
+Two targets share the same interface: GitHubTarget uses the existing PyGithub
+client, LocalGitTarget writes to a local (optionally bare) git repository.
+"""
+
+import hashlib
+import os
+import subprocess
+import tempfile
+
+DEFAULT_COMMIT_MESSAGE = "Update translations"
+
+
+def git_blob_sha(content):
+    """
+    Compute the git blob SHA of file content without touching a repository.
+
+    Args:
+        content (str or bytes): The file content
+
+    Returns:
+        str: The hex SHA-1 git would assign to the blob
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    header = f"blob {len(content)}\0".encode("ascii")
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def android_qualifier(lang_code):
+    """
+    Convert a language code to an Android resource qualifier.
+
+    Region subtags use Android's "r" prefix, e.g. "zh-CN" becomes "zh-rCN".
+    """
+    if "-" in lang_code:
+        language, region = lang_code.split("-", 1)
+        return f"{language}-r{region}"
+    return lang_code
+
+
+def locale_path_for(source_path, lang_code):
+    """
+    Return the path of a language's resource file next to its source file.
+
+    Handles Android/Compose `values/strings.xml` and moko-resources
+    `MR/base/strings.xml` layouts.
+
+    Args:
+        source_path (str): The path of the default-language strings.xml
+        lang_code (str): The language code
+
+    Returns:
+        str: The locale file path, or None if the layout isn't recognized
+    """
+    parts = source_path.split("/")
+    if len(parts) < 2:
+        return None
+
+    if parts[-2] == "values":
+        parts[-2] = f"values-{android_qualifier(lang_code)}"
+    elif parts[-2] == "base" and len(parts) >= 3 and parts[-3] == "MR":
+        parts[-2] = lang_code
+    else:
+        return None
+    return "/".join(parts)
+
+
+def plan_locale_files(translations_by_file, render, source_language="en"):
+    """
+    Build the locale files to write for each translated source file.
+
+    Args:
+        translations_by_file (dict): Source file path to {lang: {key: value}}
+        render: Function (source_path, lang_code, translations) returning file content
+        source_language (str): The language that is not written back
+
+    Returns:
+        dict: A dictionary mapping repository paths to file content
+    """
+    files = {}
+    for source_path, languages in translations_by_file.items():
+        for lang_code, translations in languages.items():
+            if lang_code == source_language or not translations:
+                continue
+            target_path = locale_path_for(source_path, lang_code)
+            if target_path:
+                files[target_path] = render(source_path, lang_code, translations)
+    return files
+
+
+def changed_files(target, files):
+    """
+    Keep only the files whose content differs from the target branch.
+
+    Args:
+        target: A GitHubTarget or LocalGitTarget
+        files (dict): Repository paths to file content
+
+    Returns:
+        dict: The files that are new or changed
+    """
+    existing = target.blob_shas(files)
+    return {
+        path: content for path, content in files.items()
+        if existing.get(path) != git_blob_sha(content)
+    }
+
+
+def commit_locale_files(target, files, message=DEFAULT_COMMIT_MESSAGE):
+    """
+    Commit the changed locale files to the target in a single commit.
+
+    Returns:
+        dict: {"changed": [paths], "commit": sha or None, "url": pull request URL or None}
+    """
+    changed = changed_files(target, files)
+    if not changed:
+        return {"changed": [], "commit": None, "url": None}
+    result = target.commit(changed, message)
+    result["changed"] = sorted(changed)
+    return result
+
+
+class GitHubTarget:
+    """
+    Commit to a GitHub repository through the git data API.
+
+    Args:
+        repo: A PyGithub Repository
+        branch (str): The branch to compare against and commit to
+        pull_request_branch (str): If set, commit to this new branch and open
+            a pull request into branch instead of updating branch directly
+    """
+
+    def __init__(self, repo, branch, pull_request_branch=None):
+        self.repo = repo
+        self.branch = branch
+        self.pull_request_branch = pull_request_branch
+        self._base_sha = None
+
+    @property
+    def base_sha(self):
+        if self._base_sha is None:
+            self._base_sha = self.repo.get_branch(self.branch).commit.sha
+        return self._base_sha
+
+    def blob_shas(self, paths=None):
+        """
+        Return the blob SHA of files on the branch.
+
+        One recursive tree call covers most repositories. When GitHub truncates
+        it, the directories holding paths are listed one level at a time instead.
+
+        Args:
+            paths: The repository paths of interest, or None for every file
+
+        Returns:
+            dict: Paths to blob SHAs; a path missing from the branch is absent
+        """
+        tree = self.repo.get_git_tree(self.base_sha, recursive=True)
+        if not tree.raw_data.get("truncated"):
+            return {element.path: element.sha for element in tree.tree if element.type == "blob"}
+
+        listings = {}
+
+        def listing(directory):
+            # Non-recursive listings name entries relative to their directory
+            if directory not in listings:
+                if directory:
+                    parent, _, name = directory.rpartition("/")
+                    entry = listing(parent).get(name)
+                    sha = entry.sha if entry is not None and entry.type == "tree" else None
+                else:
+                    sha = self.base_sha
+                entries = self.repo.get_git_tree(sha).tree if sha else []
+                listings[directory] = {element.path: element for element in entries}
+            return listings[directory]
+
+        if paths is None:
+            shas = {}
+            pending = [""]
+            while pending:
+                directory = pending.pop()
+                for name, element in listing(directory).items():
+                    path = f"{directory}/{name}" if directory else name
+                    if element.type == "tree":
+                        pending.append(path)
+                    elif element.type == "blob":
+                        shas[path] = element.sha
+            return shas
+
+        shas = {}
+        for path in paths:
+            directory, _, name = path.rpartition("/")
+            element = listing(directory).get(name)
+            if element is not None and element.type == "blob":
+                shas[path] = element.sha
+        return shas
+
+    def commit(self, files, message):
+        from github import InputGitTreeElement
+
+        elements = []
+        for path, content in sorted(files.items()):
+            blob = self.repo.create_git_blob(content, "utf-8")
+            elements.append(InputGitTreeElement(path, "100644", "blob", sha=blob.sha))
+
+        base_commit = self.repo.get_git_commit(self.base_sha)
+        tree = self.repo.create_git_tree(elements, base_tree=base_commit.tree)
+        new_commit = self.repo.create_git_commit(message, tree, [base_commit])
+
+        if self.pull_request_branch:
+            self.repo.create_git_ref(f"refs/heads/{self.pull_request_branch}", new_commit.sha)
+            pull = self.repo.create_pull(
+                title=message,
+                body=f"Updates {len(files)} locale files.",
+                base=self.branch,
+                head=self.pull_request_branch
+            )
+            return {"commit": new_commit.sha, "url": pull.html_url}
+
+        self.repo.get_git_ref(f"heads/{self.branch}").edit(new_commit.sha)
+        return {"commit": new_commit.sha, "url": None}
+
+
+class LocalGitTarget:
+    """
+    Commit to a branch of a local git repository using plumbing commands.
+
+    Works on bare repositories and never touches a working tree, so it can
+    stand in for GitHub when testing.
+
+    Args:
+        repo_path (str): Path to the repository (bare or the .git directory's parent)
+        branch (str): The branch to commit to
+    """
+
+    def __init__(self, repo_path, branch):
+        self.repo_path = repo_path
+        self.branch = branch
+
+    def _git(self, *args, input_bytes=None, env=None):
+        result = subprocess.run(
+            ["git", "-C", self.repo_path, *args],
+            input=input_bytes,
+            capture_output=True,
+            env=env,
+            check=True
+        )
+        return result.stdout.decode("utf-8").strip()
+
+    def _base_sha(self):
+        try:
+            return self._git("rev-parse", "--verify", "--quiet", f"refs/heads/{self.branch}")
+        except subprocess.CalledProcessError:
+            return None
+
+    def blob_shas(self, paths=None):
+        # One ls-tree lists the whole branch, so paths doesn't need to narrow it
+        base = self._base_sha()
+        if not base:
+            return {}
+        shas = {}
+        for line in self._git("ls-tree", "-r", "-z", base).split("\0"):
+            if not line:
+                continue
+            meta, path = line.split("\t", 1)
+            mode, object_type, sha = meta.split()
+            if object_type == "blob":
+                shas[path] = sha
+        return shas
+
+    def commit(self, files, message):
+        base = self._base_sha()
+        with tempfile.TemporaryDirectory() as tmp:
+            # A throwaway index keeps the repository's own index untouched
+            env = dict(os.environ, GIT_INDEX_FILE=os.path.join(tmp, "index"))
+            if base:
+                self._git("read-tree", base, env=env)
+            for path, content in sorted(files.items()):
+                data = content.encode("utf-8") if isinstance(content, str) else content
+                sha = self._git("hash-object", "-w", "--stdin", input_bytes=data)
+                self._git("update-index", "--add", "--cacheinfo", f"100644,{sha},{path}", env=env)
+            tree = self._git("write-tree", env=env)
+
+        parents = ["-p", base] if base else []
+        commit_sha = self._git("commit-tree", tree, *parents, "-m", message)
+        self._git("update-ref", f"refs/heads/{self.branch}", commit_sha, *([base] if base else []))
+        return {"commit": commit_sha, "url": None}
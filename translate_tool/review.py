@@ -0,0 +1,71 @@
+"""
+Server-side sorting and pagination for the Translation Review page.
+
+Large string sets are never handed to the browser in full; only the rows of
+the visible page are turned into a table.
+"""
+
+DEFAULT_PAGE_SIZE = 100
+PAGE_SIZES = [50, 100, 250, 500]
+
+SORT_OPTIONS = ["File order", "Key", "Original", "Translation"]
+
+
+def sort_review_keys(keys, source, translations, sort_by="File order", descending=False):
+    """
+    Sort keys by one of the review columns.
+
+    Returns:
+        list: The sorted keys
+    """
+    if sort_by == "Key":
+        sort_key = str.casefold
+    elif sort_by == "Original":
+        sort_key = lambda key: str(source.get(key, "")).casefold()
+    elif sort_by == "Translation":
+        sort_key = lambda key: str(translations.get(key, "")).casefold()
+    else:
+        return list(reversed(keys)) if descending else list(keys)
+    return sorted(keys, key=sort_key, reverse=descending)
+
+
+def paginate(keys, page, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Select one page of keys.
+
+    Args:
+        keys (list): All keys after filtering and sorting
+        page (int): The 1-based page number; clamped to the available pages
+        page_size (int): Number of rows per page
+
+    Returns:
+        tuple: (keys on the page, clamped page number, total number of pages)
+    """
+    total_pages = max(1, (len(keys) + page_size - 1) // page_size)
+    page = min(max(1, int(page)), total_pages)
+    start = (page - 1) * page_size
+    return keys[start:start + page_size], page, total_pages
+
+
+def build_review_rows(page_keys, translations, source=None):
+    """
+    Build the table columns for one page of the review editor.
+
+    Args:
+        page_keys (list): The keys on the visible page
+        translations (dict): The strings of the language under review
+        source (dict): The source strings, or None when reviewing the source language
+
+    Returns:
+        dict: Column name to list of values
+    """
+    if source is None:
+        return {
+            "Key": list(page_keys),
+            "Value": [translations.get(key, "") for key in page_keys]
+        }
+    return {
+        "Key": list(page_keys),
+        "Original": [source.get(key, "") for key in page_keys],
+        "Translation": [translations.get(key, "") for key in page_keys]
+    }
@@ -0,0 +1,107 @@
+"""
+Trigram search index for the Translation Review page.
+
+The index is built once per project, file and language and updated in place
+when translations are saved, so searching does not rescan every string on
+each rerun. Queries are always treated as literal text, never as regexes.
+"""
+
+from collections import defaultdict
+
+NGRAM = 3
+
+# Minimum share of a query's trigrams a row must contain to count as a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+
+def trigrams(text):
+    """
+    Return the set of trigrams in a casefolded string.
+
+    Text shorter than a trigram is padded so it still produces one gram.
+    """
+    padded = f" {text} " if len(text) < NGRAM else text
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+class SearchIndex:
+    """
+    An inverted trigram index over the searchable fields of each key.
+
+    Args:
+        rows (dict): A dictionary mapping keys to lists of searchable fields
+    """
+
+    def __init__(self, rows=None):
+        self._documents = {}
+        self._positions = {}
+        self._postings = defaultdict(set)
+        for key, fields in (rows or {}).items():
+            self.update(key, fields)
+
+    def __len__(self):
+        return len(self._documents)
+
+    def update(self, key, fields):
+        """Add a key or replace its indexed fields."""
+        document = "\n".join("" if field is None else str(field) for field in fields).casefold()
+        previous = self._documents.get(key)
+        if previous == document:
+            return
+        if previous is not None:
+            for gram in trigrams(previous):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(key)
+                    if not postings:
+                        del self._postings[gram]
+        else:
+            self._positions[key] = len(self._positions)
+
+        self._documents[key] = document
+        for gram in trigrams(document):
+            self._postings[gram].add(key)
+
+    def search(self, query, fuzzy=False):
+        """
+        Find the keys whose fields match a query.
+
+        Args:
+            query (str): The search text, matched literally and case-insensitively
+            fuzzy (bool): Whether to rank rows by trigram overlap instead of
+                requiring an exact substring match
+
+        Returns:
+            list: Matching keys, in index order for literal queries and by
+                descending similarity for fuzzy ones
+        """
+        needle = query.casefold()
+        if not needle:
+            return sorted(self._documents, key=self._positions.get)
+        if fuzzy:
+            return self._fuzzy_search(needle)
+
+        if len(needle) < NGRAM:
+            candidates = self._documents.keys()
+        else:
+            grams = sorted(trigrams(needle), key=lambda gram: len(self._postings.get(gram, ())))
+            candidates = set(self._postings.get(grams[0], ()))
+            for gram in grams[1:]:
+                if not candidates:
+                    break
+                candidates &= self._postings.get(gram, set())
+
+        matches = [key for key in candidates if needle in self._documents[key]]
+        return sorted(matches, key=self._positions.get)
+
+    def _fuzzy_search(self, needle):
+        grams = trigrams(needle)
+        scores = defaultdict(int)
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                scores[key] += 1
+
+        minimum = max(1, int(len(grams) * FUZZY_THRESHOLD + 0.5))
+        ranked = [(count, key) for key, count in scores.items() if count >= minimum]
+        ranked.sort(key=lambda item: (-item[0], self._positions[item[1]]))
+        return [key for _, key in ranked]
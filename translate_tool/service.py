@@ -0,0 +1,507 @@
+"""
+HTTP translation service for build tools.
+
+A small ASGI application around Translator.batch_translate_texts. Callers
+submit jobs and poll for the result:
+
+    POST   /jobs       {"language": "French", "strings": {"key": "text"},
+                        "contexts": {"key": "..."}, "skip_keys": ["key"]}
+                       -> 202 {"id": ..., "status": "queued", ...}
+    GET    /jobs/<id>  -> the job's status and progress, plus "translations"
+                          once it is done
+    DELETE /jobs/<id>  -> forget a job
+    GET    /health     -> queue, coalescing and circuit breaker statistics
+    GET    /metrics    -> stage timings and counters in OpenMetrics format
+
+Strings from all jobs go through one BatchCoalescer. Identical (text,
+language, context) requests that are queued or in flight at the same time
+share a single model call, and pending strings are grouped into full prompt
+batches, waiting at most max_wait seconds for a batch to fill up.
+
+Run it with any ASGI server:
+
+    uvicorn --factory translate_tool.service:create_app
+
+or without extra dependencies with `python -m translate_tool serve`.
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from translate_tool.backends import FALLBACK_MODEL, GeminiBackend, configure_gemini, create_backend
+from translate_tool.core import BATCH_SIZE, CALL_TIMEOUT, LoggingReporter, Translator
+from translate_tool.metrics import NULL_METRICS, RunMetrics
+from translate_tool.shared_cache import TranslationMemory
+from translate_tool.string_filters import split_translatable
+
+# Longest time a string waits for its batch to fill up, in seconds
+MAX_WAIT = 0.05
+# Prompt batches sent to the model at once
+MAX_IN_FLIGHT = 4
+# Finished jobs are forgotten after this many seconds
+JOB_TTL = 3600
+# Largest accepted request body
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+OPENMETRICS_CONTENT_TYPE = b"application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+STATUS_TEXT = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+class BatchCoalescer:
+    """
+    Shares model calls between concurrent translation requests.
+
+    Each distinct (language, text, context) is translated once no matter how
+    many callers ask for it while it is queued or in flight. Queued strings of
+    a language are sent as one batch as soon as batch_size of them are
+    waiting, or max_wait seconds after the first one arrived.
+
+    Args:
+        translator (Translator): Translates each batch
+        batch_size (int): Strings per prompt
+        max_wait (float): Seconds a partial batch waits before it is sent
+        max_in_flight (int): Batches translated at once
+    """
+
+    def __init__(self, translator, batch_size=BATCH_SIZE, max_wait=MAX_WAIT, max_in_flight=MAX_IN_FLIGHT):
+        self.translator = translator
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="translate")
+        # Per language: (text, context) -> future, in arrival order
+        self._queues = {}
+        self._timers = {}
+        # (language, text, context) -> future, for everything queued or in flight
+        self._futures = {}
+        self._in_flight = 0
+        self.requested = 0
+        self.coalesced = 0
+        self.batches = 0
+
+    def translate(self, text, language, context=""):
+        """
+        Queue a string for translation.
+
+        Returns:
+            asyncio.Future: Resolves to the translation
+        """
+        self.requested += 1
+        key = (language, text, context)
+        future = self._futures.get(key)
+        if future is not None:
+            self.coalesced += 1
+            self.translator.metrics.count("coalesced_requests")
+            return future
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        queue = self._queues.setdefault(language, OrderedDict())
+        queue[(text, context)] = future
+        if len(queue) >= self.batch_size:
+            self._flush(language)
+        elif language not in self._timers:
+            self._timers[language] = asyncio.get_running_loop().call_later(self.max_wait, self._flush, language)
+        return future
+
+    def _flush(self, language):
+        timer = self._timers.pop(language, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._queues.get(language)
+        while queue:
+            batch = [queue.popitem(last=False) for _ in range(min(self.batch_size, len(queue)))]
+            asyncio.get_running_loop().create_task(self._run_batch(language, batch))
+        self._queues.pop(language, None)
+
+    async def _run_batch(self, language, batch):
+        # Keys only need to be unique within the prompt
+        texts = {f"s{index}": text for index, ((text, _), _) in enumerate(batch)}
+        contexts = {f"s{index}": context for index, ((_, context), _) in enumerate(batch) if context}
+        self.batches += 1
+        self._in_flight += 1
+        try:
+            translations = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.translator.batch_translate_texts, texts, language, contexts
+            )
+            error = None
+        except Exception as e:
+            translations, error = {}, e
+        finally:
+            self._in_flight -= 1
+
+        for index, ((text, context), future) in enumerate(batch):
+            self._futures.pop((language, text, context), None)
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                # batch_translate_texts falls back to the source text for strings it couldn't translate
+                future.set_result(translations.get(f"s{index}", text))
+
+    def stats(self):
+        return {
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "in_flight_batches": self._in_flight,
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "batches": self.batches
+        }
+
+    def close(self):
+        for timer in self._timers.values():
+            timer.cancel()
+        # Batches in flight stop waiting for the model, and queued ones never start
+        self.translator.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class TranslationJob:
+    """A submitted set of strings and their progress."""
+
+    def __init__(self, language, strings, contexts, skip_keys):
+        self.id = uuid.uuid4().hex
+        self.language = language
+        self.strings = strings
+        self.contexts = contexts
+        self.skip_keys = skip_keys
+        self.status = "queued"
+        self.done = 0
+        self.translations = {}
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+
+    def to_dict(self):
+        result = {
+            "id": self.id,
+            "status": self.status,
+            "language": self.language,
+            "total": len(self.strings),
+            "done": self.done,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+        if self.status == "done":
+            result["translations"] = self.translations
+        if self.error:
+            result["error"] = self.error
+        return result
+
+
+class TranslationService:
+    """
+    The ASGI application.
+
+    Args:
+        translator (Translator): Translates the coalesced batches
+        translation_memory: Optional TranslationMemory consulted before queueing
+        batch_size (int): Strings per prompt
+        max_wait (float): Seconds a partial batch waits before it is sent
+        max_in_flight (int): Batches translated at once
+    """
+
+    def __init__(self, translator, translation_memory=None, batch_size=BATCH_SIZE, max_wait=MAX_WAIT, max_in_flight=MAX_IN_FLIGHT):
+        if translator.metrics is NULL_METRICS:
+            # The service always collects metrics for /metrics
+            translator.metrics = RunMetrics()
+        self.metrics = translator.metrics
+        self.coalescer = BatchCoalescer(translator, batch_size, max_wait, max_in_flight)
+        self.translation_memory = translation_memory
+        self.jobs = OrderedDict()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method = scope["method"]
+        parts = [part for part in scope["path"].split("/") if part]
+        if parts == ["metrics"] and method == "GET":
+            await send_text(send, 200, self.metrics.to_openmetrics(), OPENMETRICS_CONTENT_TYPE)
+            return
+        if parts == ["health"] and method == "GET":
+            status, payload = 200, {"status": "ok", "jobs": len(self.jobs), **self.coalescer.stats(), "circuits": self.circuit_stats()}
+        elif parts == ["jobs"] and method == "POST":
+            status, payload = await self._submit(receive)
+        elif len(parts) == 2 and parts[0] == "jobs" and method in ("GET", "DELETE"):
+            job = self.jobs.get(parts[1])
+            if job is None:
+                status, payload = 404, {"error": "Job not found"}
+            elif method == "DELETE":
+                del self.jobs[job.id]
+                status, payload = 200, {"id": job.id, "status": "deleted"}
+            else:
+                status, payload = 200, job.to_dict()
+        elif parts in (["health"], ["metrics"]) or parts and parts[0] == "jobs":
+            status, payload = 405, {"error": "Method not allowed"}
+        else:
+            status, payload = 404, {"error": "Not found"}
+        await send_json(send, status, payload)
+
+    def circuit_stats(self):
+        """Return the circuit breaker state of each model tier."""
+        translator = self.coalescer.translator
+        circuits = {translator.backend.batch_model: translator.breaker.stats()}
+        if translator.fallback_backend is not None:
+            circuits[translator.fallback_backend.batch_model] = translator.fallback_breaker.stats()
+        return circuits
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _submit(self, receive):
+        try:
+            body = await read_body(receive)
+        except ValueError as e:
+            return 413, {"error": str(e)}
+        try:
+            request = json.loads(body or b"{}")
+            language = request["language"]
+            strings = request["strings"]
+            contexts = request.get("contexts") or {}
+            skip_keys = request.get("skip_keys") or []
+            if not isinstance(language, str) or not isinstance(strings, dict):
+                raise ValueError("language must be a string and strings an object")
+            if not isinstance(contexts, dict):
+                raise ValueError("contexts must be an object")
+            if not isinstance(skip_keys, list) or not all(isinstance(key, str) for key in skip_keys):
+                raise ValueError("skip_keys must be a list of strings")
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {"error": f"Invalid request: {e}"}
+
+        job = TranslationJob(
+            language,
+            {str(key): value for key, value in strings.items() if isinstance(value, str)},
+            {str(key): value for key, value in contexts.items() if isinstance(value, str)},
+            frozenset(skip_keys)
+        )
+        self._expire_jobs()
+        self.jobs[job.id] = job
+        asyncio.get_running_loop().create_task(self._run_job(job))
+        return 202, job.to_dict()
+
+    async def _run_job(self, job):
+        job.status = "running"
+        try:
+            to_translate, passthrough, _ = split_translatable(job.strings, job.skip_keys)
+            cached, pending = {}, to_translate
+            if self.translation_memory is not None:
+                cached, pending = self.translation_memory.lookup(to_translate, job.language, job.contexts)
+            results = {**passthrough, **cached}
+            job.done = len(results)
+
+            futures = {
+                key: self.coalescer.translate(text, job.language, job.contexts.get(key, ""))
+                for key, text in pending.items()
+            }
+            for key, future in futures.items():
+                future.add_done_callback(lambda _: setattr(job, "done", job.done + 1))
+            if futures:
+                translated = await asyncio.gather(*futures.values())
+                new_translations = dict(zip(futures, translated))
+                results.update(new_translations)
+                if self.translation_memory is not None:
+                    self.translation_memory.remember(pending, new_translations, job.language, job.contexts)
+
+            job.translations = {key: results[key] for key in job.strings if key in results}
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        job.finished_at = time.time()
+
+    def _expire_jobs(self):
+        cutoff = time.time() - JOB_TTL
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished_at and job.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def close(self):
+        self.coalescer.close()
+
+
+async def read_body(receive, max_bytes=MAX_BODY_BYTES):
+    """Read an ASGI request body, raising ValueError past max_bytes."""
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > max_bytes:
+            raise ValueError(f"Request body exceeds {max_bytes} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def send_text(send, status, text, content_type=b"text/plain; charset=utf-8"):
+    body = text.encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_json(send, status, payload):
+    await send_text(send, status, json.dumps(payload, ensure_ascii=False), b"application/json; charset=utf-8")
+
+
+def create_app(backend=None, batch_size=BATCH_SIZE, max_wait=MAX_WAIT, max_in_flight=MAX_IN_FLIGHT,
+               call_timeout=CALL_TIMEOUT, hedge=False, fallback_backend=None):
+    """
+    Create the service.
+
+    Args:
+        backend: The model backend; defaults to the one named by $TRANSLATOR_BACKEND,
+            with Gemini configured from $GEMINI_API_KEY, and a fallback tier running
+            $TRANSLATOR_FALLBACK_MODEL if it is set
+        call_timeout (float): Seconds a model call may take before it is retried
+        hedge (bool): Hedge model calls that are slower than the recent p95
+        fallback_backend: Backend of the model tier used while the primary's circuit is open
+
+    Returns:
+        TranslationService: The ASGI application
+    """
+    if backend is None:
+        # The SDK request ends with the call's deadline, so abandoned calls don't linger
+        backend = create_backend(timeout=call_timeout)
+        if backend.name == GeminiBackend.name and os.getenv("GEMINI_API_KEY"):
+            configure_gemini(os.getenv("GEMINI_API_KEY"))
+        if fallback_backend is None and FALLBACK_MODEL:
+            fallback_backend = create_backend(
+                backend.name, batch_model=FALLBACK_MODEL, single_model=FALLBACK_MODEL, timeout=call_timeout
+            )
+    # The coalescer already fills and paces the batches
+    translator = Translator(
+        LoggingReporter(), backend, batch_size=batch_size, batch_delay=0, call_timeout=call_timeout, hedge=hedge,
+        fallback_backend=fallback_backend
+    )
+    return TranslationService(translator, TranslationMemory(), batch_size, max_wait, max_in_flight)
+
+
+async def _handle_connection(app, reader, writer):
+    """Serve one HTTP/1.1 request on a connection, then close it."""
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            writer.write(f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n".encode("latin-1"))
+            for name, value in message.get("headers", []):
+                writer.write(name + b": " + value + b"\r\n")
+            writer.write(b"connection: close\r\n\r\n")
+        elif message["type"] == "http.response.body":
+            writer.write(message.get("body", b""))
+            await writer.drain()
+
+    try:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            return
+
+        try:
+            method, target, version, headers, content_length = parse_request_head(head)
+        except ValueError as e:
+            await send_json(send, 400, {"error": f"Invalid request: {e}"})
+            return
+        if content_length > MAX_BODY_BYTES:
+            await send_json(send, 413, {"error": f"Request body exceeds {MAX_BODY_BYTES} bytes"})
+            return
+        try:
+            body = await reader.readexactly(content_length) if content_length else b""
+        except asyncio.IncompleteReadError:
+            return
+
+        path, _, query = target.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": version.split("/")[-1],
+            "method": method.upper(),
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("latin-1"),
+            "query_string": query.encode("latin-1"),
+            "headers": headers,
+            "client": writer.get_extra_info("peername"),
+            "server": writer.get_extra_info("sockname")
+        }
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await app(scope, receive, send)
+    finally:
+        writer.close()
+
+
+def parse_request_head(head):
+    """
+    Parse the request line and headers of an HTTP/1.1 request.
+
+    Args:
+        head (bytes): Everything up to and including the blank line after the headers
+
+    Returns:
+        tuple: (method, target, version, headers, content_length), with headers as
+            ASGI (name, value) byte pairs
+
+    Raises:
+        ValueError: If the request line or Content-Length is malformed
+    """
+    request_line, *header_lines = head.decode("latin-1").split("\r\n")
+    parts = request_line.split(" ")
+    if len(parts) != 3 or not parts[0] or not parts[2].startswith("HTTP/"):
+        raise ValueError(f"Malformed request line {request_line!r}")
+    method, target, version = parts
+
+    headers = []
+    content_length = 0
+    for line in header_lines:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers.append((name.strip().lower().encode("latin-1"), value.strip().encode("latin-1")))
+            if name.strip().lower() == "content-length":
+                if not (value.strip().isascii() and value.strip().isdigit()):
+                    raise ValueError(f"Malformed Content-Length {value.strip()!r}")
+                content_length = int(value.strip())
+    return method, target, version, headers, content_length
+
+
+def serve(app, host="127.0.0.1", port=8000):
+    """
+    Serve an ASGI app with a minimal HTTP/1.1 server from the standard library.
+
+    One request per connection and no TLS; put it behind a proxy or use a full
+    ASGI server for anything beyond internal tooling.
+    """
+    async def main():
+        server = await asyncio.start_server(lambda reader, writer: _handle_connection(app, reader, writer), host, port)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if hasattr(app, "close"):
+            app.close()
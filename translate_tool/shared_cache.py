@@ -0,0 +1,193 @@
+"""
+Process-wide caches shared by every session of the app.
+
+Scanning a repository, parsing its resource files and translating strings are
+the expensive steps, and teammates working on the same repositories repeat them
+constantly. These caches are created once per server process and are safe to
+use from the threads Streamlit runs sessions on.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Default memory bounds, in approximate bytes
+SCAN_CACHE_BYTES = 64 * 1024 * 1024
+PARSED_FILE_CACHE_BYTES = 64 * 1024 * 1024
+TRANSLATION_MEMORY_BYTES = 128 * 1024 * 1024
+RENDERED_EXPORT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def approximate_size(value):
+    """
+    Estimate the memory used by a value built from dicts, lists and strings.
+
+    Args:
+        value: The value to measure
+
+    Returns:
+        int: The approximate size in bytes
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return size
+
+
+class BoundedCache:
+    """
+    A thread-safe LRU cache bounded by entry count and approximate size.
+
+    Entries can optionally expire after ttl seconds.
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=None, ttl=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, stored_at = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._bytes -= size
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = approximate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            # Never let a single oversized entry flush the whole cache
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size, time.monotonic())
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class TranslationMemory:
+    """
+    Shared memory of previous translations keyed by (language, text, context).
+
+    Lets sessions reuse each other's model output, so the same string is only
+    sent to the model once per target language.
+    """
+
+    def __init__(self, max_entries=200000, max_bytes=TRANSLATION_MEMORY_BYTES):
+        self._cache = BoundedCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def lookup(self, texts_dict, target_language, contexts_dict=None):
+        """
+        Split strings into already translated ones and ones that still need the model.
+
+        Args:
+            texts_dict (dict): A dictionary of string keys and source texts
+            target_language (str): The target language name
+            contexts_dict (dict): Optional contexts for each key
+
+        Returns:
+            tuple: (dict of cached translations, dict of strings still to translate)
+        """
+        contexts_dict = contexts_dict or {}
+        cached = {}
+        pending = {}
+        for key, text in texts_dict.items():
+            translation = self._cache.get((target_language, text, contexts_dict.get(key, "")))
+            if translation is None:
+                pending[key] = text
+            else:
+                cached[key] = translation
+        return cached, pending
+
+    def remember(self, texts_dict, translations, target_language, contexts_dict=None):
+        """
+        Store new translations.
+
+        Strings that came back unchanged are not remembered, because that is
+        also how failed batches fall back to the source text.
+        """
+        contexts_dict = contexts_dict or {}
+        for key, translation in translations.items():
+            text = texts_dict.get(key)
+            if isinstance(text, str) and isinstance(translation, str) and translation and translation != text:
+                self._cache.set((target_language, text, contexts_dict.get(key, "")), translation)
+
+    def stats(self):
+        return self._cache.stats()
+
+
+class SharedCaches:
+    """The set of caches shared by all sessions in one server process."""
+
+    def __init__(self):
+        # Scan results are keyed by the commit they were scanned at, so they never go stale
+        self.scan_results = BoundedCache(max_entries=64, max_bytes=SCAN_CACHE_BYTES)
+        self.parsed_files = BoundedCache(max_entries=4096, max_bytes=PARSED_FILE_CACHE_BYTES)
+        self.translation_memory = TranslationMemory()
+        # Rendered locale files, keyed by (file, language, format, content hash)
+        self.rendered_exports = BoundedCache(max_entries=10000, max_bytes=RENDERED_EXPORT_CACHE_BYTES)
+
+    def stats(self):
+        return {
+            "scan_results": self.scan_results.stats(),
+            "parsed_files": self.parsed_files.stats(),
+            "translation_memory": self.translation_memory.stats(),
+            "rendered_exports": self.rendered_exports.stats()
+        }
@@ -0,0 +1,90 @@
+"""
+Pre-translation filtering of strings that should never reach the model.
+
+Resources marked translatable="false", URLs, e-mail addresses, numbers,
+resource references and strings made only of placeholders are passed through
+unchanged. Sending them costs tokens and the model tends to mangle them.
+"""
+
+import re
+
+# printf-style (%s, %1$d, %.2f, %%), brace ({name}, {{name}}, {0}) and ICU-less $-style placeholders
+PLACEHOLDER_PATTERN = re.compile(
+    r"%(?:\d+\$)?[-#+0,(]*\d*(?:\.\d+)?[a-zA-Z%]"
+    r"|\{\{[^{}]*\}\}"
+    r"|\{[^{}\s]*\}"
+    r"|\$\{[^{}]*\}"
+)
+URL_PATTERN = re.compile(r"^(?:[a-zA-Z][a-zA-Z0-9+.-]*://|www\.)\S+$")
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[a-zA-Z]{2,}$")
+NUMBER_PATTERN = re.compile(r"^[-+]?(?:\d+(?:[.,:]\d+)*|\d*\.\d+)(?:[eE][-+]?\d+)?%?$")
+RESOURCE_REFERENCE_PATTERN = re.compile(r"^[@?](?:[a-zA-Z0-9_.]+:)?[a-zA-Z_]+/[a-zA-Z0-9_.]+$")
+# Characters that carry no translatable meaning once placeholders are removed
+NON_WORD_PATTERN = re.compile(r"[\W_]", re.UNICODE)
+
+
+def classify_string(key, text, untranslatable=()):
+    """
+    Decide whether a string should be sent to the model.
+
+    Args:
+        key (str): The string key
+        text (str): The source text
+        untranslatable (set): Keys marked translatable="false"
+
+    Returns:
+        str: The reason the string is skipped, or None if it should be translated
+    """
+    if key in untranslatable:
+        return "translatable=false"
+    if not isinstance(text, str):
+        return "not a string"
+
+    stripped = text.strip()
+    if not stripped:
+        return "empty"
+    if URL_PATTERN.match(stripped):
+        return "url"
+    if EMAIL_PATTERN.match(stripped):
+        return "email"
+    if NUMBER_PATTERN.match(stripped):
+        return "number"
+    if RESOURCE_REFERENCE_PATTERN.match(stripped):
+        return "resource reference"
+
+    remainder = PLACEHOLDER_PATTERN.sub("", stripped)
+    if remainder != stripped and not NON_WORD_PATTERN.sub("", remainder):
+        return "placeholder only"
+    return None
+
+
+def split_translatable(texts_dict, untranslatable=()):
+    """
+    Separate strings that need translation from ones that pass through unchanged.
+
+    Args:
+        texts_dict (dict): A dictionary of string keys and source texts
+        untranslatable (set): Keys marked translatable="false"
+
+    Returns:
+        tuple: (dict to translate, dict passed through as-is, dict of skip reasons by key)
+    """
+    to_translate = {}
+    passthrough = {}
+    reasons = {}
+    for key, text in texts_dict.items():
+        reason = classify_string(key, text, untranslatable)
+        if reason is None:
+            to_translate[key] = text
+        else:
+            passthrough[key] = text
+            reasons[key] = reason
+    return to_translate, passthrough, reasons
+
+
+def summarize_skips(reasons):
+    """Count skipped strings per reason, e.g. {"url": 3, "number": 1}."""
+    counts = {}
+    for reason in reasons.values():
+        counts[reason] = counts.get(reason, 0) + 1
+    return counts
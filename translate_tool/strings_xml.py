@@ -0,0 +1,445 @@
+"""
+Reading and writing Android strings.xml resources.
+
+The parser streams the file and clears each resource once it has been read,
+so large files are parsed in bounded memory. It keeps <string>, <plurals> and
+<string-array> resources, inline markup such as <b> or <xliff:g>, CDATA
+sections, translatable="false" flags and other resource attributes such as
+tools:ignore, and decodes XML entities and Android escapes (\\', \\", \\n, \\@,
+\\?, \\uXXXX) into plain text. The writer applies the same escapes in reverse,
+so resources round-trip.
+
+Values are plain text with markup tags and CDATA sections kept literally, e.g.
+"Tom & <b>Jerry</b>" or "<![CDATA[<a href=\"%1$s\">Open</a>]]>". Text that
+only looks like markup, such as "&lt;b&gt;" in the source, becomes a CDATA
+section, which Android reads the same way. Resource references like
+"@string/app_name" are written back unescaped.
+
+Everything else in the app works with flat {key: value} dictionaries, so
+plurals and arrays are flattened into keys:
+
+    <plurals name="items"><item quantity="one">    ->  "items#one"
+    <string-array name="days"><item> (first item)  ->  "days[0]"
+"""
+
+import io
+import re
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+PLURAL_SEPARATOR = "#"
+
+# attributes holds the resource's other attributes, e.g. (("tools:ignore", "MissingTranslation"),)
+ResourceEntry = namedtuple("ResourceEntry", ["kind", "name", "value", "translatable", "attributes"], defaults=((),))
+
+# Android XML namespaces commonly used inside string resources
+NAMESPACES = {
+    "xliff": "urn:oasis:names:tc:xliff:document:1.2",
+    "tools": "http://schemas.android.com/tools"
+}
+
+for _prefix, _uri in NAMESPACES.items():
+    ET.register_namespace(_prefix, _uri)
+
+_PREFIXES = {uri: prefix for prefix, uri in NAMESPACES.items()}
+
+ARRAY_KEY_PATTERN = re.compile(r"^(.+)\[(\d+)\]$")
+TAG_PATTERN = re.compile(r"(<[^<>]+>)")
+# Markup tags and CDATA sections, the parts of a value that aren't plain text
+SEGMENT_PATTERN = re.compile(r"(<!\[CDATA\[.*?\]\]>|<[^<>]+>)", re.DOTALL)
+# @[package:]type/name, @null and ?[package:][attr/]name, which Android resolves as references
+REFERENCE_PATTERN = re.compile(r"^(?:@\+?\*?(?:[\w.]+:)?[\w-]+/[\w.]+|@null|@empty|\?(?:[\w.]+:)?(?:attr/)?[\w.]+)$")
+ESCAPE_PATTERN = re.compile(r"\\(u[0-9a-fA-F]{4}|.)", re.DOTALL)
+
+ANDROID_ESCAPES = {"n": "\n", "t": "\t"}
+
+RESOURCE_TAGS = {"string", "plurals", "string-array"}
+# Attributes the codec handles itself rather than carrying over
+OWN_ATTRIBUTES = {"name", "translatable"}
+
+CDATA_OPEN = "<![CDATA["
+CDATA_CLOSE = "]]>"
+# ElementTree drops CDATA markers, so sections are wrapped in this element before parsing
+CDATA_TAG = "{urn:translate-tool:cdata}section"
+_CDATA_START = b'<cdata:section xmlns:cdata="urn:translate-tool:cdata">'
+_CDATA_END = b"</cdata:section>"
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def _decode_escapes(text):
+    def replace(match):
+        escape = match.group(1)
+        if escape.startswith("u") and len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return ANDROID_ESCAPES.get(escape, escape)
+
+    return ESCAPE_PATTERN.sub(replace, text) if "\\" in text else text
+
+
+def decode_android_text(text):
+    """
+    Decode Android string escapes into plain text.
+
+    Surrounding double quotes (Android's whitespace-preserving quoting) are
+    removed, and backslash escapes are resolved, including inside CDATA
+    sections. Markup tags are left as-is. A reference the source escaped,
+    e.g. \\@string/name, keeps its backslash so it is written back as text.
+    """
+    if "\\" not in text and '"' not in text:
+        return text
+    if text[:1] == "\\" and REFERENCE_PATTERN.match(text[1:]):
+        return text
+    if len(text) >= 2 and text.startswith('"') and text.endswith('"') and not text.endswith('\\"'):
+        text = text[1:-1]
+
+    parts = SEGMENT_PATTERN.split(text)
+    for index, part in enumerate(parts):
+        if index % 2 == 0:
+            parts[index] = _decode_escapes(part)
+        elif part.startswith(CDATA_OPEN):
+            parts[index] = CDATA_OPEN + _decode_escapes(part[len(CDATA_OPEN):-len(CDATA_CLOSE)]) + CDATA_CLOSE
+    return "".join(parts)
+
+
+def escape_android_text(text, leading=True):
+    """
+    Apply Android string escapes to plain text.
+
+    Escapes backslashes, quotes, newlines and tabs. When the text starts the
+    value (leading), a starting @ or ? is escaped too unless the text is a
+    resource reference, since Android would otherwise read it as one.
+    """
+    prefix = ""
+    if leading and text[:1] in ("@", "?", "\\"):
+        if REFERENCE_PATTERN.match(text) or (text[:1] == "\\" and REFERENCE_PATTERN.match(text[1:])):
+            return text
+        if text[:1] != "\\":
+            prefix = "\\"
+    return prefix + (text.replace("\\", "\\\\")
+                     .replace("'", "\\'")
+                     .replace('"', '\\"')
+                     .replace("\n", "\\n")
+                     .replace("\t", "\\t"))
+
+
+def _escape_xml_text(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escape_xml_attribute(text):
+    return _escape_xml_text(text).replace('"', "&quot;")
+
+
+def _qualified_name(tag):
+    """Turn an ElementTree "{uri}name" into "prefix:name" for the known namespaces."""
+    if not tag.startswith("{"):
+        return tag
+    uri, name = tag[1:].split("}", 1)
+    prefix = _PREFIXES.get(uri)
+    return f"{prefix}:{name}" if prefix else name
+
+
+def _namespace_declarations():
+    return " ".join(f'xmlns:{prefix}="{uri}"' for prefix, uri in NAMESPACES.items())
+
+
+def _is_markup(parts):
+    """
+    Whether a value split by SEGMENT_PATTERN holds inline markup that should be written as XML.
+
+    Values read from elements with child tags keep those tags, so any value
+    whose tags form a well-formed XML fragment is written back as markup.
+    """
+    fragment = "".join(part if index % 2 else _escape_xml_text(part) for index, part in enumerate(parts))
+    try:
+        ET.fromstring(f"<root {_namespace_declarations()}>{fragment}</root>")
+        return True
+    except ET.ParseError:
+        return False
+
+
+def _text_content(text):
+    """Keep text that would be read back as markup inside a CDATA section."""
+    if "<" in text and TAG_PATTERN.search(text) and CDATA_CLOSE not in text:
+        return CDATA_OPEN + text + CDATA_CLOSE
+    return text
+
+
+def _serialize_child(elem):
+    if elem.tag == CDATA_TAG:
+        return CDATA_OPEN + (elem.text or "") + CDATA_CLOSE
+    tag = _qualified_name(elem.tag)
+    attributes = "".join(
+        f' {_qualified_name(name)}="{_escape_xml_attribute(value)}"' for name, value in elem.attrib.items()
+    )
+    content = _inner_content(elem)
+    if not content:
+        return f"<{tag}{attributes} />"
+    return f"<{tag}{attributes}>{content}</{tag}>"
+
+
+def _inner_content(elem):
+    """Return the text of an element, with nested markup and CDATA sections kept literally."""
+    if len(elem) == 0:
+        return _text_content(elem.text or "")
+
+    parts = [_text_content(elem.text or "")]
+    for child in elem:
+        parts.append(_serialize_child(child))
+        parts.append(_text_content(child.tail or ""))
+    return "".join(parts)
+
+
+def _value_to_xml(value):
+    """Serialize a decoded value as the content of a string element."""
+    if value is None:
+        return ""
+    parts = SEGMENT_PATTERN.split(value) if "<" in value else None
+    if parts and len(parts) > 1 and _is_markup(parts):
+        content = []
+        leading = True
+        for index, part in enumerate(parts):
+            if index % 2 == 0:
+                content.append(_escape_xml_text(escape_android_text(part, leading)))
+            elif part.startswith(CDATA_OPEN):
+                inner = part[len(CDATA_OPEN):-len(CDATA_CLOSE)]
+                content.append(CDATA_OPEN + escape_android_text(inner, leading) + CDATA_CLOSE)
+            else:
+                content.append(part)
+            leading = leading and not part
+        content = "".join(content)
+    else:
+        content = _escape_xml_text(escape_android_text(value))
+    # Android collapses unquoted whitespace, so quote values that depend on it
+    if value != value.strip() or "  " in value:
+        content = f'"{content}"'
+    return content
+
+
+def _held_back(data):
+    """Return how many bytes at the end of data could start a CDATA marker."""
+    for length in range(min(len(data), len(CDATA_OPEN) - 1), 0, -1):
+        tail = data[-length:]
+        if CDATA_OPEN.encode().startswith(tail) or CDATA_CLOSE.encode().startswith(tail):
+            return length
+    return 0
+
+
+def _mark_cdata(data):
+    return (data.replace(CDATA_OPEN.encode(), _CDATA_START + CDATA_OPEN.encode())
+            .replace(CDATA_CLOSE.encode(), CDATA_CLOSE.encode() + _CDATA_END))
+
+
+def _iter_chunks(source):
+    """Read the source in chunks, wrapping CDATA sections in CDATA_TAG elements."""
+    if isinstance(source, str):
+        source = io.BytesIO(source.encode("utf-8"))
+    elif isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    pending = b""
+    while True:
+        chunk = source.read(READ_CHUNK_BYTES)
+        if not chunk:
+            break
+        pending += chunk
+        # A marker split across two chunks is completed by the next one
+        cut = len(pending) - _held_back(pending)
+        yield _mark_cdata(pending[:cut])
+        pending = pending[cut:]
+    yield _mark_cdata(pending)
+
+
+def iter_resources(source):
+    """
+    Stream the string resources of a strings.xml file.
+
+    Args:
+        source (str, bytes or file): The XML content, or a binary file object
+
+    Yields:
+        ResourceEntry: kind is "string", "plurals" or "string-array"; value is a
+            string, a {quantity: text} dict or a list of texts
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    for chunk in _iter_chunks(source):
+        parser.feed(chunk)
+        yield from _iter_entries(parser.read_events())
+    parser.close()
+    yield from _iter_entries(parser.read_events())
+
+
+def _iter_entries(events):
+    for _, elem in events:
+        if elem.tag not in RESOURCE_TAGS:
+            continue
+
+        tag = elem.tag
+        name = elem.get("name")
+        translatable = elem.get("translatable", "true").lower() != "false"
+        attributes = ()
+        if len(elem.attrib) > 1:
+            attributes = tuple(
+                (_qualified_name(attribute), value) for attribute, value in elem.attrib.items()
+                if attribute not in OWN_ATTRIBUTES
+            )
+        if name:
+            if tag == "string":
+                yield ResourceEntry("string", name, decode_android_text(_inner_content(elem)), translatable, attributes)
+            elif tag == "plurals":
+                quantities = {}
+                for item in elem.findall("item"):
+                    quantity = item.get("quantity")
+                    if quantity:
+                        quantities[quantity] = decode_android_text(_inner_content(item))
+                yield ResourceEntry("plurals", name, quantities, translatable, attributes)
+            else:
+                items = [decode_android_text(_inner_content(item)) for item in elem.findall("item")]
+                yield ResourceEntry("string-array", name, items, translatable, attributes)
+        # Drop the parsed resource so memory stays bounded on large files
+        elem.clear()
+
+
+def iter_flat_resources(entries):
+    """
+    Flatten resource entries into flat keys as they are streamed.
+
+    Yields:
+        tuple: (key, value, translatable)
+    """
+    for entry in entries:
+        if entry.kind == "string":
+            yield entry.name, entry.value, entry.translatable
+        elif entry.kind == "plurals":
+            for quantity, text in entry.value.items():
+                yield f"{entry.name}{PLURAL_SEPARATOR}{quantity}", text, entry.translatable
+        else:
+            for index, text in enumerate(entry.value):
+                yield f"{entry.name}[{index}]", text, entry.translatable
+
+
+def flatten_resources(entries):
+    """
+    Flatten resource entries into a {key: value} dictionary.
+
+    Returns:
+        tuple: (strings dict, set of keys marked translatable="false")
+    """
+    strings = {}
+    untranslatable = set()
+    for key, value, translatable in iter_flat_resources(entries):
+        strings[key] = value
+        if not translatable:
+            untranslatable.add(key)
+    return strings, untranslatable
+
+
+def parse_strings_xml(source):
+    """
+    Parse a strings.xml file into a flat dictionary of strings.
+
+    Args:
+        source (str, bytes or file): The XML content
+
+    Returns:
+        dict: A dictionary of string keys and values
+    """
+    return flatten_resources(iter_resources(source))[0]
+
+
+def untranslatable_keys(source):
+    """Return the flat keys of resources marked translatable="false"."""
+    return flatten_resources(iter_resources(source))[1]
+
+
+def resource_attributes(source):
+    """
+    Return the attributes of each resource other than name and translatable.
+
+    Returns:
+        dict: Resource name to (attribute, value) pairs, e.g.
+            {"app_name": (("tools:ignore", "MissingTranslation"),)}, for resources that have any
+    """
+    return {entry.name: entry.attributes for entry in iter_resources(source) if entry.attributes}
+
+
+def group_resources(strings_dict):
+    """
+    Group flat keys back into string, plurals and string-array resources.
+
+    Returns:
+        list: (kind, name, value) tuples in first-seen order
+    """
+    resources = {}
+    for key, value in strings_dict.items():
+        array_match = ARRAY_KEY_PATTERN.match(key)
+        if PLURAL_SEPARATOR in key:
+            name, quantity = key.rsplit(PLURAL_SEPARATOR, 1)
+            resources.setdefault(("plurals", name), {})[quantity] = value
+        elif array_match:
+            name, index = array_match.group(1), int(array_match.group(2))
+            resources.setdefault(("string-array", name), {})[index] = value
+        else:
+            resources[("string", key)] = value
+
+    grouped = []
+    for (kind, name), value in resources.items():
+        if kind == "string-array":
+            value = [value[index] for index in sorted(value)]
+        grouped.append((kind, name, value))
+    return grouped
+
+
+def dict_to_strings_xml(strings_dict, language_code=None, untranslatable=(), attributes=None):
+    """
+    Convert a dictionary of strings to strings.xml content.
+
+    Args:
+        strings_dict (dict): Flat string keys and decoded values
+        language_code (str): The language being written; None or "en" for the source file
+        untranslatable (set): Keys marked translatable="false" in the source file.
+            They are flagged in the source file and left out of translations.
+        attributes (dict): resource_attributes of the source file, written on every language
+
+    Returns:
+        str: The XML content
+    """
+    return "".join(iter_strings_xml(strings_dict, language_code, untranslatable, attributes))
+
+
+def iter_strings_xml(strings_dict, language_code=None, untranslatable=(), attributes=None):
+    """Yield the lines of a strings.xml file; see dict_to_strings_xml."""
+    is_source = language_code in (None, "en")
+    yield '<?xml version="1.0" encoding="utf-8"?>\n'
+    yield f"<resources {_namespace_declarations()}>\n"
+
+    for kind, name, value in group_resources(strings_dict):
+        if kind == "string":
+            flagged = name in untranslatable
+        elif kind == "plurals":
+            flagged = any(f"{name}{PLURAL_SEPARATOR}{quantity}" in untranslatable for quantity in value)
+        else:
+            flagged = any(f"{name}[{index}]" in untranslatable for index in range(len(value)))
+        if flagged and not is_source:
+            continue
+
+        opening = f'name="{_escape_xml_attribute(name)}"'
+        if flagged:
+            opening += ' translatable="false"'
+        for attribute, attribute_value in (attributes or {}).get(name, ()):
+            opening += f' {attribute}="{_escape_xml_attribute(attribute_value)}"'
+
+        if kind == "string":
+            yield f"    <string {opening}>{_value_to_xml(value)}</string>\n"
+        elif kind == "plurals":
+            yield f"    <plurals {opening}>\n"
+            for quantity, text in value.items():
+                yield f'        <item quantity="{_escape_xml_attribute(quantity)}">{_value_to_xml(text)}</item>\n'
+            yield "    </plurals>\n"
+        else:
+            yield f"    <string-array {opening}>\n"
+            for text in value:
+                yield f"        <item>{_value_to_xml(text)}</item>\n"
+            yield "    </string-array>\n"
+
+    yield "</resources>\n"